@@ -0,0 +1,71 @@
+"""
+scripts/bench_field_descriptions.py
+
+Benchmark DataFieldMetaDescription.run_loop serially, with concurrent in-flight requests and with
+multi-column batched prompts against the local mock Ollama server (scripts/mock_ollama.py).
+
+Usage:
+    python scripts/bench_field_descriptions.py --columns 150 --latency 0.05 --max-in-flight 8 --batch-size 8
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from mock_ollama import serve
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--columns", type=int, default=150)
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock per-request latency in seconds.")
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args()
+
+    server = serve(latency=args.latency)
+    os.environ["LOCAL_OLLAMA_HOST_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ["LIGHTNING_OLLAMA_HOST_URL"] = ""
+    os.chdir(ROOT)  # config_models.yaml is resolved from the project root
+
+    from gaby_agent.core.agent.cleaner import DataFieldMetaDescription
+
+    data = pd.DataFrame(np.random.default_rng(0).integers(0, 100, (10, args.columns)), columns=[f"field_{i}" for i in range(args.columns)])
+    agent = DataFieldMetaDescription()
+
+    modes = {
+        "serial": dict(max_in_flight=1),
+        f"concurrent x{args.max_in_flight}": dict(max_in_flight=args.max_in_flight),
+        f"batched /{args.batch_size}": dict(max_in_flight=1, batch_size=args.batch_size),
+        f"batched /{args.batch_size} x{args.max_in_flight}": dict(max_in_flight=args.max_in_flight, batch_size=args.batch_size),
+    }
+    chat_counts = server.RequestHandlerClass.counts
+
+    timings = {}
+    for label, options in modes.items():
+        requests_before = chat_counts.get("/api/chat", 0)
+        start = time.perf_counter()
+        descriptions = agent.run_loop(data, data_description="benchmark dataset", **options)
+        timings[label] = time.perf_counter() - start
+        assert list(descriptions) == list(data.columns)
+        assert all(records[0]["description"] for records in descriptions.values())
+        n_requests = chat_counts.get("/api/chat", 0) - requests_before
+        print(f"{label:<20} {timings[label]:8.3f}s  {n_requests:4d} chat requests for {args.columns} columns")
+
+    serial = timings["serial"]
+    for label, seconds in timings.items():
+        print(f"Speed-up {label:<20} {serial / seconds:.2f}x")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
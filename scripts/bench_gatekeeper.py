@@ -0,0 +1,71 @@
+"""
+scripts/bench_gatekeeper.py
+
+Run the gatekeeper stages of the pipeline (profile -> stage & upload -> describe -> numeric detection)
+against a selectable backend. The default "sqlite" backend runs fully offline with AI.GENERATE stubbed.
+
+Usage:
+    python scripts/bench_gatekeeper.py --backend sqlite --repeat 5
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from gaby_agent.core.profiling import profile_dataframe
+from gaby_agent.core.gatekeeper import (
+    set_backend,
+    get_client,
+    upload_dataframe_to_bq,
+    describe_data_field,
+    detect_numeric_field,
+)
+
+INPUT_DIR = Path(__file__).resolve().parents[1] / "src" / "gaby_agent" / "data" / "input"
+
+
+def run_episode(df: pd.DataFrame, table_prefix: str) -> dict[str, float]:
+    timings = {}
+
+    start = time.perf_counter()
+    summary = profile_dataframe(df)
+    timings["profile"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    upload_dataframe_to_bq(df, f"{table_prefix}_cognitive", summary=summary)
+    upload_dataframe_to_bq(summary, f"{table_prefix}_observations")
+    timings["upload"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    describe_data_field(data_summary_id=f"{table_prefix}_observations")
+    detect_numeric_field(data_summary_id=f"{table_prefix}_observations")
+    timings["gatekeeper_sql"] = time.perf_counter() - start
+
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", default="sqlite", help="Registered gatekeeper backend name.")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    set_backend(args.backend)
+    start = time.perf_counter()
+    get_client()
+    print(f"Client initialised in {time.perf_counter() - start:.3f}s (shared by every call below)")
+
+    for path in sorted(INPUT_DIR.glob("*.csv")):
+        df = pd.read_csv(path)
+        runs = [run_episode(df, f"bench.{path.stem}") for _ in range(args.repeat)]
+        best = pd.DataFrame(runs).min()
+        print(f"{path.name:<28} " + "  ".join(f"{stage}={seconds:.3f}s" for stage, seconds in best.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+scripts/calibrate_models.py
+
+Measure generation tokens/sec of candidate Ollama option profiles (thread count x batch size, batch size only for a remote host) for
+models in config_models.yaml, and save the fastest per model to OLLAMA_TUNING_PATH.
+Agents created afterwards pick the saved profile up automatically.
+
+Usage:
+    python scripts/calibrate_models.py base                      # one model
+    python scripts/calibrate_models.py base --threads 8 16 32     # custom thread counts (local host only)
+    python scripts/calibrate_models.py base --batches 128 512     # custom batch sizes
+    python scripts/calibrate_models.py base --dry-run             # measure without saving
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("models", nargs="+", help="Model names from config_models.yaml.")
+    parser.add_argument("--threads", type=int, nargs="*", help="num_thread candidates for models on the local host (default: around the core count).")
+    parser.add_argument("--batches", type=int, nargs="*", help="num_batch candidates (default: 256 512 locally, 128 256 512 on a remote host).")
+    parser.add_argument("--num-predict", type=int, default=64)
+    parser.add_argument("--repeats", type=int, default=2)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # config_models.yaml is resolved from the project root
+    from gaby_agent.core.config import LocalConfig
+    from gaby_agent.core.agent import get_client_pool
+    from gaby_agent.core.agent._connection import is_local_host
+    from gaby_agent.core.agent._tuning import calibrate, candidate_options, get_hardware
+
+    hardware = get_hardware()
+    print(f"Hardware: {hardware} ({hardware.fingerprint})")
+
+    for name in args.models:
+        model = LocalConfig().get_model(name)
+        if model is None:
+            print(f"Unknown model '{name}'")
+            continue
+        local = is_local_host(model.host)
+        if args.threads and not local:
+            print(f"Ignoring --threads for '{name}': its host {model.host} is not this machine")
+        candidates = candidate_options(hardware, local=local, threads=args.threads, batches=args.batches)
+        runs = calibrate(
+            get_client_pool().get(model.host),
+            model,
+            candidates=candidates,
+            num_predict=args.num_predict,
+            repeats=args.repeats,
+            hardware=hardware,
+            save=not args.dry_run,
+        )
+        print(f"\n{name} ({model.model_id})")
+        for run in runs:
+            print(f"  {run.tokens_per_sec:8.1f} tokens/s  {run.options}" + (f"  ERROR {run.error}" if run.error else ""))
+
+
+if __name__ == "__main__":
+    main()
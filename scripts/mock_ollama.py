@@ -0,0 +1,142 @@
+"""
+scripts/mock_ollama.py
+
+Minimal local stand-in for the Ollama HTTP API used by the agent benchmarks.
+
+Serves /api/show, /api/pull, /api/tags, /api/generate and /api/chat with a fixed per-request latency so agent
+code paths can be timed without a model server; streamed chats send one word per chunk. Requests are handled
+on separate threads, like a server configured with OLLAMA_NUM_PARALLEL.
+
+Usage:
+    python scripts/mock_ollama.py --port 11435 --latency 0.2
+"""
+
+import os
+import re
+import json
+import time
+import argparse
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockOllamaHandler(BaseHTTPRequestHandler):
+    latency: float = 0.2
+    token_latency: float = 0.01  # per streamed chunk
+    counts: dict[str, int] = {}
+    _lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, payload: dict, status: int = 200):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _count(self, path: str) -> int:
+        with self._lock:
+            self.counts[path] = self.counts.get(path, 0) + 1
+            return self.counts[path]
+
+    def reply(self, request: dict) -> str:
+        """ Assistant message content for a chat request (overridable).
+
+        JSON-formatted requests listing "- label (...)" lines get a JSON object keyed by those labels.
+        """
+
+        user = next((m["content"] for m in reversed(request.get("messages", [])) if m["role"] == "user"), "")
+        if request.get("format") == "json":
+            labels = re.findall(r"^\s*-\s*(\S+)", user, re.MULTILINE)
+            return json.dumps({label: f"Mock description of {label}." for label in labels})
+        return f"Mock reply to: {' '.join(user.split())[:60]}"
+
+    def do_GET(self):
+        self._count(self.path)
+        if self.path == "/api/tags":
+            return self._send({"models": []})
+        self._send({"error": "not found"}, status=404)
+
+    def do_POST(self):
+        n = self._count(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        if self.path == "/api/show":
+            return self._send({"modelfile": "", "parameters": "", "template": "", "details": {}, "model_info": {}})
+        if self.path == "/api/pull":
+            return self._send({"status": "success"})
+        if self.path == "/api/generate":
+            # throughput grows with num_thread up to the host's cores, so calibration has something to pick
+            options = request.get("options") or {}
+            eval_count = options.get("num_predict", 8) if request.get("prompt") else 0
+            tokens_per_sec = 10.0 * min(options.get("num_thread", 1), os.cpu_count() or 1)
+            return self._send({
+                "model": request.get("model", ""),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "response": "token " * eval_count,
+                "done": True,
+                "eval_count": eval_count,
+                "eval_duration": int(eval_count / tokens_per_sec * 1e9),
+            })
+        if self.path != "/api/chat":
+            return self._send({"error": "not found"}, status=404)
+
+        time.sleep(self.latency)
+        content = self.reply(request)
+        final = {
+            "model": request.get("model", ""),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "message": {"role": "assistant", "content": content},
+            "done": True,
+            "done_reason": "stop",
+            "eval_count": 8,
+            "prompt_eval_count": sum(len(m["content"].split()) for m in request.get("messages", [])),
+            "total_duration": int(n),
+        }
+        if not request.get("stream"):
+            return self._send(final)
+
+        # newline-delimited JSON, one word per chunk, then an empty final chunk with the counts
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        words = re.findall(r"\S+\s*", content)
+        for word in words:
+            chunk = {**final, "message": {"role": "assistant", "content": word}, "done": False}
+            self.wfile.write(json.dumps(chunk).encode() + b"\n")
+            self.wfile.flush()
+            time.sleep(self.token_latency)
+        final.update(message={"role": "assistant", "content": ""}, eval_count=len(words), eval_duration=int(len(words) * self.token_latency * 1e9))
+        self.wfile.write(json.dumps(final).encode() + b"\n")
+
+
+def serve(port: int = 0, latency: float = 0.2, handler: type[MockOllamaHandler] = MockOllamaHandler) -> ThreadingHTTPServer:
+    """ Start the mock server on a background thread and return it (`server.server_address` has the port). """
+
+    handler = type(handler.__name__, (handler,), {"latency": latency, "counts": {}})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    server = serve(args.port, args.latency)
+    print(f"Mock Ollama listening on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
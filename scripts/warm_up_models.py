@@ -0,0 +1,41 @@
+"""
+scripts/warm_up_models.py
+
+Pre-pull and load the models listed in config_models.yaml on the configured Ollama host, so the
+first agent call does not pay for the download or the model load.
+
+Usage:
+    python scripts/warm_up_models.py                 # every model
+    python scripts/warm_up_models.py base sql_coder  # selected model names
+    python scripts/warm_up_models.py --no-load base  # pull only
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("models", nargs="*", help="Model names from config_models.yaml (default: all).")
+    parser.add_argument("--no-load", action="store_true", help="Only pull the models, do not load them.")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)  # config_models.yaml is resolved from the project root
+    from gaby_agent.core.agent import warm_up
+
+    start = time.perf_counter()
+    results = warm_up(args.models or None, load=not args.no_load)
+    for model_id, error in results.items():
+        print(f"{'ready ' if error is None else 'FAILED'}  {model_id}" + (f"  ({error})" if error else ""))
+    print(f"Warm-up finished in {time.perf_counter() - start:.1f}s")
+    sys.exit(any(error is not None for error in results.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,8 @@ import pandas as pd
 import streamlit as st
 from pathlib import Path
 
+from core.streaming import profile_csv
+
 # ---------------- CONFIG ----------------
 st.set_page_config(page_title="Gaby Data Cleaning Agent", page_icon="🤖", layout="wide")
 st.title("💬 Gaby AI: Your Data Team's Companion")
@@ -26,18 +28,30 @@ def get_sample_files():
     return [f.name for f in path.glob("*.csv")] if path.exists() else []
 
 def load_data(file, uploaded=False):
+    """ Streams the CSV in chunks; returns the profiler holding the summary and a row preview. """
     try:
-        return pd.read_csv(file) if uploaded else pd.read_csv(str(file)), None
+        return profile_csv(file if uploaded else str(file)), None
     except Exception as e:
         return None, str(e)
 
-def describe_dataframe(df: pd.DataFrame):
-    pass
+def describe_dataframe(df: pd.DataFrame, tags: str):
+    """ Streams Gaby's dataset summary into the page as tokens arrive; returns the final text and metrics. """
+    from core.agent import DatasetSummarizer  # imported on demand: connects to the Ollama host
+
+    stream = DatasetSummarizer().run_stream(user_inputs=tags, data_table=df)
+    st.write_stream(stream)
+    return stream.result, stream.metrics
 # ---------------- STATE ----------------
 if "df" not in st.session_state:
     st.session_state.df = None
+if "summary" not in st.session_state:
+    st.session_state.summary = None
+if "n_rows" not in st.session_state:
+    st.session_state.n_rows = 0
 if "tags" not in st.session_state:
     st.session_state.tags = ""
+if "analysis" not in st.session_state:
+    st.session_state.analysis = None
 
 # ---------------- LAYOUT ----------------
 col1, col2 = st.columns([1, 3])
@@ -51,33 +65,47 @@ with col1:
 
     if st.button("🚀 Analyze", type="primary"):
         if uploaded_file:
-            df, err = load_data(uploaded_file, uploaded=True)
+            profiler, err = load_data(uploaded_file, uploaded=True)
         elif sample != "None":
-            df, err = load_data(Path(__file__).parent / "data" / "input" / sample)
+            profiler, err = load_data(Path(__file__).parent / "data" / "input" / sample)
         else:
-            df, err = None, "No file selected"
+            profiler, err = None, "No file selected"
 
-        if df is not None:
-            st.session_state.df = df
+        if profiler is not None:
+            st.session_state.df = profiler.preview
+            st.session_state.summary = profiler.summary()
+            st.session_state.n_rows = profiler.n_rows
         else:
             st.error(f"Error: {err}")
 
     if st.button("🔄 Reset"):
         st.session_state.df = None
+        st.session_state.summary = None
+        st.session_state.n_rows = 0
         st.session_state.tags = ""
+        st.session_state.analysis = None
 
 # ---- Right: Gaby Window ----
 with col2:
     st.subheader("🧠 Gaby's Window")
     if st.session_state.df is not None:
         df = st.session_state.df
-        st.success(f"Loaded {df.shape[0]} rows × {df.shape[1]} columns")
+        st.success(f"Loaded {st.session_state.n_rows} rows × {df.shape[1]} columns")
 
         st.markdown("### 📋 Column Summary")
-        st.dataframe(describe_dataframe(df), width='stretch')
+        st.dataframe(st.session_state.summary, width='stretch')
 
         st.markdown("### 🤖 Gaby's Analysis")
         st.write(f"Based on your tags: {st.session_state.tags}")
+        if st.button("✨ Summarize dataset"):
+            try:
+                summary, metrics = describe_dataframe(df, st.session_state.tags)
+                st.session_state.analysis = summary
+                st.caption(f"First token after {metrics.ttft or 0:.2f}s · {metrics.tokens_per_sec:.1f} tokens/s")
+            except Exception as e:
+                st.error(f"Gaby could not reach the model: {e}")
+        elif st.session_state.analysis:
+            st.write(st.session_state.analysis)
         st.write("- Handle missing values")
         st.write("- Remove duplicates")
         st.write("- Standardize formats")
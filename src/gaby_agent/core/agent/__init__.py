@@ -1,19 +1,41 @@
 """ agent/__init__.py
+
+Exports are loaded on first access, so importing the package (e.g. for `agent._budget`) does not
+pull in the Ollama client or connect to anything.
 """
 
-from .cleaner import (
-    DatasetSummarizer,
-    DataFieldMetaDescription
-)
-
-from ._utils import (
-    TOOLS_REGISTRY,
-    agent_toolbox
-)
-
-__all__ = [
-    "DatasetSummarizer",
-    "DataFieldMetaDescription",
-    "TOOLS_REGISTRY",
-    "agent_toolbox"
-]
\ No newline at end of file
+from importlib import import_module
+
+_EXPORTS = {
+    "DatasetSummarizer": ".cleaner",
+    "DataFieldMetaDescription": ".cleaner",
+    "DataFieldBatchDescription": ".cleaner",
+    "warm_up": "._core",
+    "StreamResult": "._core",
+    "StreamMetrics": "._core",
+    "ModelRegistry": "._registry",
+    "get_model_registry": "._registry",
+    "set_model_registry": "._registry",
+    "ClientPool": "._connection",
+    "get_client_pool": "._connection",
+    "set_client_pool": "._connection",
+    "ResponseCache": "._cache",
+    "get_response_cache": "._cache",
+    "set_response_cache": "._cache",
+    "TOOLS_REGISTRY": "._utils",
+    "agent_toolbox": "._utils",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
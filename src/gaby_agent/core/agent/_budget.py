@@ -0,0 +1,311 @@
+"""
+
+src.gaby_agent.core.agent._budget
+Context-size-aware prompt budgeting.
+
+Ollama silently truncates prompts longer than the model's `num_ctx` (1024 tokens by default),
+dropping the start of the conversation, i.e. the system prompt. Table inputs are therefore fitted
+into the tokens left once the system prompt, the template and the generation budget
+(`num_predict`) are accounted for, by a ladder of increasingly lossy encodings:
+
+    1. the preferred encoding (`DataFrame.to_string` / `to_markdown`) when it already fits,
+    2. compact TSV with short floats (no column padding),
+    3. long text cells truncated,
+    4. empty and constant columns dropped (named in a trailing note),
+    5. one line per column (numeric ranges / means, a few example values) when that is shorter
+       (skipped with `summarize=False`, for tables whose rows are the content, e.g. one row per field),
+    6. fewer rows (the most that fit, found by bisection; omitted rows are counted or named in a note),
+    7. columns with the most missing values dropped until it fits.
+
+Tokens are estimated from a per-model characters-per-token ratio (`profile.chars_per_token` in
+config_models.yaml); an exact tokenizer can be registered with `register_token_counter`.
+"""
+
+import math
+import re
+from threading import Lock
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+DEFAULT_CHARS_PER_TOKEN = 3.0   # conservative for tables: digits and separators tokenize poorly
+SAFETY_MARGIN = 0.1             # share of the context kept free for estimation error
+MAX_CELL_CHARS = 32             # text cells longer than this are cut in step 3
+INFO_SAMPLE_ROWS = 1000         # rows inspected to find empty / constant columns
+EXAMPLE_VALUES = 2              # example values per column in the columnar encoding
+OMITTED_LABELS_SHARE = 0.25     # budget share kept in step 6 for the labels of the omitted rows
+
+TokenCounter = Callable[[str], int]
+
+_TEMPLATE_FIELD = re.compile(r"\{[^{}]*\}")
+_counters_lock = Lock()
+_counters: dict[str, TokenCounter] = {}
+
+
+def register_token_counter(model_id: str, counter: TokenCounter):
+    """ Use an exact tokenizer (text -> token count) for `model_id` instead of the estimate. """
+
+    with _counters_lock:
+        _counters[model_id] = counter
+
+
+def token_counter(model=None) -> TokenCounter:
+    """ Token counter for a ModelConfig from config_models.yaml (or the default estimate for None). """
+
+    model_id = getattr(model, "model_id", None)
+    if isinstance(model_id, str) and model_id in _counters:
+        return _counters[model_id]
+
+    chars_per_token = (getattr(model, "profile", None) or {}).get("chars_per_token") or DEFAULT_CHARS_PER_TOKEN
+    return lambda text: math.ceil(len(text) / chars_per_token)
+
+
+def count_tokens(text: str, model=None) -> int:
+    return token_counter(model)(text)
+
+
+def prompt_budget(agent, *fixed_inputs: str, count: TokenCounter | None = None) -> int:
+    """ Tokens left for a table input of `agent` in one prompt.
+
+    Args:
+        agent (GabyBasement): Agent whose options (`num_ctx`, `num_predict`) and prompt are used.
+        *fixed_inputs (str): The other (not compressible) template inputs of the call.
+        count (TokenCounter | None): Token counter (default: the one of the agent's model).
+    """
+
+    count = count or token_counter(agent.model_name)
+    options = agent.kwargs.get("options") or {}
+    num_ctx = options.get("num_ctx") or 2048
+    num_predict = options.get("num_predict")
+    if num_predict is None or num_predict < 0:
+        num_predict = num_ctx // 4  # unbounded generation: keep a quarter of the context for it
+
+    template = getattr(agent.prompt, "input_template", None) or ""
+    fixed = "\n".join([message["content"] for message in agent.system_prompt] + [_TEMPLATE_FIELD.sub("", template), *fixed_inputs])
+    available = int((num_ctx - num_predict) * (1 - SAFETY_MARGIN)) - count(fixed)
+    return max(available, 0)
+
+
+@dataclass
+class BudgetReport:
+    """ What `fit_table` had to do to bring a table within its token budget. """
+
+    budget: int
+    tokens_before: int
+    tokens_after: int = 0
+    encoding: str = "string"
+    truncated_cells: int = 0
+    dropped_rows: int = 0
+    dropped_columns: list[str] = field(default_factory=list)
+    summarized: bool = False
+
+    @property
+    def trimmed_tokens(self) -> int:
+        return max(self.tokens_before - self.tokens_after, 0)
+
+    @property
+    def fits(self) -> bool:
+        return self.tokens_after <= self.budget
+
+    @property
+    def trimmed(self) -> bool:
+        return self.trimmed_tokens > 0 or self.dropped_rows > 0 or bool(self.dropped_columns)
+
+    def __str__(self) -> str:
+        steps = [self.encoding]
+        if self.truncated_cells:
+            steps.append(f"{self.truncated_cells} cells truncated")
+        if self.dropped_rows:
+            steps.append(f"{self.dropped_rows} rows dropped")
+        if self.dropped_columns:
+            steps.append(f"{len(self.dropped_columns)} columns dropped")
+        return (f"{self.tokens_before} -> {self.tokens_after} tokens (budget {self.budget}, "
+                f"trimmed {self.trimmed_tokens}): {', '.join(steps)}")
+
+
+def _encode(frame: pd.DataFrame, encoding: str) -> str:
+    if encoding == "markdown":
+        return frame.to_markdown(index=False)
+    if encoding == "tsv":
+        return frame.to_csv(sep="\t", index=False, float_format="%.4g").rstrip("\n")
+    return frame.to_string(index=False)
+
+
+def _truncate_cells(frame: pd.DataFrame, max_chars: int) -> tuple[pd.DataFrame, int]:
+    frame = frame.copy()
+    truncated = 0
+    for column in frame.columns:
+        if frame[column].dtype.kind in "biufcmM":
+            continue
+        values = frame[column].astype(str)
+        long = (values.str.len() > max_chars) & frame[column].notna()
+        if long.any():
+            frame[column] = frame[column].astype(object).where(~long, values.str.slice(0, max_chars - 1) + "…")
+            truncated += int(long.sum())
+    return frame, truncated
+
+
+def _uninformative(sample: pd.DataFrame) -> dict[str, str]:
+    """ Empty and constant columns of `sample` -> short note ("empty" or "=value"). """
+
+    notes = {}
+    for column in sample.columns:
+        values = sample[column].dropna()
+        if values.empty:
+            notes[column] = "empty"
+        elif values.nunique() == 1:
+            notes[column] = f"={str(values.iloc[0])[:MAX_CELL_CHARS]}"
+    return notes
+
+
+def _column_lines(data: pd.DataFrame) -> dict[str, str]:
+    """ One line per column: numeric columns summarized, other columns by a few example values. """
+
+    lines = {}
+    for column in data.columns:
+        values = data[column].dropna()
+        missing = 1 - len(values) / len(data) if len(data) else 0.0
+        if values.empty:
+            summary = "empty"
+        elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            summary = f"{values.min():.4g}..{values.max():.4g}, mean {values.mean():.4g}"
+        else:
+            summary = " | ".join(str(value)[:MAX_CELL_CHARS] for value in values.unique()[:EXAMPLE_VALUES])
+        if missing:
+            summary += f", {missing:.0%} missing"
+        lines[column] = f"{column} ({data[column].dtype}): {summary}"
+    return lines
+
+
+def _omitted_note(notes: dict[str, str]) -> str:
+    return "\nOmitted columns: " + ", ".join(f"{column} {note}" for column, note in notes.items()) if notes else ""
+
+
+def _omitted_rows_note(labels: list[str], n_omitted: int) -> str:
+    """ Note naming the omitted rows by `labels` (a prefix of them), or only counting them. """
+
+    if not n_omitted:
+        return ""
+    if not labels:
+        return f"\n({n_omitted} more rows omitted)"
+    rest = n_omitted - len(labels)
+    return "\nOmitted rows: " + ", ".join(labels) + (f" (+{rest} more)" if rest else "")
+
+
+def _fit_labels(base: str, labels: list[str], n_omitted: int, budget: int, count: TokenCounter) -> str:
+    """ `base` with a note naming as many of the omitted rows' `labels` as fit (bisection on the count). """
+
+    lo, hi = 0, len(labels)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count(base + _omitted_rows_note(labels[:mid], n_omitted)) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    return base + _omitted_rows_note(labels[:lo], n_omitted)
+
+
+def fit_table(
+    data: pd.DataFrame,
+    budget: int,
+    rows: int | None = None,
+    encoding: str = "string",
+    count: TokenCounter | None = None,
+    summarize: bool = True,
+    label: str | None = None
+) -> tuple[str, BudgetReport]:
+    """ Encode a table for a prompt in at most `budget` tokens.
+
+    Args:
+        data (pd.DataFrame): Table (or whole dataset; see `rows`). Column statistics come from its first INFO_SAMPLE_ROWS rows.
+        budget (int): Token budget, e.g. from `prompt_budget`.
+        rows (int | None): Rows shown at most (default: all).
+        encoding (str): Preferred encoding, used as is when it fits: "string", "markdown" or "tsv".
+        count (TokenCounter | None): Token counter (default: the estimate of `token_counter()`).
+        summarize (bool): Allow the columnar summary (step 5); False keeps rows, e.g. for a table of fields.
+        label (str | None): Column naming the rows (e.g. "data_field_name"); omitted rows are listed by it.
+
+    Returns:
+        tuple[str, BudgetReport]: Encoded table and what was trimmed. The text can still exceed the
+        budget if not even a single column fits (`report.fits` is False).
+    """
+
+    count = count or token_counter()
+    frame = data.head(rows) if rows is not None else data
+    text = _encode(frame, encoding)
+    report = BudgetReport(budget=budget, tokens_before=count(text), encoding=encoding)
+
+    def done(text: str) -> tuple[str, BudgetReport]:
+        report.tokens_after = count(text)
+        return text, report
+
+    if report.tokens_before <= budget:
+        return done(text)
+
+    report.encoding = "tsv"
+    text = _encode(frame, "tsv")
+    if count(text) <= budget:
+        return done(text)
+
+    frame, report.truncated_cells = _truncate_cells(frame, MAX_CELL_CHARS)
+    text = _encode(frame, "tsv")
+    if count(text) <= budget:
+        return done(text)
+
+    sample = data.head(INFO_SAMPLE_ROWS)
+    omitted = _uninformative(sample) if len(sample.columns) > 1 else {}
+    if len(omitted) == len(sample.columns):
+        omitted.popitem()  # keep at least one column
+    if omitted:
+        frame = frame.drop(columns=list(omitted))
+        report.dropped_columns = list(omitted)
+        text = _encode(frame, "tsv") + _omitted_note(omitted)
+        if count(text) <= budget:
+            return done(text)
+
+    if summarize:
+        # a summary of every shown column over the whole sample can beat a few raw rows
+        lines = _column_lines(sample.drop(columns=list(omitted)))
+        text = "\n".join(lines.values()) + _omitted_note(omitted)
+        if count(text) <= budget:
+            report.encoding, report.summarized, report.dropped_rows = "columns", True, len(frame)
+            return done(text)
+
+    # the most rows that fit with a note counting the rest, keeping a share of the budget to name them
+    n_rows = len(frame)
+    labels = [str(value)[:MAX_CELL_CHARS] for value in data[label].iloc[:n_rows]] if label in data.columns else []
+    reserve = min(count(_omitted_rows_note(labels[1:], n_rows - 1)), int(budget * OMITTED_LABELS_SHARE)) if labels else 0
+
+    def rows_text(k: int) -> str:
+        return _encode(frame.head(k), "tsv") + _omitted_note(omitted)
+
+    def most_rows(limit: int) -> int:
+        best, lo, hi = 0, 1, n_rows - 1
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            if count(rows_text(mid) + _omitted_rows_note([], n_rows - mid)) <= limit:
+                best, lo = mid, mid + 1
+            else:
+                hi = mid - 1
+        return best
+
+    best = most_rows(budget - reserve) or (most_rows(budget) if reserve else 0)
+    if best:
+        report.dropped_rows = n_rows - best
+        return done(_fit_labels(rows_text(best), labels[best:], n_rows - best, budget, count))
+
+    frame = frame.head(1)
+    report.dropped_rows = n_rows - len(frame)
+    rows_note = _omitted_rows_note([], report.dropped_rows)
+    text = rows_text(1) + rows_note
+
+    # least complete columns go first; the note only counts them so it cannot outgrow the budget
+    by_missing = sample[frame.columns].isna().mean().sort_values(ascending=False, kind="stable").index.tolist()
+    for n_dropped, column in enumerate(by_missing[:-1], start=1):
+        frame = frame.drop(columns=column)
+        report.dropped_columns.append(column)
+        text = _encode(frame, "tsv") + _omitted_note(omitted) + rows_note + f"\n({n_dropped} more columns omitted)"
+        if count(text) <= budget:
+            break
+    return done(text)
@@ -0,0 +1,161 @@
+"""
+
+src.gaby_agent.core.agent._cache
+Opt-in, persistent cache of chat responses shared by every agent.
+
+Entries are keyed on everything that determines a completion: the model id, the chat messages
+(system prompt + rendered user input), the generation options and the output format / tools.
+Only deterministic requests (temperature 0 or a fixed seed) are cached, since a sampled answer
+is not a property of its prompt. Responses live in a single SQLite file, and the least recently
+used ones are evicted once the cache grows past `max_entries` or `max_bytes`.
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+from pathlib import Path
+from threading import Lock
+from dataclasses import dataclass, field
+from ollama import ChatResponse
+
+from ..config import AGENT_CACHE_PATH
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model_id TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+
+def is_deterministic(options: dict | None) -> bool:
+    """ Whether generation `options` give a reproducible completion (greedy decoding or a fixed seed). """
+
+    options = options or {}
+    seed = options.get("seed")
+    return options.get("temperature") == 0 or (seed is not None and seed >= 0)
+
+
+def make_key(model_id: str, messages: list[dict], chat_kwargs: dict) -> str:
+    """ Content hash of one chat request. Streaming and keep-alive do not change the answer and are ignored. """
+
+    request = {
+        "model": model_id,
+        "messages": messages,
+        "options": {k: v for k, v in (chat_kwargs.get("options") or {}).items() if v is not None},
+        "format": chat_kwargs.get("format"),
+        "tools": chat_kwargs.get("tools"),
+    }
+    return hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode()).hexdigest()
+
+
+@dataclass
+class ResponseCache:
+    """ LRU cache of chat responses in an SQLite database (in memory when `path` is None). """
+
+    path: str | Path | None = None
+    max_entries: int = DEFAULT_MAX_ENTRIES
+    max_bytes: int = DEFAULT_MAX_BYTES
+
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    evictions: int = field(default=0, init=False)
+
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.path is not None:
+            self.path = Path(self.path)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path or ":memory:"), check_same_thread=False)
+        self.connection.executescript(_SCHEMA)
+
+    def get(self, key: str) -> ChatResponse | None:
+        with self._lock:
+            row = self.connection.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with self.connection:
+                self.connection.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+        return ChatResponse.model_validate_json(row[0])
+
+    def put(self, key: str, model_id: str, response: ChatResponse):
+        payload = response.model_dump_json()
+        now = time.time()
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model_id, payload, len(payload), now, now)
+            )
+            self._evict()
+
+    def _evict(self):
+        n_entries, n_bytes = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        while n_entries > self.max_entries or (n_entries > 1 and n_bytes > self.max_bytes):
+            key, size = self.connection.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            self.connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            n_entries, n_bytes = n_entries - 1, n_bytes - size
+            self.evictions += 1
+
+    def invalidate(self, model_id: str | None = None) -> int:
+        """ Drop every entry (or only those of `model_id`). Returns the number of entries removed. """
+
+        with self._lock, self.connection:
+            if model_id is None:
+                return self.connection.execute("DELETE FROM responses").rowcount
+            return self.connection.execute("DELETE FROM responses WHERE model_id = ?", (model_id,)).rowcount
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            n_entries, n_bytes = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        total = self.hits + self.misses
+        return {
+            "entries": n_entries,
+            "bytes": n_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+_cache_lock = Lock()
+_response_cache: ResponseCache | None = None
+_cache_configured = False
+
+
+def get_response_cache() -> ResponseCache | None:
+    """ Process-wide cache used by `GabyBasement.run`; None (disabled) unless AGENT_CACHE_PATH is set. """
+
+    global _response_cache, _cache_configured
+
+    if not _cache_configured:
+        with _cache_lock:
+            if not _cache_configured:
+                _response_cache = ResponseCache(path=AGENT_CACHE_PATH) if AGENT_CACHE_PATH else None
+                _cache_configured = True
+    return _response_cache
+
+
+def set_response_cache(cache: ResponseCache | None):
+    """ Replace the process-wide cache; pass None to disable caching. """
+
+    global _response_cache, _cache_configured
+
+    with _cache_lock:
+        _response_cache = cache
+        _cache_configured = True
@@ -0,0 +1,130 @@
+"""
+
+src.gaby_agent.core.agent._connection
+Connection manager for the Ollama hosts used by the agents.
+
+One `ollama.Client` is kept per host (its HTTP connection pool is thread-safe and shared by every
+agent routed to that host) and one `ollama.AsyncClient` per host and event loop. Agents name the
+host they run on with an alias ("lightning" for the remote GPU server, "local" for the local
+server) or an explicit URL; an unset or unconfigured alias falls back to the default host.
+"""
+
+import os
+import asyncio
+import ollama
+from threading import Lock
+from urllib.parse import urlsplit
+from weakref import WeakKeyDictionary
+from typing import Any, Callable
+
+from ..config import LIGHTNING_OLLAMA_HOST_URL, LOCAL_OLLAMA_HOST_URL
+
+HOST_ALIASES = {
+    "lightning": LIGHTNING_OLLAMA_HOST_URL,
+    "local": LOCAL_OLLAMA_HOST_URL,
+}
+LOOPBACK_HOSTS = {"localhost", "127.0.0.1", "::1", "0.0.0.0"}
+
+
+def default_host() -> str:
+    """ Ollama host used when an agent does not choose one (the Lightning host when configured, else the local one). """
+
+    return HOST_ALIASES["lightning"] or HOST_ALIASES["local"]
+
+
+def resolve_host(host: str | None = None) -> str:
+    """ URL for a host alias ("lightning", "local"), an explicit URL, or None for the default host. """
+
+    if host is None:
+        return default_host()
+    if host in HOST_ALIASES:
+        return HOST_ALIASES[host] or default_host()
+    return host
+
+
+def is_local_host(host: str | None = None) -> bool:
+    """ Whether `host` (alias, URL or None) is the Ollama server on this machine: the "local" alias or a loopback URL. """
+
+    url = resolve_host(host) or os.getenv("OLLAMA_HOST", "localhost") # ollama.Client's own fallback when no URL is set
+    if HOST_ALIASES["local"] and url == HOST_ALIASES["local"]:
+        return True
+    return urlsplit(url if "://" in url else f"http://{url}").hostname in LOOPBACK_HOSTS
+
+
+class ClientPool:
+    """ Thread-safe pool of Ollama clients, one per host (and per event loop for async clients). """
+
+    def __init__(
+        self,
+        factory: Callable[[str], Any] = ollama.Client,
+        async_factory: Callable[[str], Any] = ollama.AsyncClient
+    ):
+        self.factory = factory
+        self.async_factory = async_factory
+        self._lock = Lock()
+        self._clients: dict[str, Any] = {}
+        self._async_clients: WeakKeyDictionary = WeakKeyDictionary() # event loop -> {host: AsyncClient}
+
+    def get(self, host: str | None = None):
+        """ Shared client for `host` (alias, URL or None for the default), created on first use. """
+
+        url = resolve_host(host)
+        with self._lock:
+            if url not in self._clients:
+                print("Connecting to Ollama host:", url)
+                try:
+                    self._clients[url] = self.factory(url)
+                except Exception as e:
+                    raise RuntimeError(f"Failed to init Ollama client for {url}: {e}")
+            return self._clients[url]
+
+    def aget(self, host: str | None = None):
+        """ Async client for `host` bound to the running event loop (httpx async connections cannot cross loops). """
+
+        url = resolve_host(host)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+            if url not in clients:
+                clients[url] = self.async_factory(url)
+            return clients[url]
+
+    def set(self, host: str | None, client):
+        """ Use a ready client for `host` (e.g. one with a custom transport). """
+
+        with self._lock:
+            self._clients[resolve_host(host)] = client
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+            self._async_clients = WeakKeyDictionary()
+
+    @property
+    def hosts(self) -> list[str]:
+        return list(self._clients)
+
+
+_pool_lock = Lock()
+_client_pool: ClientPool | None = None
+
+
+def get_client_pool() -> ClientPool:
+    """ Process-wide pool used by every agent. """
+
+    global _client_pool
+
+    if _client_pool is None:
+        with _pool_lock:
+            if _client_pool is None:
+                _client_pool = ClientPool()
+    return _client_pool
+
+
+def set_client_pool(pool: ClientPool):
+    """ Replace the process-wide pool (e.g. with fake clients in tests). """
+
+    global _client_pool
+
+    with _pool_lock:
+        _client_pool = pool
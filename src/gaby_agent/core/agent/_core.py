@@ -4,19 +4,23 @@ src.gaby_agent.core.agent._core
 Core classes and functions for the Gaby Agent system.
 """
 
+import time
+import asyncio
 import ollama
 from abc import ABC
-from threading import Lock
+from threading import RLock
+from types import MappingProxyType
+from collections.abc import Mapping
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass, field
 from ollama import Options, ChatResponse, ShowResponse
 
 from ._utils import Toolkit
-from ..config import LocalConfig
-
-
-config = LocalConfig()
-
-print(config)
+from ._registry import get_model_registry, DEFAULT_KEEP_ALIVE
+from ._cache import ResponseCache, get_response_cache, is_deterministic, make_key
+from ._connection import get_client_pool, resolve_host
+from ._tuning import tuned_options
+from ..config import LocalConfig, get_local_config
 
 DEFAULT_OPTIONS = Options(
     num_ctx=1024,         # shorter context → less overhead
@@ -25,13 +29,13 @@ DEFAULT_OPTIONS = Options(
     top_k=40,             # typical safe default
     repeat_penalty=1.05,  # lighter repetition check → less compute
     num_predict=128,      # cap on tokens (speeds up response)
-    num_thread=2,         # match physical CPU cores (adjust to your machine)
+    num_thread=None,      # per model in GabyBasement._resolve: physical cores of this machine for the local host, server default for remote ones
     num_gpu=1,            # offload to GPU if you have one
     low_vram=True,       # only True if you’re memory-starved
     f16_kv=True,          # faster key/value cache
     use_mmap=True,        # mmap the model for faster loading
     use_mlock=False,      # set True if you want to lock into RAM
-    seed=None             # nondeterministic, so cache doesn’t collide
+    seed=None             # random sampling; a fixed seed (or temperature 0) makes responses cacheable
 )
 
 
@@ -39,10 +43,19 @@ CHAT_CONFIG = dict(
     stream=False,
     # think='low',
     options=DEFAULT_OPTIONS.model_dump(),
-    keep_alive='15m',
+    keep_alive=DEFAULT_KEEP_ALIVE,
     # tools = FUNCTION CALLABLES
 )
 
+def freeze_chat_config(base: Mapping, options: Options | Mapping | None = None, **overrides) -> Mapping:
+    """ Read-only chat settings: `base` with `options` merged into its generation options and `overrides` on top. """
+
+    if isinstance(options, Options):
+        options = options.model_dump(exclude_unset=True)
+    merged = {**base, **overrides}
+    merged["options"] = MappingProxyType({**base.get("options", {}), **(options or {})})
+    return MappingProxyType(merged)
+
 @dataclass
 class Instructor:
     prompt: str
@@ -57,38 +70,186 @@ class Instructor:
 
         return str(kwargs)
 
+@dataclass
+class StreamMetrics:
+    """ Latency and throughput of one streamed completion. """
+
+    ttft: float | None = None         # seconds from request to the first content token
+    duration: float = 0.0             # seconds from request to the final chunk
+    eval_count: int = 0               # generated tokens (server count, or chunks if unreported)
+    tokens_per_sec: float = 0.0       # generation throughput
+
+class StreamResult:
+    """ Iterable of text chunks from `GabyBasement.run_stream`.
+
+    Iterating yields content as it arrives. Once exhausted, `text` holds the assembled completion,
+    `result` the post-processed output (same as `run` would return) and `metrics` the TTFT and
+    tokens/sec of the call.
+    """
+
+    def __init__(
+        self,
+        agent: "GabyBasement",
+        chunks: Iterator[ChatResponse],
+        started: float,
+        on_complete: Callable[[ChatResponse], None] | None = None
+    ):
+        self.agent = agent
+        self.text = ""
+        self.result = None
+        self.metrics = StreamMetrics()
+        self._chunks = chunks
+        self._started = started
+        self._consumed = False
+        self._on_complete = on_complete
+
+    def __iter__(self) -> Iterator[str]:
+        if self._consumed:
+            raise RuntimeError("StreamResult can only be iterated once; use `.result` afterwards.")
+        self._consumed = True
+
+        parts, last, n_chunks = [], None, 0
+        for chunk in self._chunks:
+            last = chunk
+            content = (chunk.message.content or "") if chunk.message is not None else ""
+            if not content:
+                continue
+            if self.metrics.ttft is None:
+                self.metrics.ttft = time.perf_counter() - self._started
+            n_chunks += 1
+            parts.append(content)
+            yield content
+
+        self.text = "".join(parts)
+        self.metrics.duration = time.perf_counter() - self._started
+        self._finish(last, n_chunks)
+
+    def _finish(self, last: ChatResponse | None, n_chunks: int):
+        metrics = self.metrics
+        if last is not None and last.eval_count and last.eval_duration:
+            metrics.eval_count = last.eval_count
+            metrics.tokens_per_sec = last.eval_count / (last.eval_duration / 1e9)
+        else:
+            metrics.eval_count = n_chunks
+            generating = metrics.duration - (metrics.ttft or 0.0)
+            metrics.tokens_per_sec = n_chunks / generating if generating > 0 else 0.0
+
+        message = ollama.Message(role="assistant", content=self.text)
+        response = last.model_copy(update={"message": message}) if last is not None else ChatResponse(message=message)
+        ttft = "n/a" if metrics.ttft is None else f"{metrics.ttft:.3f}s"
+        print(f"Streamed {self.agent.name}: ttft={ttft}, {metrics.eval_count} tokens at {metrics.tokens_per_sec:.1f} tokens/s")
+        if self._on_complete is not None:
+            self._on_complete(response)
+        self.result = self.agent.post_process(response)
+
+    def consume(self):
+        """ Drain the stream and return the post-processed result. """
+
+        for _ in self:
+            pass
+        return self.result
+
+_resolve_lock = RLock()
+
+
+class resolved_on_first_use:
+    """ Class attribute of an agent (model_name, host, kwargs) resolved from config_models.yaml on first access.
+
+    Defining an agent class then costs nothing at import time: the model stack is read and the
+    options are tuned when the class (or an instance of it) is first used.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if "_spec" not in owner.__dict__:
+            raise AttributeError(f"{owner.__name__}.{self.name} is only defined on agent subclasses.")
+        owner._resolve()
+        return owner.__dict__[self.name] if instance is None else getattr(instance, self.name)
+
+
 class GabyBasement(ABC):
     """Base class for creating thought chains using the Ollama LLM."""
 
-    _lock = Lock()
-    _instance = None
-    client: ollama.Client = None
-    config: LocalConfig = config 
+    config: LocalConfig | None = None # defaults to get_local_config() when the class is resolved
+    model_name = resolved_on_first_use()
+    host = resolved_on_first_use()
+    kwargs = resolved_on_first_use()
 
-    def __new__(cls, *args, **kwargs):
-        """ Singleton pattern to ensure only one instance of the client exists. """
-        
-        if cls._instance is None:
-            with cls._lock:
-                cls._instance = super().__new__(cls, *args, **kwargs)
-                try:
-                    host_url = config.lightning_ollama if config.lightning_ollama != "" else config.local_ollama
-                    print("Connecting to Ollama host:", host_url)
-                    
-                    cls._instance.client = ollama.Client(host_url)
-
-                except Exception as e:
-                    raise RuntimeError(f"Failed to init GabyBasement client: {e}")
-                
-        return cls._instance
-
-    def __init_subclass__(cls, prompt: Instructor, model_name: str, **kwargs):
+    def __init__(self, host: str | None = None, options: Options | Mapping | None = None):
+        """ Agents are cheap: the Ollama client comes from the shared per-host pool.
+
+        Args:
+            host (str | None): Host alias ("lightning", "local") or URL overriding the class / model config host.
+            options (Options | Mapping | None): Generation options overriding the class options for this instance.
+        """
+
+        self._client = None
+        if host is not None:
+            self.host = host
+        if options is not None:
+            self.kwargs = freeze_chat_config(type(self).kwargs, options)
+
+    def __init_subclass__(
+        cls,
+        prompt: Instructor,
+        model_name: str,
+        use_cache: bool = True,
+        host: str | None = None,
+        options: Options | Mapping | None = None,
+        format: str | dict | None = None,
+        **kwargs
+    ):
         super().__init_subclass__(**kwargs)
         
         cls.prompt = prompt 
         cls.name = cls.__qualname__
-        cls.kwargs = CHAT_CONFIG.copy()
-        cls.model_name = cls.config.get_model(model_name) 
+        cls.use_cache = use_cache # set False to always query the model, even for deterministic options
+        cls._spec = dict(model_name=model_name, host=host, options=options, format=format)
+
+    @classmethod
+    def _resolve(cls):
+        """ Look up the model of this agent class and freeze its chat settings (once). """
+
+        with _resolve_lock:
+            spec = cls.__dict__.get("_spec")
+            if spec is None or "kwargs" in cls.__dict__:
+                return
+
+            cls.model_name = (cls.config or get_local_config()).get_model(spec["model_name"])
+            # endpoint: explicit class host, else the host of the model in config_models.yaml, else the default host
+            cls.host = spec["host"] or getattr(cls.model_name, "host", None)
+
+            overrides = {"format": spec["format"]} if spec["format"] is not None else {}
+            if len(cls.prompt.tools) > 0:
+                overrides["tools"] = [tool.meta for tool in cls.prompt.tools if isinstance(tool, Toolkit)]
+            options = spec["options"]
+            if isinstance(options, Options):
+                options = options.model_dump(exclude_unset=True)
+            # read-only, so concurrent runs never see another call's settings;
+            # hardware (local host only) / calibration tuned options of the model on its host, then the agent's own options
+            cls.kwargs = freeze_chat_config(CHAT_CONFIG, {**tuned_options(cls.model_name, host=cls.host), **(options or {})}, **overrides)
+
+    @property
+    def client(self) -> ollama.Client:
+        """ Client of this agent's host from the shared pool (or one assigned to this instance). """
+
+        client = self.__dict__.get("_client")
+        return client if client is not None else get_client_pool().get(self.host)
+
+    @client.setter
+    def client(self, client: ollama.Client):
+        self._client = client
+
+    @property
+    def host_url(self) -> str:
+        return resolve_host(self.host)
+
+    def chat_kwargs(self, **overrides) -> dict:
+        """ Fresh keyword arguments for one `client.chat` call. """
+
+        return {**self.kwargs, "options": dict(self.kwargs["options"]), **overrides}
     
     @property
     def system_prompt(self):# -> list[dict[str, Any]]:
@@ -105,42 +266,141 @@ class GabyBasement(ABC):
 
         return kwargs
 
-    def run(self, **kwargs) -> str:
-        """ Main method to execute the thought chain. """
+    def _messages(self, **kwargs) -> list[dict]:
+        """ Validate the client / model and build the chat messages for one call. """
 
-        if not hasattr(self, "client") or self.client is None:
+        if self.client is None:
             raise RuntimeError("Ollama client is not initialized."
                                " Ensure Ollama is running and OLLAMA_HOST_URL is correct.")
 
-        self.validate_model_exists(self.model_name.model_id)
-        
         print(f"Running thought Chain: {self.name}")
 
         kwargs = self.pre_process(**kwargs)
         
         user_inputs = self.prompt.input_validator(**kwargs)
 
-        if len(self.prompt.tools) > 0:
-            self.kwargs['tools'] = [tool.meta for tool in self.prompt.tools if isinstance(tool, Toolkit)]
-            
-        response = self.client.chat(
-            model=self.model_name.model_id,
-            messages=self.system_prompt + [{"role": "user", "content": user_inputs}],
-            **self.kwargs
-        )
+        return self.system_prompt + [{"role": "user", "content": user_inputs}]
+
+    def _model_missing(self, error: ollama.ResponseError):
+        if error.status_code == 404:
+            # the model disappeared from the host since it was verified: check again next run
+            get_model_registry().invalidate(self.model_name.model_id)
+
+    def _response_cache(self, messages: list[dict]) -> tuple[ResponseCache | None, str | None]:
+        """ The shared response cache and this request's key, or (None, None) if the call is not cacheable. """
+
+        cache = get_response_cache()
+        if cache is None or not self.use_cache or not is_deterministic(self.kwargs.get("options")):
+            return None, None
+        return cache, make_key(self.model_name.model_id, messages, self.kwargs)
+
+    def _chat(self, messages: list[dict]) -> ChatResponse:
+        self.validate_model_exists(self.model_name.model_id)
+        try:
+            return self.client.chat(model=self.model_name.model_id, messages=messages, **self.chat_kwargs())
+        except ollama.ResponseError as e:
+            self._model_missing(e)
+            raise
+
+    def _chat_stream(self, messages: list[dict]) -> Iterator[ChatResponse]:
+        # the request is only sent once the stream is iterated, so errors surface here
+        self.validate_model_exists(self.model_name.model_id)
+        try:
+            yield from self.client.chat(
+                model=self.model_name.model_id,
+                messages=messages,
+                **self.chat_kwargs(stream=True)
+            )
+        except ollama.ResponseError as e:
+            self._model_missing(e)
+            raise
+
+    def run(self, **kwargs) -> str:
+        """ Main method to execute the thought chain. """
+
+        messages = self._messages(**kwargs)
+        cache, key = self._response_cache(messages)
+
+        response = cache.get(key) if cache is not None else None
+        if response is None:
+            response = self._chat(messages)
+            if cache is not None:
+                cache.put(key, self.model_name.model_id, response)
+        else:
+            print(f"Cached response for {self.name}")
+
+        print(f"Response from model {self.model_name.model_id}: {response}")
+        return self.post_process(response)
+
+    def run_stream(self, **kwargs) -> StreamResult:
+        """ Execute the thought chain, streaming the completion as it is generated.
+
+        Iterate the returned `StreamResult` for text chunks (e.g. `st.write_stream`); afterwards
+        `.result` holds the post-processed output and `.metrics` the TTFT and tokens/sec.
+        """
+
+        messages = self._messages(**kwargs)
+        cache, key = self._response_cache(messages)
+        started = time.perf_counter()
+
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return StreamResult(self, iter([cached]), started)
+            return StreamResult(self, self._chat_stream(messages), started, lambda response: cache.put(key, self.model_name.model_id, response))
+        return StreamResult(self, self._chat_stream(messages), started)
+
+    def _async_client(self) -> ollama.AsyncClient:
+        """ AsyncClient of this agent's host for the running event loop. """
+
+        return get_client_pool().aget(self.host)
+
+    async def arun(self, **kwargs) -> str:
+        """ Async variant of `run`: awaits the chat request without blocking the event loop. """
+
+        messages = self._messages(**kwargs)
+        cache, key = self._response_cache(messages)
+
+        response = cache.get(key) if cache is not None else None
+        if response is None:
+            model_id = self.model_name.model_id
+            if not get_model_registry().is_available(self.client, model_id):
+                await asyncio.to_thread(self.validate_model_exists, model_id)
+            try:
+                response = await self._async_client().chat(model=model_id, messages=messages, **self.chat_kwargs())
+            except ollama.ResponseError as e:
+                self._model_missing(e)
+                raise
+            if cache is not None:
+                cache.put(key, model_id, response)
+        else:
+            print(f"Cached response for {self.name}")
+
         print(f"Response from model {self.model_name.model_id}: {response}")
         return self.post_process(response)
 
     def validate_model_exists(self, model_id: str):
-        try:
-            m: ShowResponse = self.client.show(model_id)
-        except ollama.ResponseError as e:
-            print('Ollama Client Error while validating models existence', e)
-            print(f'Current model: {self.client.list().models} \nPulling model...')
-            self.client.pull(model_id)
-            return self.validate_model_exists(model_id)
-        except Exception as e:
-            raise e 
+        """ Check (and pull if needed) the model once per process via the shared model registry. """
+
+        get_model_registry().ensure(self.client, model_id)
+
+def warm_up(model_names: list[str] | None = None, load: bool = True) -> dict[str, str | None]:
+    """ Pre-pull and pre-load the models of config_models.yaml (all of them, or only `model_names`) on their hosts.
+
+    Returns:
+        dict: Model id -> None when ready, or the error message when it could not be prepared.
+    """
+
+    by_host: dict[str | None, list[str]] = {}
+    for entry in get_local_config().model_stack:
+        for name, model in entry.items():
+            if model is not None and model.model_id and (model_names is None or name in model_names):
+                by_host.setdefault(resolve_host(model.host), []).append(model.model_id)
+
+    results = {}
+    for host, model_ids in by_host.items():
+        results.update(get_model_registry().warm_up(get_client_pool().get(host), model_ids, load=load))
+    return results
 
 if __name__ == "__main__":
     pass
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""
+
+src.gaby_agent.core.agent._registry
+Model availability registry shared by every agent.
+
+Availability of a model on an Ollama host is checked (and the model pulled if missing) once per
+process, or again after a TTL, instead of with a `client.show` call before every chat request.
+Concurrent callers asking for the same model wait on a single check / pull, and `warm_up` pulls
+and loads a set of models up front so the first agent call does not pay for it.
+"""
+
+import time
+import ollama
+from threading import Lock
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_TTL = None          # seconds between re-checks of a verified model; None checks once per process
+DEFAULT_KEEP_ALIVE = '15m'  # how long warmed-up models stay loaded (matches CHAT_CONFIG)
+
+
+def host_of(client) -> str:
+    """ Base URL of an `ollama.Client` (falls back to the client's identity). """
+
+    base_url = getattr(getattr(client, "_client", None), "base_url", None)
+    return str(base_url) if base_url is not None else f"client-{id(client)}"
+
+
+@dataclass
+class ModelRegistry:
+    """ Thread-safe record of which models are available on which Ollama host. """
+
+    ttl: float | None = DEFAULT_TTL
+
+    hits: int = field(default=0, init=False)
+    checks: int = field(default=0, init=False)
+    pulls: int = field(default=0, init=False)
+
+    _verified: dict = field(default_factory=dict, init=False, repr=False)
+    _key_locks: dict = field(default_factory=dict, init=False, repr=False)
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False)
+
+    def _fresh(self, key: tuple[str, str]) -> bool:
+        verified = self._verified.get(key)
+        return verified is not None and (self.ttl is None or time.time() - verified <= self.ttl)
+
+    def _key_lock(self, key: tuple[str, str]) -> Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, Lock())
+
+    def is_available(self, client, model_id: str) -> bool:
+        """ Whether `model_id` was verified on the client's host within the TTL (no network call). """
+
+        return self._fresh((host_of(client), model_id))
+
+    def ensure(self, client, model_id: str):
+        """ Make sure `model_id` exists on the client's host, pulling it if needed.
+
+        Only the first caller for a (host, model) pair talks to the server; concurrent callers
+        block until that check or pull finishes and then reuse its result.
+        """
+
+        key = (host_of(client), model_id)
+        if self._fresh(key):
+            self.hits += 1
+            return
+
+        with self._key_lock(key):
+            if self._fresh(key):
+                self.hits += 1
+                return
+
+            self.checks += 1
+            try:
+                client.show(model_id)
+            except ollama.ResponseError as e:
+                print('Ollama Client Error while validating models existence', e)
+                print(f'Pulling model {model_id}...')
+                self.pulls += 1
+                client.pull(model_id)
+                client.show(model_id)
+
+            self._verified[key] = time.time()
+
+    def invalidate(self, model_id: str | None = None) -> int:
+        """ Forget verified models (all, or only `model_id` on every host). Returns the number dropped. """
+
+        with self._lock:
+            keys = [key for key in self._verified if model_id is None or key[1] == model_id]
+            for key in keys:
+                self._verified.pop(key, None)
+            return len(keys)
+
+    def warm_up(
+        self,
+        client,
+        model_ids: list[str],
+        load: bool = True,
+        keep_alive: str | float = DEFAULT_KEEP_ALIVE,
+        max_workers: int = 4
+    ) -> dict[str, str | None]:
+        """ Pull (if missing) and optionally load every model into memory.
+
+        Args:
+            client (ollama.Client): Client of the host to warm up.
+            model_ids (list[str]): Models to prepare.
+            load (bool): Also load each model with an empty generate request, kept alive for `keep_alive`.
+            keep_alive (str | float): Ollama keep-alive duration of the loaded models.
+            max_workers (int): Models prepared concurrently.
+
+        Returns:
+            dict: Model id -> None when ready, or the error message when it could not be prepared.
+        """
+
+        def prepare(model_id: str) -> str | None:
+            try:
+                self.ensure(client, model_id)
+                if load:
+                    client.generate(model=model_id, keep_alive=keep_alive)
+                return None
+            except Exception as e:
+                print(f"❌ Failed to warm up model {model_id}: {e}")
+                return str(e)
+
+        model_ids = list(dict.fromkeys(model_ids))
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(model_ids) or 1))) as pool:
+            return dict(zip(model_ids, pool.map(prepare, model_ids)))
+
+    @property
+    def stats(self) -> dict:
+        return {"verified": len(self._verified), "hits": self.hits, "checks": self.checks, "pulls": self.pulls}
+
+
+_registry_lock = Lock()
+_model_registry: ModelRegistry | None = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """ Process-wide registry used by `GabyBasement.run`. """
+
+    global _model_registry
+
+    if _model_registry is None:
+        with _registry_lock:
+            if _model_registry is None:
+                _model_registry = ModelRegistry()
+    return _model_registry
+
+
+def set_model_registry(registry: ModelRegistry):
+    """ Replace the process-wide registry (e.g. to use a TTL, or a fresh one in tests). """
+
+    global _model_registry
+
+    with _registry_lock:
+        _model_registry = registry
@@ -0,0 +1,320 @@
+"""
+
+src.gaby_agent.core.agent._tuning
+Hardware-aware Ollama options per model.
+
+Options are layered, later layers winning:
+    1. `hardware_defaults()`: thread count from the detected CPU cores,
+    2. `auto_options()`: per-model context / batch size and mmap / mlock from the model's
+       `profile.size_gb` in config_models.yaml and the available RAM,
+    3. the winner of `calibrate()` for this model on this host (saved to OLLAMA_TUNING_PATH),
+    4. options pinned in the model's `profile` in config_models.yaml.
+
+Layers 1 and 2 describe the machine running this process, so they only apply to models served by
+the local Ollama host; a remote host (e.g. the Lightning GPU server) gets its own calibration and
+the pinned options, and otherwise keeps its server-side defaults.
+"""
+
+import os
+import json
+import time
+import platform
+from pathlib import Path
+from threading import Lock
+from dataclasses import dataclass, asdict
+from ollama import Options
+
+from ._connection import is_local_host, resolve_host
+from ..config import OLLAMA_TUNING_PATH
+
+CALIBRATION_PROMPT = "List ten common data quality problems in tabular datasets, one short sentence each."
+OPTION_FIELDS = set(Options.model_fields)
+
+
+@dataclass(frozen=True)
+class Hardware:
+    physical_cores: int
+    logical_cores: int
+    total_ram_gb: float
+    available_ram_gb: float
+
+    @property
+    def fingerprint(self) -> str:
+        """ Identifies the machine class a calibration was measured on. """
+
+        return f"{platform.machine()}-{self.logical_cores}c-{round(self.total_ram_gb)}g"
+
+
+def _meminfo() -> dict[str, float]:
+    """ /proc/meminfo values in GB (empty off Linux). """
+
+    try:
+        with open("/proc/meminfo") as f:
+            return {line.split(":")[0]: int(line.split()[1]) / 1024 ** 2 for line in f if line.split()[1].isdigit()}
+    except OSError:
+        return {}
+
+
+def _physical_cores(logical: int) -> int:
+    """ Distinct (package, core) pairs from /proc/cpuinfo; falls back to the logical count. """
+
+    try:
+        with open("/proc/cpuinfo") as f:
+            text = f.read()
+    except OSError:
+        return logical
+
+    cores, package = set(), None
+    for line in text.splitlines():
+        key, _, value = line.partition(":")
+        if key.strip() == "physical id":
+            package = value.strip()
+        elif key.strip() == "core id":
+            cores.add((package, value.strip()))
+    return min(len(cores), logical) if cores else logical
+
+
+def detect_hardware() -> Hardware:
+    """ CPU cores available to this process and system RAM. """
+
+    logical = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    meminfo = _meminfo()
+    if "MemTotal" in meminfo:
+        total, available = meminfo["MemTotal"], meminfo.get("MemAvailable", meminfo["MemTotal"])
+    else:
+        total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 1024 ** 3 if hasattr(os, "sysconf") else 8.0
+        available = total
+    return Hardware(_physical_cores(logical), logical, total, available)
+
+
+_hardware: Hardware | None = None
+
+
+def get_hardware() -> Hardware:
+    """ Hardware of this machine, detected once per process. """
+
+    global _hardware
+
+    if _hardware is None:
+        _hardware = detect_hardware()
+    return _hardware
+
+
+def hardware_defaults(hardware: Hardware | None = None) -> dict:
+    """ Model-independent options: one generation thread per physical core. """
+
+    hardware = hardware or get_hardware()
+    return dict(num_thread=max(1, hardware.physical_cores))
+
+
+def auto_options(profile: dict | None, hardware: Hardware | None = None) -> dict:
+    """ Per-model options from its size (`profile.size_gb`) and the free RAM.
+
+    Models that fit twice over are locked in RAM (no paging between calls) with a large prompt
+    batch; models that barely fit stay memory-mapped with a small batch and at most 1024 tokens of
+    context, keeping the KV cache small.
+    """
+
+    hardware = hardware or get_hardware()
+    size_gb = (profile or {}).get("size_gb")
+    if size_gb is None:
+        return {}
+
+    headroom = hardware.available_ram_gb - size_gb
+    if headroom >= size_gb + 2:
+        return dict(num_batch=512, use_mmap=True, use_mlock=True)
+    if headroom >= 1:
+        return dict(num_batch=256, use_mmap=True, use_mlock=False)
+    return dict(num_batch=128, num_ctx=1024, use_mmap=True, use_mlock=False)
+
+
+def pinned_options(profile: dict | None) -> dict:
+    """ Ollama options set explicitly in the model's `profile` (other keys such as size_gb are hints). """
+
+    return {key: value for key, value in (profile or {}).items() if key in OPTION_FIELDS}
+
+
+# ====================================================
+# Calibration results
+# ====================================================
+
+_profiles_lock = Lock()
+
+
+def _tuning_path(path: str | Path | None = None) -> Path:
+    return Path(path or OLLAMA_TUNING_PATH)
+
+
+def load_calibrations(path: str | Path | None = None) -> dict:
+    try:
+        return json.loads(_tuning_path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def calibration_fingerprint(host: str | None = None, hardware: Hardware | None = None) -> str:
+    """ Where a calibration was measured: this machine class for the local host, the server URL for a remote one. """
+
+    if is_local_host(host):
+        return f"local:{(hardware or get_hardware()).fingerprint}"
+    return resolve_host(host)
+
+
+def calibrated_options(
+    model_id: str,
+    hardware: Hardware | None = None,
+    path: str | Path | None = None,
+    host: str | None = None
+) -> dict:
+    """ Options of the saved calibration winner for `model_id`, if it was measured on this host (and machine class). """
+
+    record = load_calibrations(path).get(model_id, {}).get(calibration_fingerprint(host, hardware))
+    return record.get("options", {}) if isinstance(record, dict) else {}
+
+
+def tuned_options(
+    model,
+    hardware: Hardware | None = None,
+    path: str | Path | None = None,
+    host: str | None = None
+) -> dict:
+    """ Option overrides (on top of DEFAULT_OPTIONS) for a ModelConfig from config_models.yaml.
+
+    Args:
+        model (ModelConfig): Model from config_models.yaml.
+        hardware (Hardware | None): This machine (default: detected).
+        path (str | Path | None): Calibration file (default OLLAMA_TUNING_PATH).
+        host (str | None): Host alias or URL serving the model (default: the model's `host`).
+    """
+
+    profile = getattr(model, "profile", None)
+    model_id = getattr(model, "model_id", None)
+    if not isinstance(model_id, str):
+        return {}
+
+    host = host if host is not None else getattr(model, "host", None)
+    local = {**hardware_defaults(hardware), **auto_options(profile, hardware)} if is_local_host(host) else {}
+    return {
+        **local,
+        **calibrated_options(model_id, hardware, path, host),
+        **pinned_options(profile),
+    }
+
+
+# ====================================================
+# Calibration benchmark
+# ====================================================
+
+@dataclass
+class CalibrationRun:
+    options: dict
+    tokens_per_sec: float
+    eval_count: int
+    error: str | None = None
+
+
+def candidate_options(
+    hardware: Hardware | None = None,
+    local: bool = True,
+    threads: list[int] | None = None,
+    batches: list[int] | None = None
+) -> list[dict]:
+    """ Thread counts (default: around the core count) crossed with prompt batch sizes.
+
+    A remote host only gets batch sizes: its cores are unknown, so thread counts are never tried there.
+    """
+
+    if not local:
+        return [dict(num_batch=batch) for batch in batches or (128, 256, 512)]
+    if not threads:
+        hardware = hardware or get_hardware()
+        threads = sorted({max(1, hardware.physical_cores // 2), hardware.physical_cores, hardware.logical_cores})
+    return [dict(num_thread=n, num_batch=batch) for n in threads for batch in batches or (256, 512)]
+
+
+def calibrate(
+    client,
+    model,
+    candidates: list[dict] | None = None,
+    prompt: str = CALIBRATION_PROMPT,
+    num_predict: int = 64,
+    repeats: int = 1,
+    hardware: Hardware | None = None,
+    path: str | Path | None = None,
+    save: bool = True,
+    host: str | None = None
+) -> list[CalibrationRun]:
+    """ Measure generation tokens/sec of each candidate profile and save the fastest.
+
+    Each candidate is layered over the model's current tuned options. The first (untimed) request
+    per candidate lets Ollama reload the model with the new settings; tokens/sec comes from the
+    server's eval_count / eval_duration, so load and prompt time are excluded.
+
+    Args:
+        client (ollama.Client): Client of the host serving the model.
+        model (ModelConfig): Model from config_models.yaml.
+        candidates (list[dict] | None): Option overrides to compare (default: `candidate_options()`).
+        prompt (str): Prompt used for every measurement.
+        num_predict (int): Tokens generated per measurement.
+        repeats (int): Timed requests per candidate (the best one counts).
+        hardware (Hardware | None): Machine the results are recorded for (local host only).
+        path (str | Path | None): JSON file the winner is saved to (default OLLAMA_TUNING_PATH).
+        save (bool): Save the winner.
+        host (str | None): Host alias or URL `client` talks to (default: the model's `host`).
+
+    Returns:
+        list[CalibrationRun]: One run per candidate, fastest first.
+    """
+
+    from ._core import DEFAULT_OPTIONS
+
+    host = host if host is not None else getattr(model, "host", None)
+    local = is_local_host(host)
+    base = {**DEFAULT_OPTIONS.model_dump(exclude_none=True), **tuned_options(model, hardware, path, host)}
+    runs = []
+
+    for candidate in candidates or candidate_options(hardware, local):
+        options = {**base, **candidate, "num_predict": num_predict, "seed": 0, "temperature": 0}
+        try:
+            client.generate(model=model.model_id, prompt="", options=options)  # (re)load with these settings
+            best = 0.0
+            for _ in range(repeats):
+                response = client.generate(model=model.model_id, prompt=prompt, options=options)
+                if response.eval_count and response.eval_duration:
+                    best = max(best, response.eval_count / (response.eval_duration / 1e9))
+            runs.append(CalibrationRun(candidate, best, response.eval_count or 0))
+        except Exception as e:
+            runs.append(CalibrationRun(candidate, 0.0, 0, error=str(e)))
+        print(f"Calibration {model.model_id} {candidate}: {runs[-1].tokens_per_sec:.1f} tokens/s")
+
+    runs.sort(key=lambda run: run.tokens_per_sec, reverse=True)
+    if save and runs and runs[0].error is None and runs[0].tokens_per_sec > 0:
+        save_calibration(model.model_id, runs[0], hardware, path, host)
+    return runs
+
+
+def save_calibration(
+    model_id: str,
+    run: CalibrationRun,
+    hardware: Hardware | None = None,
+    path: str | Path | None = None,
+    host: str | None = None
+):
+    """ Record the winner under the model and the fingerprint of the host it was measured on. """
+
+    fingerprint = calibration_fingerprint(host, hardware)
+    record = {
+        "options": run.options,
+        "tokens_per_sec": round(run.tokens_per_sec, 2),
+        "measured": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    if is_local_host(host):
+        record["machine"] = asdict(hardware or get_hardware())
+
+    target = _tuning_path(path)
+    with _profiles_lock:
+        records = load_calibrations(target)
+        entries = records.get(model_id)
+        records[model_id] = {**(entries if isinstance(entries, dict) and "options" not in entries else {}), fingerprint: record}
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(json.dumps(records, indent=2))
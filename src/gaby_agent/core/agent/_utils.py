@@ -1,12 +1,23 @@
 """ gaby_agent/core/agent/_utils.py"""
 
+import types
 import inspect
 import docstring_parser
 from functools import wraps
-from typing import get_type_hints
+from typing import Any, Literal, Union, get_args, get_origin, get_type_hints
 from dataclasses import dataclass, field
 
 TOOLS_REGISTRY = {}
+_JSON_TYPES = (str, int, float, bool, list, dict, type(None), Any)
+
+def _is_json_type(annotation) -> bool:
+    """Whether a model could fill in an argument of this type from JSON (Optional / List / Literal of JSON types included)."""
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        return all(_is_json_type(arg) for arg in get_args(annotation))
+    if origin is Literal:
+        return True
+    return (origin or annotation) in _JSON_TYPES
 
 def agent_toolbox(func):
     """
@@ -28,8 +39,11 @@ def agent_toolbox(func):
     required = []
 
     for name, param in sig.parameters.items():
-        # Infer JSON schema type
         annotation = type_hints.get(name, str)
+        if param.default != inspect._empty and not _is_json_type(annotation):
+            continue  # optional runtime object (e.g. a prebuilt index): passed by the caller, never by the model
+
+        # Infer JSON schema type
         if annotation in (int, "int"):
             arg_type = "integer"
         elif annotation in (float, "float"):
@@ -1,8 +1,66 @@
 """ clean_stage_a.py """
 
+import re
+import json
+import time
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
 from ._core import GabyBasement, Instructor
 from ._utils import agent_toolbox, TOOLS_REGISTRY
+from ._budget import fit_table, prompt_budget, token_counter
+from ..knowledge_base._index import FieldIndex
+
+DEFAULT_MAX_IN_FLIGHT = 4   # concurrent chat requests per run_loop (match OLLAMA_NUM_PARALLEL)
+DEFAULT_RETRIES = 2         # extra attempts per column before giving up
+RETRY_BACKOFF = 0.5         # seconds, doubled after every failed attempt
+DEFAULT_BATCH_SIZE = 8      # data fields packed into one batched prompt
+MAX_BATCH_SIZE = 16         # upper bound so a batched answer fits in num_predict
+TOKENS_PER_FIELD = 64       # generation budget per described field in a batch
+DESCRIPTION_SEED = 42       # fixed seed: field descriptions are reproducible (and cacheable)
+SUMMARY_ROWS = 3            # dataset rows shown to the summarizer
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def field_sample(data: pd.DataFrame, column: str, n: int = 3) -> str:
+    """ Comma separated preview of the first `n` distinct non-null values of a column. """
+
+    return ", ".join(map(str, data[column].dropna().unique()[:n].tolist()))
+
+
+def parse_field_descriptions(text: str) -> dict[str, str]:
+    """ Parse a batched answer into {field label: description}.
+
+    Accepts a JSON object mapping labels to descriptions (optionally wrapped in a code fence or
+    surrounded by prose) or a list of {"name", "description"} records. Entries without a non-empty
+    string description are dropped; unparseable text gives an empty dict.
+    """
+
+    match = _JSON_OBJECT.search(text or "")
+    if match is None:
+        return {}
+    try:
+        parsed = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return {}
+
+    if isinstance(parsed, dict) and len(parsed) == 1 and isinstance(next(iter(parsed.values())), list):
+        parsed = next(iter(parsed.values()))
+    if isinstance(parsed, list):
+        parsed = {
+            str(record.get("name")): record.get("description")
+            for record in parsed if isinstance(record, dict)
+        }
+    if not isinstance(parsed, dict):
+        return {}
+
+    return {
+        str(label): description.strip()
+        for label, description in parsed.items()
+        if isinstance(description, str) and description.strip()
+    }
+
 
 class DatasetSummarizer(
     GabyBasement,
@@ -19,9 +77,46 @@ class DatasetSummarizer(
         {data_table}
         """
     ),
-    model_name="base_agent"
+    model_name="base"
 ):
-    pass
+    budget_report = None # BudgetReport of the last DataFrame input
+
+    def pre_process(self, user_inputs, data_table: pd.DataFrame | str) -> dict:
+        """ Fit a DataFrame `data_table` (the dataset or a preview of it) into the model's context. """
+
+        if isinstance(data_table, pd.DataFrame):
+            count = token_counter(self.model_name)
+            data_table, self.budget_report = fit_table(
+                data_table,
+                prompt_budget(self, str(user_inputs), count=count),
+                rows=SUMMARY_ROWS,
+                count=count
+            )
+            if self.budget_report.trimmed:
+                print(f"Dataset subset fitted to the prompt budget: {self.budget_report}")
+        return dict(user_inputs=user_inputs, data_table=data_table)
+
+class DataFieldBatchDescription(
+    GabyBasement,
+    prompt = Instructor(
+        prompt="You are a data analyst. Given the dataset description and a list of data field labels with sample values, return a concise description of what each data field possibly means in the context of the dataset, in at most 1 sentence each. Respond with a JSON object whose keys are the data field labels exactly as given and whose values are the descriptions.",
+        input_template="""
+        Dataset Description: {data_description}
+        Data Fields:
+        {data_fields}
+        """
+    ),
+    model_name="base",
+    # one JSON answer per batch: constrain the output format and give it room for every field
+    format="json",
+    options=dict(num_ctx=2048, num_predict=MAX_BATCH_SIZE * TOKENS_PER_FIELD, seed=DESCRIPTION_SEED)
+):
+    def pre_process(self, data: pd.DataFrame, columns: list[str], data_description: str) -> dict:
+        data_fields = "\n".join(f"- {column} (sample: {field_sample(data, column)})" for column in columns)
+        return dict(data_description=data_description, data_fields=data_fields)
+
+    def post_process(self, response) -> dict[str, str]:
+        return parse_field_descriptions(super().post_process(response))
 
 class DataFieldMetaDescription(
     GabyBasement,
@@ -33,29 +128,110 @@ class DataFieldMetaDescription(
         Data Sample: {data_sample}
         """
     ),
-    model_name="base_agent"
+    model_name="base",
+    options=dict(seed=DESCRIPTION_SEED)
 ):
-    def run_loop(self, data: pd.DataFrame, data_description: str) -> dict:
-        """ Run the description for each data field in the dataframe. """
+    def describe_column(self, data: pd.DataFrame, column: str, data_description: str, retries: int = DEFAULT_RETRIES) -> list[dict]:
+        """ Describe a single data field, retrying failed requests with exponential backoff. """
 
-        descriptions = {}
+        sample_str = field_sample(data, column)
 
-        for column in data.columns:
-            sample = data[column].dropna().unique()[:3].tolist()
-            sample_str = ", ".join(map(str, sample))
+        for attempt in range(retries + 1):
+            try:
+                description = self.run(
+                    data_description=data_description,
+                    data_label=column,
+                    data_sample=sample_str
+                )
+                break
+            except Exception as e:
+                if attempt == retries:
+                    print(f"❌ Failed to describe field '{column}' after {retries + 1} attempts: {e}")
+                    description = None
+                else:
+                    time.sleep(RETRY_BACKOFF * 2 ** attempt)
 
-            description = self.run(
-                data_description=data_description,
-                data_label=column,
-                data_sample=sample_str
-            )
+        return [
+            {
+                'name': column,
+                'data_type': str(data[column].dtype),
+                'description': description
+            }
+        ]
+
+    def describe_batch(self, data: pd.DataFrame, columns: list[str], data_description: str, retries: int = DEFAULT_RETRIES) -> list[list[dict]]:
+        """ Describe several data fields with one batched prompt.
+
+        Columns missing from the parsed answer (or every column, if the batched request fails)
+        fall back to single-column prompts.
+        """
+
+        try:
+            descriptions = DataFieldBatchDescription(host=self.host).run(data=data, columns=columns, data_description=data_description)
+        except Exception as e:
+            print(f"⚠️ Batched description of {len(columns)} fields failed, falling back to single fields: {e}")
+            descriptions = {}
+
+        return [
+            [{'name': column, 'data_type': str(data[column].dtype), 'description': descriptions[column]}]
+            if column in descriptions
+            else self.describe_column(data, column, data_description, retries)
+            for column in columns
+        ]
+
+    def run_loop(
+        self,
+        data: pd.DataFrame,
+        data_description: str,
+        max_in_flight: int = 1,
+        retries: int = DEFAULT_RETRIES,
+        batch_size: int = 1,
+        field_index: "FieldIndex | None" = None,
+        episode_id: str | None = None
+    ) -> dict:
+        """ Run the description for each data field in the dataframe.
+
+        Args:
+            data (pd.DataFrame): Dataset (or a sample of it) whose fields are described.
+            data_description (str): Natural-language description of the dataset.
+            max_in_flight (int): Maximum concurrent chat requests; 1 keeps the serial loop.
+            retries (int): Extra attempts per column before its description is left as None.
+            batch_size (int): Data fields packed into one JSON-formatted prompt (capped at
+                MAX_BATCH_SIZE); 1 sends one prompt per field.
+            field_index (FieldIndex | None): Descriptions of past episodes: fields similar enough to a
+                stored one reuse its description, and new descriptions are added to it.
+            episode_id (str | None): Episode recorded with the descriptions added to `field_index`.
+
+        Returns:
+            dict: Column name -> description records, in the dataframe's column order.
+        """
+
+        columns = list(data.columns)
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+
+        reused = {}
+        if field_index is not None:
+            samples = {column: field_sample(data, column) for column in columns}
+            for column, description in zip(columns, field_index.reuse([(column, samples[column]) for column in columns])):
+                if description is not None:
+                    reused[column] = [{'name': column, 'data_type': str(data[column].dtype), 'description': description}]
+            print(f"Reusing {len(reused)}/{len(columns)} field descriptions from past episodes")
+        pending = [column for column in columns if column not in reused]
+
+        if batch_size == 1:
+            describe = lambda batch: [self.describe_column(data, batch[0], data_description, retries)]
+        else:
+            describe = lambda batch: self.describe_batch(data, batch, data_description, retries)
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+        if max_in_flight <= 1:
+            results = [describe(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix=self.name) as pool:
+                results = list(pool.map(describe, batches))
 
-            descriptions[column] = [
-                {
-                    'name': self.post_process(description),
-                    'data_type': str(data[column].dtype),
-                    'description': description
-                }
-            ]
+        described = dict(zip(pending, (records for batch in results for records in batch)))
+        if field_index is not None and described:
+            field_index.add([(column, samples[column], described[column][0]['description']) for column in pending], episode_id)
 
-        return descriptions
+        return {column: reused[column] if column in reused else described[column] for column in columns}
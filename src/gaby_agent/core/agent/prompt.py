@@ -17,8 +17,9 @@ Definitions:
 - MNAR: Missingness depends on the missing/unobserved value itself (e.g., high income not reported).
 
 Available Tools:
-- littles_mcar_test: Correlation among missingness indicators, proxy for Little’s MCAR test.
+- littles_mcar_test: Little’s MCAR chi-square test (EM estimates, missingness patterns) on the numeric columns.
 - chi_square_missingness: Test missingness in target_col against a group_col using chi-square.
+- chi_square_missingness_screen: Chi-square screening of every target column against every categorical column at once, ranked with multiple-testing correction.
 - test_uniform_missing_multilabel: Goodness-of-fit for uniform missing across labels.
 - logistic_regression_missingness: Logistic regression of missingness ~ observed covariates.
 - random_forest_importance: Predict missingness using observed covariates with feature importances.
@@ -0,0 +1,390 @@
+"""
+core/agent/tools/_missingness.py
+
+Vectorized engine behind the missing data tools.
+
+Only the columns that actually contain nulls are looked at: their null masks are bit-packed
+(one bit per row and column) and rows are grouped by missingness pattern by hashing their packed
+bit rows, so a wide frame with few incomplete columns costs O(n · k / 8) bytes rather than an
+int64 copy of the whole frame. `MissingnessIndex` keeps that structure so it is built once per
+dataset and shared by the tools in `statistical_methods`.
+
+Little's MCAR test (Little, 1988) compares, for every missingness pattern, the mean of the
+observed variables with the maximum likelihood (EM) estimate of the mean:
+
+    d² = Σ_j n_j (ȳ_j − μ_Oj)ᵀ Σ_OjOj⁻¹ (ȳ_j − μ_Oj),    dof = Σ_j p_j − p
+
+which is χ²(dof) distributed when the data are missing completely at random.
+"""
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+EM_MAX_ITER = 200
+EM_TOLERANCE = 1e-6
+_NUMERIC_KINDS = set("buif")
+
+
+def pack_null_masks(df: pd.DataFrame) -> tuple[list[str], np.ndarray]:
+    """ Columns with at least one null and their null masks packed along the rows: (ceil(n/8), k) uint8. """
+
+    columns, masks = [], []
+    for column in df.columns:
+        mask = df[column].isna().to_numpy()
+        if mask.any():
+            columns.append(column)
+            masks.append(np.packbits(mask))
+    packed = np.stack(masks, axis=1) if masks else np.empty(((len(df) + 7) // 8, 0), np.uint8)
+    return columns, packed
+
+
+def unpack_null_masks(packed: np.ndarray, n_rows: int) -> np.ndarray:
+    """ (n, k) boolean null masks back from `pack_null_masks`. """
+
+    return np.unpackbits(packed, axis=0, count=n_rows).astype(bool)
+
+
+def group_patterns(mask: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ Group rows by missingness pattern.
+
+    Each row of the (n, k) mask is packed into bytes and viewed as one opaque (hashable) value, so
+    `np.unique` sorts n short keys instead of comparing k booleans per row.
+
+    Returns:
+        tuple: (patterns (m, k) bool, pattern id of every row (n,), rows per pattern (m,)).
+    """
+
+    n, k = mask.shape
+    if k == 0:
+        return np.zeros((1 if n else 0, 0), bool), np.zeros(n, np.int64), np.array([n] if n else [], np.int64)
+
+    rows = np.ascontiguousarray(np.packbits(mask, axis=1))
+    keys = rows.view(np.dtype((np.void, rows.shape[1]))).ravel()
+    _, first, ids, counts = np.unique(keys, return_index=True, return_inverse=True, return_counts=True)
+    return mask[first], ids.ravel(), counts
+
+
+class MissingnessIndex:
+    """ Null structure of a dataset, built with one scan and shared by the missing data tools.
+
+    Holds the bit-packed null mask of every column that has nulls, the missingness pattern of every
+    row and the number of rows per pattern. Tools read indicators and complete-case masks from it
+    instead of calling `isna()` on the frame or copying it to add an indicator column.
+    """
+
+    def __init__(self, columns: list[str], packed: np.ndarray, n_rows: int, row_index: pd.Index | None = None):
+        self.columns = list(columns)
+        self.packed = packed
+        self.n_rows = n_rows
+        self.row_index = row_index if row_index is not None else pd.RangeIndex(n_rows)
+        self._position = {column: j for j, column in enumerate(self.columns)}
+
+        mask = unpack_null_masks(packed, n_rows)
+        self.null_counts = mask.sum(axis=0)
+        self.patterns, self.pattern_ids, self.pattern_counts = group_patterns(mask)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "MissingnessIndex":
+        columns, packed = pack_null_masks(df)
+        return cls(columns, packed, len(df), df.index)
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    @property
+    def n_patterns(self) -> int:
+        return len(self.patterns)
+
+    def check(self, df: pd.DataFrame) -> "MissingnessIndex":
+        """ Raise if the index was not built from a frame with the rows (index) and null-bearing columns of `df`. """
+
+        if self.n_rows != len(df) or not self.row_index.equals(df.index) or any(column not in df.columns for column in self.columns):
+            raise ValueError(f"MissingnessIndex of {self.n_rows} rows does not match the dataframe ({len(df)} rows); rebuild it with MissingnessIndex.from_frame.")
+        return self
+
+    def null_count(self, column: str) -> int:
+        j = self._position.get(column)
+        return 0 if j is None else int(self.null_counts[j])
+
+    def any_missing(self, columns: list[str]) -> np.ndarray:
+        """ (n,) True where any of `columns` is null; the packed masks are OR-ed before a single unpack. """
+
+        positions = [self._position[column] for column in columns if column in self._position]
+        if not positions:
+            return np.zeros(self.n_rows, bool)
+        packed = np.bitwise_or.reduce(self.packed[:, positions], axis=1)
+        return np.unpackbits(packed, count=self.n_rows).astype(bool)
+
+    def mask(self, column: str) -> np.ndarray:
+        """ (n,) True where `column` is null. """
+
+        return self.any_missing([column])
+
+    def indicator(self, column: str) -> pd.Series:
+        """ 1 where `column` is null, 0 elsewhere, on the index of the frame. """
+
+        return pd.Series(self.mask(column).astype(int), index=self.row_index, name="__missing__")
+
+    def restrict(self, columns: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """ Patterns over `columns` only, like `group_patterns`, regrouped from the m stored patterns (not the n rows). """
+
+        sub = np.zeros((self.n_patterns, len(columns)), bool)
+        for i, column in enumerate(columns):
+            if column in self._position:
+                sub[:, i] = self.patterns[:, self._position[column]]
+        patterns, ids, _ = group_patterns(sub)
+        row_ids = ids[self.pattern_ids]
+        return patterns, row_ids, np.bincount(ids, weights=self.pattern_counts, minlength=len(patterns)).astype(np.int64)
+
+
+def em_mean_covariance(
+    values: np.ndarray,
+    observed: np.ndarray,
+    pattern_ids: np.ndarray,
+    patterns: np.ndarray,
+    max_iter: int = EM_MAX_ITER,
+    tol: float = EM_TOLERANCE
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """ Maximum likelihood mean and covariance of multivariate normal data with missing values (EM).
+
+    Rows are processed one missingness pattern at a time: the conditional expectation of the
+    missing block given the observed one is a single matrix product per pattern.
+
+    Args:
+        values (np.ndarray): (n, p) data; missing entries may hold anything.
+        observed (np.ndarray): (n, p) True where a value is observed.
+        pattern_ids (np.ndarray): Pattern of each row (from `group_patterns` on ~observed).
+        patterns (np.ndarray): (m, p) True where a pattern is missing.
+
+    Returns:
+        tuple: (mean (p,), covariance (p, p), iterations).
+    """
+
+    n, p = values.shape
+    filled = np.where(observed, values, 0.0)
+    counts = np.maximum(observed.sum(axis=0), 1)
+    mu = filled.sum(axis=0) / counts
+    centered = np.where(observed, values - mu, 0.0)
+    sigma = np.diag(np.maximum((centered ** 2).sum(axis=0) / counts, 1e-12))
+
+    rows_of = [np.flatnonzero(pattern_ids == j) for j in range(len(patterns))]
+    for iteration in range(1, max_iter + 1):
+        total = np.zeros(p)
+        cross = np.zeros((p, p))
+        correction = np.zeros((p, p))
+        for pattern, rows in zip(patterns, rows_of):
+            missing, obs = pattern, ~pattern
+            x = filled[rows].copy()
+            if missing.any():
+                if obs.any():
+                    # least squares: collinear observed columns make sigma_OO singular
+                    coef = np.linalg.lstsq(sigma[np.ix_(obs, obs)], sigma[np.ix_(obs, missing)], rcond=None)[0].T
+                    x[:, missing] = mu[missing] + (x[:, obs] - mu[obs]) @ coef.T
+                    conditional = sigma[np.ix_(missing, missing)] - coef @ sigma[np.ix_(obs, missing)]
+                else:
+                    x[:, missing] = mu[missing]
+                    conditional = sigma[np.ix_(missing, missing)]
+                correction[np.ix_(missing, missing)] += len(rows) * conditional
+            total += x.sum(axis=0)
+            cross += x.T @ x
+
+        new_mu = total / n
+        new_sigma = (cross + correction) / n - np.outer(new_mu, new_mu)
+        converged = max(np.abs(new_mu - mu).max(), np.abs(new_sigma - sigma).max()) < tol
+        mu, sigma = new_mu, new_sigma
+        if converged:
+            break
+    return mu, sigma, iteration
+
+
+@dataclass
+class LittleResult:
+    statistic: float
+    dof: int
+    p_value: float
+    n_patterns: int
+    n_rows: int
+    columns: list[str]
+    em_iterations: int
+
+
+def littles_mcar(
+    df: pd.DataFrame,
+    index: MissingnessIndex | None = None,
+    max_iter: int = EM_MAX_ITER,
+    tol: float = EM_TOLERANCE
+) -> LittleResult:
+    """ Little's MCAR chi-square test on the numeric columns of `df`.
+
+    Rows with no observed numeric value carry no information and are left out; columns that are
+    entirely null or constant (zero variance) are dropped, and collinear columns go through a
+    pseudo-inverse. With an `index`, the patterns are regrouped from it rather than from the rows.
+    """
+
+    from scipy.stats import chi2
+
+    numeric = [c for c in df.columns if df[c].dtype.kind in _NUMERIC_KINDS and df[c].nunique() > 1]
+    values = df[numeric].to_numpy(dtype=float)
+    observed = ~np.isnan(values)
+    if index is None:
+        patterns, ids, counts = group_patterns(~observed)
+    else:
+        patterns, ids, counts = index.check(df).restrict(numeric)
+
+    # rows whose pattern misses every numeric column are left out, and so is their pattern
+    informative = ~patterns.all(axis=1) if numeric else np.zeros(len(patterns), bool)
+    keep = informative[ids]
+    values, observed = values[keep], observed[keep]
+    ids = (np.cumsum(informative) - 1)[ids[keep]]
+    patterns, counts = patterns[informative], counts[informative]
+    n, p = values.shape
+
+    if n == 0 or p == 0:
+        return LittleResult(0.0, 0, 1.0, len(patterns), n, numeric, 0)
+    mu, sigma, iterations = em_mean_covariance(values, observed, ids, patterns, max_iter, tol)
+
+    # per-pattern sums of every column with one bincount each (unobserved entries weigh 0)
+    sums = np.stack([np.bincount(ids, weights=np.where(observed[:, i], values[:, i], 0.0), minlength=len(patterns)) for i in range(p)], axis=1)
+    means = sums / counts[:, None]
+
+    statistic, dof = 0.0, -p
+    for pattern, n_j, mean_j in zip(patterns, counts, means):
+        obs = ~pattern
+        diff = mean_j[obs] - mu[obs]
+        statistic += n_j * diff @ np.linalg.pinv(sigma[np.ix_(obs, obs)], hermitian=True) @ diff
+        dof += int(obs.sum())
+
+    p_value = float(chi2.sf(statistic, dof)) if dof > 0 else 1.0
+    return LittleResult(float(statistic), dof, p_value, len(patterns), n, numeric, iterations)
+
+
+CORRECTIONS = ("fdr_bh", "holm", "bonferroni")
+DEFAULT_MAX_LEVELS = 50  # group columns with more distinct values (ids, free text) are not screened
+
+
+def adjust_p_values(p_values: np.ndarray, method: str = "fdr_bh") -> np.ndarray:
+    """ Multiple-testing adjusted p-values: Benjamini-Hochberg ("fdr_bh"), Holm ("holm") or Bonferroni ("bonferroni"). """
+
+    p_values = np.asarray(p_values, dtype=float)
+    m = len(p_values)
+    if method not in CORRECTIONS:
+        raise ValueError(f"Unknown correction '{method}'; expected one of {CORRECTIONS}.")
+    if method == "bonferroni" or m == 0:
+        return np.minimum(p_values * m, 1.0)
+
+    order = np.argsort(p_values, kind="stable")
+    ranked = p_values[order]
+    if method == "holm":
+        adjusted = np.maximum.accumulate(ranked * (m - np.arange(m)))
+    else:
+        adjusted = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+    result = np.empty(m)
+    result[order] = np.minimum(adjusted, 1.0)
+    return result
+
+
+def contingency_tables(missing: np.ndarray, codes: np.ndarray, n_levels: int) -> np.ndarray:
+    """ (T, 2, L) counts of (target missing?, group level) for T targets at once, from one bincount.
+
+    Args:
+        missing (np.ndarray): (n, T) True where a target is null.
+        codes (np.ndarray): (n,) factorized group column, -1 for nulls (left out, like `pd.crosstab`).
+        n_levels (int): Number of levels L of the group column.
+    """
+
+    n_targets = missing.shape[1]
+    valid = codes >= 0
+    cells = (2 * n_levels) * np.arange(n_targets) + n_levels * missing[valid] + codes[valid, None]
+    return np.bincount(cells.ravel(), minlength=n_targets * 2 * n_levels).reshape(n_targets, 2, n_levels)
+
+
+def chi_square_tables(tables: np.ndarray, correction: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    """ Chi-square statistic and degrees of freedom of a stack of (K, r, c) contingency tables.
+
+    Empty rows and columns (zero padding, absent levels) do not count, as if they had been dropped.
+    Yates' continuity correction is applied to 2x2 tables, like `scipy.stats.chi2_contingency`.
+    """
+
+    observed = tables.astype(float)
+    total = observed.sum(axis=(1, 2))
+    rows, cols = observed.sum(axis=2), observed.sum(axis=1)
+    expected = rows[:, :, None] * cols[:, None, :] / np.where(total == 0, 1, total)[:, None, None]
+    dof = np.clip((rows > 0).sum(axis=1) - 1, 0, None) * np.clip((cols > 0).sum(axis=1) - 1, 0, None)
+
+    if correction:
+        yates = (dof == 1)[:, None, None]
+        diff = expected - observed
+        observed = np.where(yates, observed + np.sign(diff) * np.minimum(0.5, np.abs(diff)), observed)
+
+    cells = expected > 0
+    terms = np.where(cells, (observed - expected) ** 2 / np.where(cells, expected, 1), 0.0)
+    return terms.sum(axis=(1, 2)), dof
+
+
+def chi_square_screen(
+    df: pd.DataFrame,
+    index: MissingnessIndex,
+    targets: list[str] | None = None,
+    groups: list[str] | None = None,
+    max_levels: int = DEFAULT_MAX_LEVELS,
+    correction: str = "fdr_bh",
+    alpha: float = 0.05
+) -> tuple[pd.DataFrame, list[str]]:
+    """ Chi-square test of missingness of every target against every group column.
+
+    Each group column is factorized once, and its tables against all targets come out of one
+    bincount; the statistics and p-values of all pairs are computed on the padded (K, 2, L) stack.
+
+    Args:
+        df (pd.DataFrame): Dataset.
+        index (MissingnessIndex): Null structure of `df`.
+        targets (list[str] | None): Columns whose missingness is tested (default: every column with nulls).
+        groups (list[str] | None): Candidate group columns (default: every column).
+        max_levels (int): Group columns with more distinct values are skipped.
+        correction (str): Multiple-testing correction over all pairs, see `adjust_p_values`.
+        alpha (float): Level of `reject_null`, on the adjusted p-values.
+
+    Returns:
+        tuple: (pairs ranked by p-value, group columns skipped for having too many levels).
+    """
+
+    from scipy.stats import chi2
+
+    if correction not in CORRECTIONS:
+        raise ValueError(f"Unknown correction '{correction}'; expected one of {CORRECTIONS}.")
+    targets = [c for c in (index.columns if targets is None else targets) if index.null_count(c)]
+    groups = list(df.columns if groups is None else groups)
+    missing = np.column_stack([index.mask(c) for c in targets]) if targets else np.zeros((len(df), 0), bool)
+
+    blocks, keys, skipped = [], [], []
+    for group in groups:
+        codes, levels = pd.factorize(df[group], use_na_sentinel=True)
+        if len(levels) > max_levels:
+            skipped.append(group)
+            continue
+        tested = [j for j, target in enumerate(targets) if target != group]
+        if not tested or not len(levels):
+            continue
+        blocks.append(contingency_tables(missing[:, tested], codes, len(levels)))
+        keys.extend((targets[j], group) for j in tested)
+
+    columns = ["target_col", "group_col", "chi2", "dof", "p_value", "p_adjusted", "reject_null", "n"]
+    if not blocks:
+        return pd.DataFrame(columns=columns), skipped
+
+    width = max(block.shape[2] for block in blocks)
+    tables = np.concatenate([np.pad(block, ((0, 0), (0, 0), (0, width - block.shape[2]))) for block in blocks])
+    statistics, dof = chi_square_tables(tables)
+    p_values = np.where(dof > 0, chi2.sf(statistics, np.maximum(dof, 1)), 1.0)
+    adjusted = adjust_p_values(p_values, correction)
+
+    result = pd.DataFrame(keys, columns=["target_col", "group_col"])
+    result["chi2"] = statistics
+    result["dof"] = dof
+    result["p_value"] = p_values
+    result["p_adjusted"] = adjusted
+    result["reject_null"] = adjusted < alpha
+    result["n"] = tables.sum(axis=(1, 2))
+    order = np.lexsort((-statistics, p_values))
+    return result.iloc[order].reset_index(drop=True)[columns], skipped
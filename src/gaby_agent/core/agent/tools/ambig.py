@@ -1,23 +1,22 @@
 
-from ...config import LocalConfig 
+from ...config import get_local_config
 from .._utils import agent_toolbox
 
-config = LocalConfig()
-
 @agent_toolbox
 def sandbox_crawler(
     python_script: str,
-    input_url: str = config.agent_sandbox
+    input_url: str | None = None
 ) -> str:
     """
     Crawl the provided URL using a sandboxed environment to extract relevant information.
     
     Args:
-        input_url (str): The URL to be crawled.
+        input_url (str): The URL to be crawled (default: the configured agent sandbox).
         
     Returns:
         str: A summary of the information extracted from the URL.
     """
+    input_url = input_url or get_local_config().agent_sandbox
     # TODO: ENSURE DATASET IS ACCESSIBLE FROM SANDBOX 
     # Placeholder implementation
     return python_script
\ No newline at end of file
@@ -11,14 +11,10 @@ import pandas as pd
 import numpy as np
 from typing import List, Optional, Dict, Any, Union, Tuple
 
-from scipy.stats import chi2_contingency, chisquare, norm, pearsonr
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import roc_auc_score
-from sklearn.cluster import KMeans
-import statsmodels.api as sm
+# scipy, scikit-learn and statsmodels take seconds to import: each tool imports its backend on first use
 
 from .._utils import agent_toolbox
+from ._missingness import DEFAULT_MAX_LEVELS, MissingnessIndex, chi_square_screen, littles_mcar
 
 # ====================================================
 # Helpers
@@ -26,53 +22,96 @@ from .._utils import agent_toolbox
 
 _NUMERIC_KINDS = set("buifc")  # bool, unsigned int, int, float, complex
 
-def _ensure_numeric_df(df: pd.DataFrame, cols: Optional[List[str]] = None) -> pd.DataFrame:
-    """Return a copy with only numeric columns (or assert if non-numeric present)."""
+def _ensure_numeric_df(df: pd.DataFrame, cols: Optional[List[str]] = None, rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """Return a copy with only numeric columns, optionally only `rows` (boolean mask) (or assert if non-numeric present)."""
     use = df if cols is None else df[cols]
     nonnum = [c for c in use.columns if use[c].dtype.kind not in _NUMERIC_KINDS]
     if nonnum:
         raise ValueError(f"Non-numeric columns found: {nonnum}. Cast to numeric first.")
-    return use.copy()
+    return use.copy() if rows is None else use[rows]
 
-def _drop_na_align(X: pd.DataFrame, y: pd.Series) -> Tuple[pd.DataFrame, pd.Series]:
-    """Drop rows with NA in X, align y."""
-    X2 = X.dropna()
-    y2 = y.loc[X2.index]
-    return X2, y2
+def _missingness_index(df: pd.DataFrame, index: Optional[MissingnessIndex]) -> MissingnessIndex:
+    """Index passed by the caller (checked against df), or one built now. Build it once per dataset with MissingnessIndex.from_frame."""
+    return MissingnessIndex.from_frame(df) if index is None else index.check(df)
+
+def _complete_cases(df: pd.DataFrame, target_col: str, features: List[str], index: Optional[MissingnessIndex]) -> Tuple[pd.DataFrame, pd.Series]:
+    """Numeric features on the rows where all of them are observed, and the missingness indicator of target_col on those rows."""
+    index = _missingness_index(df, index)
+    complete = ~index.any_missing(features)
+    X = _ensure_numeric_df(df, features, rows=complete)
+    y = pd.Series(index.mask(target_col)[complete].astype(int), index=X.index, name="__missing__")
+    return X, y
 
 # ====================================================
 # Step 1: Test MCAR (Initial Diagnostics)
 # ====================================================
 
 @agent_toolbox
-def littles_mcar_test(df: pd.DataFrame) -> pd.DataFrame:
+def littles_mcar_test(df: pd.DataFrame, alpha: float = 0.05, index: Optional[MissingnessIndex] = None) -> Dict[str, Any]:
     """
-    Proxy for Little’s MCAR test by inspecting correlation among missingness indicators.
-    Interpret: strong positive correlations between missing-indicator columns -> evidence against MCAR.
-    NOTE: This requires all columns to be present; non-numeric columns are fine since we only use isna().
+    Little’s MCAR test: chi-square distance between the observed-variable means of each missingness
+    pattern and their maximum likelihood (EM) estimates, over the numeric columns.
+    Interpret: small p-value -> evidence against MCAR.
+    NOTE: Non-numeric, empty and constant columns are ignored (reported in `ignored_columns`); cast text columns to numeric first to include them.
     """
-    missing_matrix = df.isna().astype(int)
-    corr = missing_matrix.corr()
-    return corr
+    result = littles_mcar(df, index)
+    return {
+        "statistic": result.statistic,
+        "dof": result.dof,
+        "p_value": result.p_value,
+        "reject_null": bool(result.p_value < alpha),
+        "n_patterns": result.n_patterns,
+        "n_rows": result.n_rows,
+        "columns": result.columns,
+        "ignored_columns": [c for c in df.columns if c not in result.columns],
+    }
 
 @agent_toolbox
-def chi_square_missingness(df: pd.DataFrame, target_col: str, group_col: str, alpha: float = 0.05) -> Dict[str, Any]:
+def chi_square_missingness(df: pd.DataFrame, target_col: str, group_col: str, alpha: float = 0.05, index: Optional[MissingnessIndex] = None) -> Dict[str, Any]:
     """
     Chi-square test of independence: missingness in target_col vs categories in group_col.
     """
-    miss_indicator = df[target_col].isna().astype(int)
+    from scipy.stats import chi2_contingency
+
+    miss_indicator = _missingness_index(df, index).indicator(target_col)
     contingency = pd.crosstab(miss_indicator, df[group_col])
     chi2, p, dof, expected = chi2_contingency(contingency)
     return {"chi2": chi2, "p_value": p, "dof": dof, "reject_null": bool(p < alpha), "expected": expected.tolist()}
 
 @agent_toolbox
-def test_uniform_missing_multilabel(df: pd.DataFrame) -> Dict[str, Any]:
+def chi_square_missingness_screen(
+    df: pd.DataFrame,
+    target_cols: Optional[List[str]] = None,
+    group_cols: Optional[List[str]] = None,
+    alpha: float = 0.05,
+    correction: str = "fdr_bh",
+    max_levels: int = DEFAULT_MAX_LEVELS,
+    index: Optional[MissingnessIndex] = None
+) -> Dict[str, Any]:
+    """
+    Chi-square screening of missingness in every target column against every group column, in one batch.
+    Pairs are ranked by p-value; `p_adjusted` and `reject_null` account for the number of pairs tested
+    (correction: 'fdr_bh', 'holm' or 'bonferroni'). Group columns with more than max_levels categories are skipped.
+    """
+    results, skipped = chi_square_screen(df, _missingness_index(df, index), target_cols, group_cols, max_levels, correction, alpha)
+    return {
+        "results": results.to_dict(orient="records"),
+        "n_tests": int(len(results)),
+        "n_rejected": int(results["reject_null"].sum()),
+        "correction": correction,
+        "skipped_group_cols": skipped,
+    }
+
+@agent_toolbox
+def test_uniform_missing_multilabel(df: pd.DataFrame, index: Optional[MissingnessIndex] = None) -> Dict[str, Any]:
     """
     Goodness-of-fit test: are missing counts uniform across columns?
     Uses one-sample chi-square (chisquare) comparing observed column-wise missing counts to a uniform expectation.
     """
-    missing_counts = df.isna().sum()
-    observed = missing_counts.values.astype(float)
+    from scipy.stats import chisquare
+
+    index = _missingness_index(df, index)
+    observed = np.array([index.null_count(c) for c in df.columns], dtype=float)
     if observed.sum() == 0:
         return {"chi2": 0.0, "p_value": 1.0, "note": "No missing values in dataframe."}
     expected = np.full_like(observed, observed.mean(), dtype=float)
@@ -84,17 +123,15 @@ def test_uniform_missing_multilabel(df: pd.DataFrame) -> Dict[str, Any]:
 # ====================================================
 
 @agent_toolbox
-def logistic_regression_missingness(df: pd.DataFrame, target_col: str, features: List[str]) -> Dict[str, Any]:
+def logistic_regression_missingness(df: pd.DataFrame, target_col: str, features: List[str], index: Optional[MissingnessIndex] = None) -> Dict[str, Any]:
     """
     Logistic regression: indicator(target_col is missing) ~ features.
     Returns coefficients, intercept, and ROC-AUC on the training data as a quick separability diagnostic.
     """
-    df = df.copy()
-    df["__missing__"] = df[target_col].isna().astype(int)
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.metrics import roc_auc_score
 
-    X = _ensure_numeric_df(df, features)
-    y = df["__missing__"]
-    X, y = _drop_na_align(X, y)
+    X, y = _complete_cases(df, target_col, features, index)
 
     if y.nunique() < 2:
         return {"error": "Missingness indicator has only one class; cannot fit logistic regression."}
@@ -112,17 +149,15 @@ def logistic_regression_missingness(df: pd.DataFrame, target_col: str, features:
     }
 
 @agent_toolbox
-def random_forest_importance(df: pd.DataFrame, target_col: str, features: List[str], n_estimators: int = 300, random_state: int = 42) -> Dict[str, Any]:
+def random_forest_importance(df: pd.DataFrame, target_col: str, features: List[str], n_estimators: int = 300, random_state: int = 42, index: Optional[MissingnessIndex] = None) -> Dict[str, Any]:
     """
     Random forest feature importance for predicting missingness.
     Higher importance -> stronger association between feature and missingness (evidence for MAR).
     """
-    df = df.copy()
-    df["__missing__"] = df[target_col].isna().astype(int)
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.metrics import roc_auc_score
 
-    X = _ensure_numeric_df(df, features)
-    y = df["__missing__"]
-    X, y = _drop_na_align(X, y)
+    X, y = _complete_cases(df, target_col, features, index)
 
     if y.nunique() < 2:
         return {"error": "Missingness indicator has only one class; cannot fit random forest."}
@@ -137,25 +172,22 @@ def random_forest_importance(df: pd.DataFrame, target_col: str, features: List[s
     return {"importances": importances, "roc_auc_train": float(auc), "n_samples": int(len(y))}
 
 @agent_toolbox
-def clustering_missing_vs_nonmissing(df: pd.DataFrame, target_col: str, features: List[str], k: int = 2) -> Dict[str, Any]:
+def clustering_missing_vs_nonmissing(df: pd.DataFrame, target_col: str, features: List[str], k: int = 2, index: Optional[MissingnessIndex] = None) -> Dict[str, Any]:
     """
     KMeans clustering on observed feature space as a rough structure check.
     Returns cluster centers and the distribution of missingness per cluster.
     """
-    df = df.copy()
-    df["__missing__"] = df[target_col].isna().astype(int)
-    X = _ensure_numeric_df(df, features).dropna()
+    from sklearn.cluster import KMeans
+
+    X, y = _complete_cases(df, target_col, features, index)
 
     if X.shape[0] < k:
         return {"error": f"Not enough rows ({X.shape[0]}) to form {k} clusters."}
 
     kmeans = KMeans(n_clusters=k, random_state=42, n_init="auto").fit(X)
-    labels = pd.Series(kmeans.labels_, index=X.index, name="cluster")
-    cluster_missing_rate = (
-        pd.concat([labels, df.loc[X.index, "__missing__"]], axis=1)
-        .groupby("cluster")["__missing__"].mean()
-        .to_dict()
-    )
+    sizes = np.bincount(kmeans.labels_, minlength=k)
+    missing = np.bincount(kmeans.labels_, weights=y.to_numpy(), minlength=k)
+    cluster_missing_rate = {int(c): float(missing[c] / sizes[c]) for c in np.flatnonzero(sizes)}
     return {"cluster_centers": kmeans.cluster_centers_.tolist(), "missing_rate_by_cluster": cluster_missing_rate}
 
 # ====================================================
@@ -170,6 +202,9 @@ def heckman_selection(y: pd.Series, X: pd.DataFrame, Z: pd.DataFrame) -> Dict[st
     X: regressors for outcome equation (observed only when y observed)
     Z: instruments/exogenous vars for selection equation (observed for all rows)
     """
+    import statsmodels.api as sm
+    from scipy.stats import norm
+
     # Step 1: Probit selection model (1 if y observed, else 0)
     observed = (~y.isna()).astype(int)
     Zc = sm.add_constant(Z, has_constant="add")
@@ -214,6 +249,8 @@ def sensitivity_analysis(
     - 'bounds': fill with {min, max}
     - If compare_with provided (numeric), also report Pearson r with that column under each fill.
     """
+    from scipy.stats import pearsonr
+
     if target_col not in df.columns:
         return {"error": f"{target_col} not in dataframe."}
 
@@ -9,6 +9,7 @@ TODO: Use Pydantic... the inheritance class is pissing me off
 import os
 import sys
 from pathlib import Path
+from threading import Lock
 
 from dotenv import load_dotenv
 from dataclasses import dataclass, field
@@ -20,6 +21,11 @@ load_dotenv('.env.local')
 LIGHTNING_OLLAMA_HOST_URL = os.getenv("LIGHTNING_OLLAMA_HOST_URL", "")
 LOCAL_OLLAMA_HOST_URL = os.getenv("LOCAL_OLLAMA_HOST_URL", "")
 AGENT_SANDBOX_URL = os.getenv("AGENT_SANDBOX_URL", "")
+OLLAMA_TUNING_PATH = os.getenv("OLLAMA_TUNING_PATH", ".ollama_tuning.json") # calibrated Ollama options per model and machine
+AGENT_CACHE_PATH = os.getenv("AGENT_CACHE_PATH", "") # SQLite file caching deterministic agent responses (disabled if unset)
+MODEL_CONFIG_PATH = os.getenv("MODEL_CONFIG_PATH", "config_models.yaml") # LLM stack, relative to the working directory
+MODEL_WORKSPACE = os.getenv("MODEL_WORKSPACE", "dev") # which model_id of config_models.yaml is used: "dev" or "prod"
+KNOWLEDGE_BASE_DIR = os.getenv("KNOWLEDGE_BASE_DIR", ".knowledge_base") # persisted embeddings of the knowledge base
 # BASE_GUFF_LLM_MODEL = os.getenv("BASE_GUFF_LLM_MODEL", "")
 DEBUG_LEVEL = os.getenv("DEBUG", True)
 
@@ -28,6 +34,8 @@ BQ_MODEL_CONNECTION: Optional[str] = os.getenv("BQ_MODEL_CONNECTION")
 BQ_MODEL_ENDPOINT: Optional[str] = os.getenv("BQ_MODEL_ENDPOINT")
 BQ_MODEL_ID: Optional[str] = os.getenv("BQ_MODEL_ID")
 DEFAULT_MODEL_TYPE: str = os.getenv("BQ_MODEL_TYPE", "gemini-2.5-flash")
+GATEKEEPER_BACKEND: str = os.getenv("GATEKEEPER_BACKEND", "bigquery") # "sqlite" runs the gatekeeper SQL offline
+GATEKEEPER_CACHE_DIR: str = os.getenv("GATEKEEPER_CACHE_DIR", "") # persist gatekeeper query results as Parquet (in-memory if unset)
 
 # Default BigQuery Resource Names
 DEFAULT_PROJECT_ID: Optional[str] = os.getenv("BQ_PROJECT_ID")
@@ -101,6 +109,8 @@ class ModelConfig:
     prod: Optional[str] = field(default=None, repr=False)
     url: str = field(default="", repr=True)
     alt: list[str] = field(default_factory=list, repr=False)
+    host: Optional[str] = field(default=None, repr=False) # Ollama host alias ("lightning", "local") or URL serving the model
+    profile: dict = field(default_factory=dict, repr=False) # tuning hints (size_gb) and pinned Ollama options
 
     model_id: str = field(init=False, repr=True)
     source: Literal['dev', 'prod'] = field(default="dev", repr=False)
@@ -113,40 +123,151 @@ class ModelConfig:
             )
         else:
             self.model_id = self.dev if self.source == 'dev' else self.prod
-
-def load_agent_stack():
-    import yaml
-
-    with open("config_models.yaml", "r") as f:
-        for file in yaml.safe_load(f):
-            yield {
-                file.get('model_name'):
-                    ModelConfig(
-                        dev=file.get('model_id').get('dev', None) if file.get('model_id') else None,
-                        prod=file.get('model_id').get('prod', None) if file.get('model_id') else None,
-                        url=file.get('url', None),
-                        alt=file.get('alt', None)
-                    )
+            # profile values may differ per workspace: `size_gb: {dev: 13, prod: 65}`
+            self.profile = {
+                key: value.get(self.source) if isinstance(value, dict) else value
+                for key, value in (self.profile or {}).items()
             }
 
+class ModelConfigRegistry:
+    """ Models of config_models.yaml indexed by name, for one workspace ("dev" or "prod").
+
+    The YAML file is parsed and validated once, and again only when its modification time or size
+    changes, so looking up the model of an agent is a dict access.
+    """
+
+    def __init__(self, path: str | Path = MODEL_CONFIG_PATH, workspace: Literal['dev', 'prod'] = MODEL_WORKSPACE):
+        if workspace not in ("dev", "prod"):
+            raise ValueError(f"Unknown model workspace '{workspace}'; expected 'dev' or 'prod'.")
+        self.path = Path(path)
+        self.workspace = workspace
+        self._lock = Lock()
+        self._signature: tuple[int, int] | None = None
+        self._models: dict[str, ModelConfig] = {}
+        self.loads = 0
+
+    def _parse(self, entries) -> dict[str, ModelConfig]:
+        if not isinstance(entries, list):
+            raise ValueError(f"{self.path}: expected a list of models, got {type(entries).__name__}.")
+
+        models = {}
+        for i, entry in enumerate(entries):
+            name = entry.get('model_name') if isinstance(entry, dict) else None
+            if not isinstance(name, str) or not name:
+                raise ValueError(f"{self.path}: entry {i} has no model_name.")
+            if name in models:
+                raise ValueError(f"{self.path}: model '{name}' is defined twice.")
+            model_id = entry.get('model_id') or {}
+            if not isinstance(model_id, dict):
+                raise ValueError(f"{self.path}: model_id of '{name}' must map workspaces (dev, prod) to model ids.")
+            profile = entry.get('profile') or {}
+            if not isinstance(profile, dict):
+                raise ValueError(f"{self.path}: profile of '{name}' must be a mapping.")
+
+            models[name] = ModelConfig(
+                dev=model_id.get('dev', None),
+                prod=model_id.get('prod', None),
+                url=entry.get('url', None),
+                alt=entry.get('alt', None),
+                host=entry.get('host', None),
+                profile=profile,
+                source=self.workspace
+            )
+        return models
+
+    def models(self) -> dict[str, ModelConfig]:
+        """ Model name -> ModelConfig, reloaded if the file changed since the last call. """
+
+        import yaml
+
+        stat = self.path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    with open(self.path, "r") as f:
+                        self._models = self._parse(yaml.safe_load(f))
+                    self._signature = signature
+                    self.loads += 1
+        return self._models
+
+    def get(self, model_name: str) -> ModelConfig | None:
+        return self.models().get(model_name)
+
+    def __contains__(self, model_name: str) -> bool:
+        return model_name in self.models()
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.models())
+
+
+_registries_lock = Lock()
+_registries: dict[tuple[Path, str], ModelConfigRegistry] = {}
+
+
+def get_model_configs(workspace: Literal['dev', 'prod'] | None = None, path: str | Path | None = None) -> ModelConfigRegistry:
+    """ Shared registry of config_models.yaml (resolved against the current working directory) for a workspace. """
+
+    key = (Path(path or MODEL_CONFIG_PATH).resolve(), workspace or MODEL_WORKSPACE)
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = ModelConfigRegistry(*key)
+        return _registries[key]
+
+
+def load_agent_stack(workspace: Literal['dev', 'prod'] | None = None):
+    for name, model in get_model_configs(workspace).models().items():
+        yield {name: model}
+
 @dataclass(frozen=True)
 class LocalConfig:
     """ Endpoint Connection to exertanl servers. """
     lightning_ollama: str = LIGHTNING_OLLAMA_HOST_URL
     local_ollama: str = LOCAL_OLLAMA_HOST_URL
     agent_sandbox: str = AGENT_SANDBOX_URL
+    workspace: Literal['dev', 'prod'] = MODEL_WORKSPACE
+
+    @property
+    def models(self) -> ModelConfigRegistry:
+        return get_model_configs(self.workspace)
 
     @property
     def model_stack(self) -> list:
-        return list(load_agent_stack())
+        return list(load_agent_stack(self.workspace))
 
     def get_model(self, model_name: str):
-        """ Get the model config by name. Returns the first matched model name and its Model config. """
+        """ Get the model config by name (None if it is not in config_models.yaml). """
         
-        for i in load_agent_stack():
-            if model_name in i:
-                return i.get(model_name)
-        return None
+        return self.models.get(model_name)
+
+_config_lock = Lock()
+_config: Config | None = None
+_local_config: LocalConfig | None = None
+
+
+def get_config() -> Config:
+    """ BigQuery workspace configuration, created (and validated) on first use. """
+
+    global _config
+
+    if _config is None:
+        with _config_lock:
+            if _config is None:
+                _config = Config()
+    return _config
+
+
+def get_local_config() -> LocalConfig:
+    """ Endpoints and model stack of this process, created on first use. """
+
+    global _local_config
+
+    if _local_config is None:
+        with _config_lock:
+            if _local_config is None:
+                _local_config = LocalConfig()
+    return _local_config
 
 def setup_dev_workspace(root_folder_name: str = 'gaby'):
     """ Call in files / notebooks if running workspace in sub-directory path. """
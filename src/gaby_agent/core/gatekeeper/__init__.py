@@ -1,16 +1,33 @@
 """ gatekeeper/__init__.py
 """
 
-from ._utils import upload_dataframe_to_bq
+from ._utils import upload_dataframe_to_bq, upload_csv_to_bq
+from ._staging import StagedTable, LocalStagingClient, stage_dataframe, bq_schema_from_summary
+from ._client import SQLiteBackend, get_client, set_backend, reset_client
+from ._cache import QueryCache, get_query_cache, set_query_cache
 from ._wrapper import pandas_gatekeeper
 from .cleaner import (
+    profile_data_field,
     describe_data_field,
     detect_numeric_field,
 )
 
 __all__ = [
     "upload_dataframe_to_bq",
+    "upload_csv_to_bq",
+    "StagedTable",
+    "LocalStagingClient",
+    "stage_dataframe",
+    "bq_schema_from_summary",
+    "SQLiteBackend",
+    "get_client",
+    "set_backend",
+    "reset_client",
+    "QueryCache",
+    "get_query_cache",
+    "set_query_cache",
     "pandas_gatekeeper",
+    "profile_data_field",
     "describe_data_field",
     "detect_numeric_field",
 ]
\ No newline at end of file
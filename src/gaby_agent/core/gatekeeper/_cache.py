@@ -0,0 +1,227 @@
+"""
+
+gatekeeper/_cache.py
+
+Content-addressed result cache for gatekeeper queries.
+
+Entries are keyed on the rendered SQL plus a fingerprint (etag / modified time / row count) of every
+table the SQL reads, so re-analyzing an unchanged dataset reuses the previous `AI.GENERATE` results
+while any re-upload of the referenced table produces a new key. Entries expire after a TTL, the
+least recently used ones are evicted past `max_entries`, and results can optionally be persisted
+as Parquet files so they survive restarts.
+"""
+
+import os
+import json
+import time
+import hashlib
+import pandas as pd
+from pathlib import Path
+from threading import Lock
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from ..config import GATEKEEPER_CACHE_DIR
+from ._client import referenced_tables
+
+DEFAULT_TTL = 7 * 24 * 3600  # seconds
+DEFAULT_MAX_ENTRIES = 256
+_INDEX_FILE = "index.json"
+
+
+def fingerprint_tables(client, tables: list[str]) -> str | None:
+    """ Fingerprint of the current state of `tables`, or None if any of them cannot be inspected. """
+
+    parts = []
+    for table_ref in sorted(set(tables)):
+        try:
+            table = client.get_table(table_ref)
+        except Exception:
+            return None
+        modified = getattr(table, "modified", None)
+        parts.append(f"{table_ref}:{getattr(table, 'etag', None)}:{modified}:{getattr(table, 'num_rows', None)}")
+    return "|".join(parts)
+
+
+@dataclass
+class CacheEntry:
+    created: float
+    last_access: float
+    tables: list[str]
+    frame: pd.DataFrame | None = field(default=None, repr=False)
+
+
+@dataclass
+class QueryCache:
+    """ LRU + TTL cache of query results, in memory and optionally on disk as Parquet. """
+
+    directory: str | Path | None = None
+    ttl: float | None = DEFAULT_TTL
+    max_entries: int = DEFAULT_MAX_ENTRIES
+
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    evictions: int = field(default=0, init=False)
+
+    _entries: OrderedDict = field(default_factory=OrderedDict, init=False, repr=False)
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.directory is not None:
+            self.directory = Path(self.directory)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._load_index()
+
+    # ---------------- keys ----------------
+    @staticmethod
+    def make_key(sql: str, fingerprint: str) -> str:
+        return hashlib.sha256(f"{fingerprint}\n{sql}".encode()).hexdigest()
+
+    def key_for(self, sql: str, client) -> str | None:
+        """ Cache key for `sql` against the current state of its tables (None if uncacheable). """
+
+        fingerprint = fingerprint_tables(client, referenced_tables(sql))
+        return None if fingerprint is None else self.make_key(sql, fingerprint)
+
+    # ---------------- lookups ----------------
+    def get(self, key: str) -> pd.DataFrame | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry):
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+
+            frame = entry.frame if entry.frame is not None else self._read(key)
+            if frame is None:
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            entry.last_access = time.time()
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return frame.copy()
+
+    def put(self, key: str, frame: pd.DataFrame, tables: list[str] | None = None):
+        now = time.time()
+        with self._lock:
+            entry = CacheEntry(created=now, last_access=now, tables=list(tables or []))
+            if not self._write(key, frame):
+                entry.frame = frame.copy()
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+            self._save_index()
+
+    def invalidate(self, table_ref: str | None = None) -> int:
+        """ Drop every entry (or only those reading `table_ref`). Returns the number of entries removed. """
+
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if table_ref is None or table_ref in entry.tables]
+            for key in keys:
+                self._remove(key)
+            self._save_index()
+            return len(keys)
+
+    @property
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    # ---------------- storage ----------------
+    def _expired(self, entry: CacheEntry) -> bool:
+        return self.ttl is not None and time.time() - entry.created > self.ttl
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.parquet"
+
+    def _write(self, key: str, frame: pd.DataFrame) -> bool:
+        if self.directory is None:
+            return False
+        try:
+            frame.to_parquet(self._path(key), index=False)
+            return True
+        except Exception as e:
+            print(f"Query cache could not persist entry {key[:12]}, keeping it in memory: {e}")
+            return False
+
+    def _read(self, key: str) -> pd.DataFrame | None:
+        try:
+            return pd.read_parquet(self._path(key))
+        except Exception:
+            return None
+
+    def _remove(self, key: str):
+        self._entries.pop(key, None)
+        if self.directory is not None:
+            self._path(key).unlink(missing_ok=True)
+
+    def _load_index(self):
+        index_path = self.directory / _INDEX_FILE
+        if not index_path.exists():
+            return
+        try:
+            records = json.loads(index_path.read_text())
+            entries = [
+                (key, CacheEntry(**record))
+                for key, record in sorted(records.items(), key=lambda item: item[1]["last_access"])
+                if self._path(key).exists()
+            ]
+        except (ValueError, OSError, TypeError, KeyError, AttributeError) as e:
+            # e.g. a truncated index after an interrupted write: start empty rather than break every query
+            print(f"Query cache index {index_path} is unreadable, starting with an empty cache: {e}")
+            return
+        self._entries.update(entries)
+
+    def _save_index(self):
+        if self.directory is None:
+            return
+        records = {
+            key: {"created": entry.created, "last_access": entry.last_access, "tables": entry.tables}
+            for key, entry in self._entries.items() if entry.frame is None
+        }
+        # write then rename, so an interrupted write never leaves a truncated index behind
+        index_path = self.directory / _INDEX_FILE
+        tmp_index = index_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_index.write_text(json.dumps(records))
+        os.replace(tmp_index, index_path)
+
+
+_cache_lock = Lock()
+_query_cache: QueryCache | None = None
+_cache_configured = False
+
+
+def get_query_cache() -> QueryCache | None:
+    """ Process-wide cache used by `pandas_gatekeeper` (on disk if GATEKEEPER_CACHE_DIR is set). """
+
+    global _query_cache, _cache_configured
+
+    if not _cache_configured:
+        with _cache_lock:
+            if not _cache_configured:
+                _query_cache = QueryCache(directory=GATEKEEPER_CACHE_DIR or None)
+                _cache_configured = True
+    return _query_cache
+
+
+def set_query_cache(cache: QueryCache | None):
+    """ Replace the process-wide cache; pass None to disable caching. """
+
+    global _query_cache, _cache_configured
+
+    with _cache_lock:
+        _query_cache = cache
+        _cache_configured = True
@@ -0,0 +1,318 @@
+"""
+
+gatekeeper/_client.py
+
+Process-wide BigQuery client pool with pluggable backends.
+
+The client is created lazily on first use and shared across threads, so credential discovery,
+TLS setup and HTTP session creation happen once per process instead of once per SQL template.
+Besides the real `bigquery.Client`, a local SQLite backend can run the gatekeeper SQL with
+`AI.GENERATE` stubbed, allowing the whole pipeline to run and be benchmarked offline.
+"""
+
+import io
+import re
+import json
+import uuid
+import sqlite3
+import pandas as pd
+import pyarrow.parquet as pq
+from threading import Lock
+from types import SimpleNamespace
+from typing import Any, Callable
+from google.cloud import bigquery
+
+from ..config import GATEKEEPER_BACKEND
+
+_AI_GENERATE = re.compile(r"AI\.GENERATE\s*\(", re.IGNORECASE)
+_FIELD_ACCESS = re.compile(r"\s*\.\s*(\w+)")
+_ALIAS = re.compile(r"\s+AS\s+(\w+)", re.IGNORECASE)
+_NAMED_ARG = re.compile(r"(\w+)\s*=>\s*'([^']*)'", re.DOTALL)
+_STRING_LITERALS = re.compile(r"\s*(?:'(?:[^'\\]|\\.|'')*'\s*)+")
+_TABLE_REF = re.compile(r"\b(FROM|JOIN)\s+`?((?:[\w-]+\.){1,2}[\w-]+)`?", re.IGNORECASE)
+
+
+# ====================================================
+# Local SQLite backend
+# ====================================================
+
+def _skip_string(sql: str, i: int) -> int:
+    """ Index just past the quoted literal starting at `sql[i]`. """
+
+    quote = sql[i]
+    i += 1
+    while i < len(sql):
+        if sql[i] == "\\":
+            i += 2
+            continue
+        if sql[i] == quote:
+            return i + 1
+        i += 1
+    raise ValueError("Unterminated string literal in SQL.")
+
+
+def _matching_paren(sql: str, open_index: int) -> int:
+    depth = 0
+    i = open_index
+    while i < len(sql):
+        char = sql[i]
+        if char in "'\"":
+            i = _skip_string(sql, i)
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    raise ValueError("Unbalanced parentheses in SQL.")
+
+
+def _split_top_level(text: str) -> list[str]:
+    """ Split on commas that are not nested in parentheses or string literals. """
+
+    parts, depth, start, i = [], 0, 0, 0
+    while i < len(text):
+        char = text[i]
+        if char in "'\"":
+            i = _skip_string(text, i)
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+        i += 1
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _concat_literals(part: str) -> str:
+    """ BigQuery concatenates adjacent string literals ('a' 'b'); SQLite needs an explicit ||. """
+
+    if _STRING_LITERALS.fullmatch(part):
+        return " || ".join(re.findall(r"'(?:[^'\\]|\\.|'')*'", part))
+    return part
+
+
+def _output_fields(args: list[str]) -> list[str]:
+    """ Field names declared in an `output_schema => 'name TYPE, ...'` argument. """
+
+    for arg in args:
+        named = _NAMED_ARG.fullmatch(arg)
+        if named and named.group(1).lower() == "output_schema":
+            return [column.split()[0] for column in named.group(2).split(",") if column.strip()]
+    return ["result"]
+
+
+def translate_sql(sql: str) -> str:
+    """ Rewrite gatekeeper BigQuery SQL into SQLite.
+
+    `AI.GENERATE((part, ...), connection_id => ..., ...).field` becomes `ai_generate('field', part, ...) AS field`.
+    Without a field access the whole STRUCT is kept: `AI.GENERATE(...) AS alias` becomes a JSON object
+    from `ai_generate_struct` and later `alias.field` references read it with `json_extract`.
+    `project.dataset.table` references become quoted table names.
+    """
+
+    out, pos, structs = [], 0, []
+    while (match := _AI_GENERATE.search(sql, pos)) is not None:
+        close = _matching_paren(sql, match.end() - 1)
+        args = _split_top_level(sql[match.end():close])
+
+        prompt = args[0] if args else "''"
+        parts = _split_top_level(prompt[1:-1]) if prompt.startswith("(") and prompt.endswith(")") else [prompt]
+        parts = [_concat_literals(part) for part in parts]
+
+        end = close + 1
+        access = _FIELD_ACCESS.match(sql, end)
+        alias = _ALIAS.match(sql, end)
+
+        if access is not None:
+            field_name = access.group(1)
+            end = access.end()
+            expression = f"ai_generate('{field_name}', {', '.join(parts)})"
+            if not _ALIAS.match(sql, end):
+                expression += f" AS {field_name}"
+        else:
+            fields = ",".join(_output_fields(args[1:]))
+            expression = f"ai_generate_struct('{fields}', {', '.join(parts)})"
+            if alias is None:
+                expression += " AS result"
+            structs.append(alias.group(1) if alias else "result")
+
+        out.extend([sql[pos:match.start()], expression])
+        pos = end
+
+    out.append(sql[pos:])
+    sql = "".join(out)
+
+    for name in structs:
+        sql = re.sub(
+            rf"\b{name}\.(\w+)(\s+AS\s+\w+)?",
+            lambda m: f"json_extract({name}, '$.{m.group(1)}'){m.group(2) or ' AS ' + m.group(1)}",
+            sql,
+            flags=re.IGNORECASE
+        )
+
+    return _TABLE_REF.sub(lambda m: f'{m.group(1)} "{m.group(2)}"', sql)
+
+
+def referenced_tables(sql: str) -> list[str]:
+    """ Fully qualified table names read by a query (FROM / JOIN clauses). """
+
+    return [match.group(2) for match in _TABLE_REF.finditer(sql)]
+
+
+def stub_generate(field_name: str, prompt: str) -> str:
+    """ Deterministic AI.GENERATE stand-in. """
+
+    if field_name == "numeric_type":
+        return "Unknown"
+    return f"Generated {field_name} for: {' '.join(prompt.split())[:120]}"
+
+
+class _LocalJob:
+    def __init__(self, frame: pd.DataFrame | None = None):
+        self.frame = frame
+
+    def result(self):
+        return self
+
+    def to_dataframe(self) -> pd.DataFrame:
+        return self.frame
+
+
+class SQLiteBackend:
+    """ Offline stand-in for `bigquery.Client` backed by an SQLite database.
+
+    Supports the calls the gatekeeper makes: `load_table_from_file` (staged Parquet payloads or CSV
+    files) and `query` (gatekeeper SQL with `AI.GENERATE` routed to `generate`).
+    """
+
+    def __init__(self, database: str = ":memory:", generate: Callable[[str, str], str] = stub_generate):
+        self._lock = Lock()
+        self.generate = generate
+        self.n_generate_calls = 0
+        self.table_versions: dict[str, int] = {}
+        self.instance_id = uuid.uuid4().hex
+        self._struct_results: dict[tuple[str, str], str] = {}
+        self.connection = sqlite3.connect(database, check_same_thread=False)
+        self.connection.create_function("ai_generate", -1, self._ai_generate)
+        self.connection.create_function("ai_generate_struct", -1, self._ai_generate_struct)
+
+    @staticmethod
+    def _prompt(parts) -> str:
+        return "".join("" if part is None else str(part) for part in parts)
+
+    def _ai_generate(self, field_name: str, *parts) -> str:
+        self.n_generate_calls += 1
+        return self.generate(field_name, self._prompt(parts))
+
+    def _ai_generate_struct(self, fields: str, *parts) -> str:
+        """ One model call returning every field of the output schema (as a JSON object). """
+
+        # SQLite may evaluate the struct once per extracted field, so results are memoized per query
+        prompt = self._prompt(parts)
+        if (fields, prompt) not in self._struct_results:
+            self.n_generate_calls += 1
+            self._struct_results[(fields, prompt)] = json.dumps(
+                {field_name: self.generate(field_name, prompt) for field_name in fields.split(",")}
+            )
+        return self._struct_results[(fields, prompt)]
+
+    def load_table_from_file(self, file_obj, destination: str, job_config: bigquery.LoadJobConfig | None = None, **kwargs):
+        if job_config is not None and job_config.source_format == bigquery.SourceFormat.CSV:
+            with self._lock:
+                for i, chunk in enumerate(pd.read_csv(file_obj, chunksize=100_000)):
+                    chunk.to_sql(destination, self.connection, if_exists="replace" if i == 0 else "append", index=False)
+                self.table_versions[destination] = self.table_versions.get(destination, 0) + 1
+            return _LocalJob()
+
+        return self.load_table_from_dataframe(pq.read_table(io.BytesIO(file_obj.read())).to_pandas(), destination)
+
+    def load_table_from_dataframe(self, frame: pd.DataFrame, destination: str, **kwargs):
+        with self._lock:
+            frame.to_sql(destination, self.connection, if_exists="replace", index=False)
+            self.table_versions[destination] = self.table_versions.get(destination, 0) + 1
+        return _LocalJob()
+
+    def get_table(self, table_ref: str):
+        """ Table metadata used for cache fingerprints (mirrors `bigquery.Table.etag` / `num_rows`). """
+
+        with self._lock:
+            if table_ref not in self.table_versions:
+                raise KeyError(f"Table {table_ref} not found.")
+            (num_rows,) = self.connection.execute(f'SELECT COUNT(*) FROM "{table_ref}"').fetchone()
+            return SimpleNamespace(etag=f"{self.instance_id}:{self.table_versions[table_ref]}", modified=None, num_rows=num_rows)
+
+    def query(self, sql: str, **kwargs):
+        with self._lock:
+            self._struct_results.clear()
+            frame = pd.read_sql_query(translate_sql(sql), self.connection)
+        return _LocalJob(frame)
+
+
+# ====================================================
+# Process-wide pool
+# ====================================================
+
+BACKENDS: dict[str, Callable[[], Any]] = {
+    "bigquery": bigquery.Client,
+    "sqlite": SQLiteBackend,
+}
+
+
+def _backend_factory(name: str) -> Callable[[], Any]:
+    """ Factory of a registered backend; a misspelled name must not fall back to live BigQuery. """
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown gatekeeper backend '{name}'. Choose from {list(BACKENDS)}.")
+    return BACKENDS[name]
+
+
+_lock = Lock()
+_client = None
+_factory: Callable[[], Any] = _backend_factory(GATEKEEPER_BACKEND)
+
+
+def set_backend(backend: str | Callable[[], Any] | Any):
+    """ Select the backend used by every gatekeeper call.
+
+    Args:
+        backend: A registered backend name ("bigquery", "sqlite"), a zero-argument factory,
+            or a ready client instance to share as-is.
+    """
+
+    global _client, _factory
+
+    with _lock:
+        if isinstance(backend, str):
+            _factory, _client = _backend_factory(backend), None
+        elif isinstance(backend, type) or (callable(backend) and not hasattr(backend, "query")):
+            _factory, _client = backend, None
+        else:
+            _client = backend
+
+
+def get_client():
+    """ Shared client for the selected backend, created on first use (thread-safe). """
+
+    global _client
+
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = _factory()
+    return _client
+
+
+def reset_client():
+    """ Drop the pooled client so the next `get_client` call creates a fresh one. """
+
+    global _client
+
+    with _lock:
+        _client = None
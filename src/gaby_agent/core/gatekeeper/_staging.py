@@ -0,0 +1,176 @@
+"""
+
+gatekeeper/_staging.py
+
+Arrow / Parquet staging layer for BigQuery loads.
+
+Frames are converted to Arrow exactly once, using an explicit schema derived from the data field
+summary (`data_field_name`, `data_type`) instead of letting BigQuery autodetect it, and shipped as a
+column-compressed Parquet payload.
+"""
+
+import io
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+from dataclasses import dataclass, field
+from google.cloud import bigquery
+
+DEFAULT_COMPRESSION = "zstd"
+DEFAULT_ROW_GROUP_SIZE = 128_000
+
+# (BigQuery type, Arrow type) per pandas dtype family
+_STRING = ("STRING", pa.string())
+_TYPE_MAP = {
+    "int": ("INT64", pa.int64()),
+    "uint": ("INT64", pa.int64()),
+    "float": ("FLOAT64", pa.float64()),
+    "bool": ("BOOL", pa.bool_()),
+    "boolean": ("BOOL", pa.bool_()),
+    "datetime": ("TIMESTAMP", pa.timestamp("us", tz="UTC")),
+}
+
+
+def _resolve_type(data_type: str) -> tuple[str, pa.DataType]:
+    """ Map a pandas dtype name (as stored in the summary table) to BigQuery / Arrow types. """
+
+    name = str(data_type).lower()
+    if name in _TYPE_MAP:
+        return _TYPE_MAP[name]
+    if name.startswith("datetime64"):
+        return _TYPE_MAP["datetime"]
+    for prefix in ("uint", "int", "float"):
+        if name.startswith(prefix):
+            return _TYPE_MAP[prefix]
+    return _STRING
+
+
+def field_types(df: pd.DataFrame) -> pd.DataFrame:
+    """ Minimal summary table (`data_field_name`, `data_type`) for frames that were not profiled, e.g. the summary itself. """
+
+    return pd.DataFrame({
+        "data_field_name": df.columns.tolist(),
+        "data_type": [str(dtype) for dtype in df.dtypes],
+    })
+
+
+def bq_schema_from_summary(summary: pd.DataFrame) -> list[bigquery.SchemaField]:
+    """ Explicit BigQuery schema from a data field summary table. """
+
+    return [
+        bigquery.SchemaField(str(name), _resolve_type(data_type)[0], mode="NULLABLE")
+        for name, data_type in zip(summary["data_field_name"], summary["data_type"])
+    ]
+
+
+def arrow_schema_from_summary(summary: pd.DataFrame) -> pa.Schema:
+    """ Arrow schema matching `bq_schema_from_summary`. """
+
+    return pa.schema([
+        pa.field(str(name), _resolve_type(data_type)[1], nullable=True)
+        for name, data_type in zip(summary["data_field_name"], summary["data_type"])
+    ])
+
+
+def _to_arrow_column(series: pd.Series, arrow_type: pa.DataType) -> pa.Array:
+    if pa.types.is_string(arrow_type):
+        # object columns may mix types (e.g. "continuous" and ints in unique_values)
+        series = series.astype("string")
+    elif pa.types.is_timestamp(arrow_type):
+        series = pd.to_datetime(series, utc=True)
+    return pa.array(series, type=arrow_type, from_pandas=True)
+
+
+@dataclass
+class StagedTable:
+    """ A frame serialized once to Parquet, ready to be loaded into BigQuery. """
+
+    payload: bytes = field(repr=False)
+    schema: list[bigquery.SchemaField]
+    n_rows: int
+    path: Path | None = None
+
+    @property
+    def n_bytes(self) -> int:
+        return len(self.payload)
+
+    def job_config(self) -> bigquery.LoadJobConfig:
+        return bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+            schema=self.schema,
+            autodetect=False
+        )
+
+
+def stage_dataframe(
+    df: pd.DataFrame,
+    summary: pd.DataFrame | None = None,
+    path: str | Path | None = None,
+    compression: str = DEFAULT_COMPRESSION,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE
+) -> StagedTable:
+    """ Convert a frame to a compressed Parquet payload with an explicit schema.
+
+    Args:
+        df (pd.DataFrame): Frame to stage.
+        summary (pd.DataFrame | None): Data field summary providing `data_field_name` / `data_type`; derived from `df.dtypes` if omitted.
+        path (str | Path | None): Optionally also write the staged Parquet file to this local path.
+        compression (str): Parquet column compression codec.
+        row_group_size (int): Rows per Parquet row group.
+
+    Returns:
+        StagedTable: The payload bytes and the BigQuery schema to load it with.
+    """
+
+    summary = field_types(df) if summary is None else summary
+    arrow_schema = arrow_schema_from_summary(summary)
+
+    table = pa.Table.from_arrays(
+        # look columns up by their original labels: Arrow field names are stringified (e.g. int labels)
+        [_to_arrow_column(df[name], f.type) for name, f in zip(summary["data_field_name"], arrow_schema)],
+        schema=arrow_schema
+    )
+
+    sink = io.BytesIO()
+    pq.write_table(table, sink, compression=compression, row_group_size=row_group_size)
+    payload = sink.getvalue()
+
+    if path is not None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(payload)
+
+    return StagedTable(payload=payload, schema=bq_schema_from_summary(summary), n_rows=table.num_rows, path=path)
+
+
+class _CompletedJob:
+    def result(self):
+        return self
+
+
+@dataclass
+class LocalStagingClient:
+    """ Offline stand-in for `bigquery.Client` that records staged loads instead of sending them. """
+
+    loads: list[dict] = field(default_factory=list)
+
+    def load_table_from_file(self, file_obj, destination: str, job_config: bigquery.LoadJobConfig | None = None, **kwargs):
+        payload = file_obj.read()
+        self.loads.append({
+            "destination": destination,
+            "payload": payload,
+            "n_bytes": len(payload),
+            "schema": list(job_config.schema) if job_config is not None and job_config.schema else [],
+            "source_format": job_config.source_format if job_config is not None else None,
+        })
+        return _CompletedJob()
+
+    def read_table(self, destination: str) -> pd.DataFrame:
+        """ Decode the last payload loaded into `destination`. """
+
+        for load in reversed(self.loads):
+            if load["destination"] == destination:
+                return pq.read_table(io.BytesIO(load["payload"])).to_pandas()
+        raise KeyError(f"No staged load recorded for {destination}.")
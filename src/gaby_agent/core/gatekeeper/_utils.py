@@ -5,19 +5,51 @@ gatekeeper/_utils.py
 Contains DB Handlers / Utils.
 """
 
+import io
 import pandas as pd
+from pathlib import Path
 from google.cloud import bigquery
 
-def upload_dataframe_to_bq(df: pd.DataFrame, table_ref: str):
-    """ Uploads a pandas DataFrame to a specified BigQuery table. """
+from ._client import get_client
+from ._staging import stage_dataframe
 
-    client = bigquery.Client()
+def upload_dataframe_to_bq(
+    df: pd.DataFrame,
+    table_ref: str,
+    summary: pd.DataFrame | None = None,
+    client: bigquery.Client | None = None,
+    staging_path: str | Path | None = None
+):
+    """ Uploads a pandas DataFrame to a specified BigQuery table.
+
+    The frame is staged once as compressed Parquet with an explicit schema taken from `summary`
+    (the data field summary table) so BigQuery does not re-infer it. Pass `staging_path` to keep
+    the staged file locally and `client` to override the pooled client.
+    """
+
+    client = get_client() if client is None else client
 
     # table_ref = f"{project_id}.{dataset_id}.{table_id}"
+    staged = stage_dataframe(df, summary=summary, path=staging_path)
+    job = client.load_table_from_file(io.BytesIO(staged.payload), table_ref, job_config=staged.job_config())
+    job.result()  # Wait for the job to complete.
+    print(f"✅ Data uploaded to {table_ref} ({staged.n_rows} rows, {staged.n_bytes} bytes staged)")
+
+def upload_csv_to_bq(source, table_ref: str):
+    """ Streams a CSV file (path or binary buffer) to a BigQuery table without loading it into pandas. """
+
+    client = get_client()
+
     job_config = bigquery.LoadJobConfig(
+        source_format=bigquery.SourceFormat.CSV,
+        skip_leading_rows=1,
         write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
         autodetect=True
     )
-    job = client.load_table_from_dataframe(df, table_ref, job_config=job_config)
+    if hasattr(source, "read"):
+        job = client.load_table_from_file(source, table_ref, job_config=job_config)
+    else:
+        with open(source, "rb") as f:
+            job = client.load_table_from_file(f, table_ref, job_config=job_config)
     job.result()  # Wait for the job to complete.
-    print(f"✅ Data uploaded to {table_ref}")
+    print(f"✅ CSV uploaded to {table_ref}")
@@ -1,44 +1,94 @@
 """ gatekeeper/_wrapper.py
 """
 
+import asyncio
 import functools
 import pandas as pd
-from google.cloud import bigquery
+
+from ._cache import get_query_cache
+from ._client import get_client, referenced_tables
+
+POLL_INTERVAL = 0.5 # seconds between job status checks in `arun`
 
 def pandas_gatekeeper(func):
     """
     A decorator that executes a SQL query generated by a function and returns a DataFrame.
 
     This decorator intercepts the SQL string returned by the wrapped function,
-    executes it using the provided BigQuery client, and returns the result
-    as a pandas DataFrame.
+    executes it using the process-wide pooled client (see `_client.get_client`),
+    and returns the result as a pandas DataFrame.
 
-    The decorated function must be called with a 'client' keyword argument
-    of type `google.cloud.bigquery.Client`.
+    Results are served from the process-wide query cache (see `_cache.QueryCache`) when the same
+    SQL was already run against unchanged tables. Pass `use_cache=False` to force a fresh query.
+
+    The wrapper also exposes `wrapper.arun(...)`, an async variant that submits the job, polls it
+    without blocking the event loop and cancels the BigQuery job if the awaiting task is cancelled.
 
     Args:
         func: The function to be decorated, which should return a SQL query string.
 
     Returns:
         A wrapper function that executes the query and returns a DataFrame.
-
-    Raises:
-        TypeError: If the 'client' keyword argument is not provided or is not a
-                   `bigquery.Client` instance.
     """
+    def lookup(client, sql_query: str, use_cache: bool):
+        cache = get_query_cache() if use_cache else None
+        cache_key = cache.key_for(sql_query, client) if cache is not None else None
+        cached = cache.get(cache_key) if cache_key is not None else None
+        if cached is not None:
+            print(f"--- Cache hit for '{func.__name__}' ---")
+        return cache, cache_key, cached
+
+    def store(cache, cache_key, sql_query: str, result: pd.DataFrame):
+        if cache_key is not None:
+            cache.put(cache_key, result, tables=referenced_tables(sql_query))
+
     @functools.wraps(func)
-    def wrapper(*args, **kwargs):
+    def wrapper(*args, use_cache: bool = True, **kwargs):
 
-        client = bigquery.Client()  # Since running in notebook.
+        client = get_client()
 
         # Call the original function to get the SQL query string
         sql_query = func(*args, **kwargs)
 
+        cache, cache_key, cached = lookup(client, sql_query, use_cache)
+        if cached is not None:
+            return cached
+
         print(f"--- Executing SQL from '{func.__name__}' ---")
         print(sql_query)
 
         # Execute the query and return the result as a pandas DataFrame
         job = client.query(sql_query)
-        return job.to_dataframe()
+        result = job.to_dataframe()
+
+        store(cache, cache_key, sql_query, result)
+        return result
+
+    async def arun(*args, use_cache: bool = True, poll_interval: float = POLL_INTERVAL, **kwargs) -> pd.DataFrame:
+        client = get_client()
+        sql_query = func(*args, **kwargs)
+
+        cache, cache_key, cached = await asyncio.to_thread(lookup, client, sql_query, use_cache)
+        if cached is not None:
+            return cached
+
+        print(f"--- Executing SQL from '{func.__name__}' (async) ---")
+        print(sql_query)
+
+        job = await asyncio.to_thread(client.query, sql_query)
+        try:
+            # BigQuery jobs expose done(); local backends finish inside query()
+            while hasattr(job, "done") and not await asyncio.to_thread(job.done):
+                await asyncio.sleep(poll_interval)
+        except asyncio.CancelledError:
+            if hasattr(job, "cancel"):
+                print(f"--- Cancelling BigQuery job from '{func.__name__}' ---")
+                await asyncio.to_thread(job.cancel)
+            raise
+
+        result = await asyncio.to_thread(job.to_dataframe)
+        await asyncio.to_thread(store, cache, cache_key, sql_query, result)
+        return result
 
+    wrapper.arun = arun
     return wrapper
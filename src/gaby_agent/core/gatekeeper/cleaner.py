@@ -6,32 +6,68 @@ Google BigQuery for data cleaning and assist generative models in making decisio
 
 """
 
+import pandas as pd
+
 from ._wrapper import pandas_gatekeeper
-from ..config import Config
-from .prompt import SQL_DESCRIBE_DATA_FIELD_LABEL, SQL_DETECT_NUMERIC_FIELD
+from ..config import get_config
+from .prompt import SQL_PROFILE_DATA_FIELD
 
-config = Config()
 
 @pandas_gatekeeper
-def describe_data_field(
+def profile_data_field(
     data_summary_id: str,
-    connection_id: str | None = config.bq_model_connection,
-    endpoint: str | None = config.default_model_type
+    connection_id: str | None = None,
+    endpoint: str | None = None
 ):
-    return SQL_DESCRIBE_DATA_FIELD_LABEL.format(
+    """ One AI.GENERATE scan of the summary table returning both `description` and `numeric_type`.
+
+    The connection and endpoint default to the BigQuery model of the workspace config.
+    """
+
+    return SQL_PROFILE_DATA_FIELD.format(
         data_summary_id=data_summary_id,
-        connection_id=connection_id,
-        endpoint=endpoint
+        connection_id=connection_id or get_config().bq_model_connection,
+        endpoint=endpoint or get_config().default_model_type
     )
 
-@pandas_gatekeeper
+def profile_view(columns: list[str]):
+    """ Give a plain view over `profile_data_field` the same async `.arun` variant as the gatekeeper functions. """
+
+    def decorate(view):
+        async def arun(
+            data_summary_id: str,
+            connection_id: str | None = None,
+            endpoint: str | None = None,
+            **kwargs
+        ) -> pd.DataFrame:
+            profile = await profile_data_field.arun(data_summary_id, connection_id, endpoint, **kwargs)
+            return profile[columns]
+
+        view.arun = arun
+        return view
+
+    return decorate
+
+@profile_view(["data_field_name", "description"])
+def describe_data_field(
+    data_summary_id: str,
+    connection_id: str | None = None,
+    endpoint: str | None = None,
+    **kwargs
+) -> pd.DataFrame:
+    """ View over `profile_data_field`: field names and descriptions. """
+
+    profile = profile_data_field(data_summary_id, connection_id, endpoint, **kwargs)
+    return profile[["data_field_name", "description"]]
+
+@profile_view(["data_field_name", "numeric_type"])
 def detect_numeric_field(
     data_summary_id: str,
-    connection_id: str | None = config.bq_model_connection,
-    endpoint: str | None = config.default_model_type
-):
-    return SQL_DETECT_NUMERIC_FIELD.format(
-        data_summary_id=data_summary_id,
-        connection_id=connection_id,
-        endpoint=endpoint
-    )
+    connection_id: str | None = None,
+    endpoint: str | None = None,
+    **kwargs
+) -> pd.DataFrame:
+    """ View over `profile_data_field`: field names and numeric types. """
+
+    profile = profile_data_field(data_summary_id, connection_id, endpoint, **kwargs)
+    return profile[["data_field_name", "numeric_type"]]
@@ -0,0 +1,206 @@
+"""
+
+src.gaby_agent.core.knowledge_base._embeddings
+Persisted embedding matrices of the knowledge base.
+
+Encoding the reference columns of the data type sample takes seconds of model inference, yet the
+result only depends on the sample file and the embedding model. `EmbeddingStore` computes such a
+matrix once and saves it as a `.npy` file next to a small JSON header holding a checksum of its
+inputs. Later loads memory-map the file (no copy, no inference) and a changed sample file or model
+name rebuilds it automatically.
+
+Matrices that grow (the field index) are kept as append-only logs instead: raw float32 rows plus
+one JSON record per row, so an insert writes only the new rows whatever the size of the log.
+"""
+
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from threading import Lock
+from collections.abc import Callable, Iterable
+
+from ..config import KNOWLEDGE_BASE_DIR
+
+REFERENCE_FORMAT = 1 # bump when the way columns are turned into text changes: stored matrices are rebuilt
+
+
+def column_text(values: Iterable) -> str:
+    """ Text embedded for a column: its values, comma separated. """
+
+    return ", ".join(map(str, values))
+
+
+def checksum(*parts: str | bytes | Path) -> str:
+    """ SHA-256 over file contents (Path) and strings / bytes, in order. """
+
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, Path):
+            with open(part, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+        else:
+            digest.update(part.encode() if isinstance(part, str) else part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class EmbeddingStore:
+    """ Directory of named, checksummed embedding matrices loaded as read-only memory maps. """
+
+    def __init__(self, directory: str | Path = KNOWLEDGE_BASE_DIR):
+        self.directory = Path(directory)
+        self._lock = Lock()
+        self.builds = 0
+
+    def _paths(self, name: str) -> tuple[Path, Path]:
+        return self.directory / f"{name}.npy", self.directory / f"{name}.json"
+
+    def load(self, name: str, digest: str) -> tuple[np.ndarray, dict] | None:
+        """ Memory-mapped matrix `name` and its metadata, or None if it is missing or was built from other inputs. """
+
+        matrix_path, meta_path = self._paths(name)
+        try:
+            meta = json.loads(meta_path.read_text())
+            if meta.get("checksum") != digest:
+                return None
+            matrix = np.load(matrix_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if list(matrix.shape) != meta.get("shape"):
+            return None
+        return matrix, meta
+
+    def save(self, name: str, digest: str, matrix: np.ndarray, **meta):
+        """ Write `matrix` and its metadata; readers never see a half-written file. """
+
+        matrix_path, meta_path = self._paths(name)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+
+        tmp_matrix = matrix_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_matrix, "wb") as f:
+            np.save(f, matrix)
+        os.replace(tmp_matrix, matrix_path)
+
+        tmp_meta = meta_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_meta.write_text(json.dumps({**meta, "checksum": digest, "shape": list(matrix.shape)}, indent=2))
+        os.replace(tmp_meta, meta_path)
+
+    def _log_paths(self, name: str) -> tuple[Path, Path, Path]:
+        return self.directory / f"{name}.f32", self.directory / f"{name}.jsonl", self.directory / f"{name}.log.json"
+
+    def load_log(self, name: str, digest: str) -> tuple[np.ndarray, list[dict]] | None:
+        """ Rows and records of log `name`, or None if it is missing or was written from other inputs.
+
+        Each record carries the position of its row, so a write interrupted between the rows and the
+        records (or half a line) only loses that last insert.
+        """
+
+        rows_path, records_path, header_path = self._log_paths(name)
+        try:
+            header = json.loads(header_path.read_text())
+            if header.get("checksum") != digest:
+                return None
+            dim = int(header["dim"])
+            rows = np.fromfile(rows_path, dtype=np.float32)
+            lines = records_path.read_text().splitlines()
+        except (OSError, ValueError, KeyError):
+            return None
+
+        rows = rows[:len(rows) // dim * dim].reshape(-1, dim)
+        records = []
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and 0 <= record.get("row", -1) < len(rows):
+                records.append(record)
+        matrix = rows[[record.pop("row") for record in records]] if records else np.empty((0, dim), np.float32)
+        return matrix, records
+
+    def append(self, name: str, digest: str, matrix: np.ndarray, records: list[dict]):
+        """ Append rows of `matrix` and their records (one per row) to log `name`, in O(new rows).
+
+        A log written from other inputs (`digest`) or with another row size is started over.
+        """
+
+        rows_path, records_path, header_path = self._log_paths(name)
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        dim = matrix.shape[1]
+
+        with self._lock:
+            try:
+                header = json.loads(header_path.read_text())
+            except (OSError, ValueError):
+                header = {}
+            if header.get("checksum") != digest or header.get("dim") != dim:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                rows_path.unlink(missing_ok=True)
+                records_path.unlink(missing_ok=True)
+                tmp_header = header_path.with_suffix(f".{os.getpid()}.tmp")
+                tmp_header.write_text(json.dumps({"checksum": digest, "dim": dim}))
+                os.replace(tmp_header, header_path)
+
+            start = rows_path.stat().st_size // (4 * dim) if rows_path.exists() else 0
+            with open(rows_path, "ab") as f:
+                f.truncate(start * 4 * dim) # drop a torn row left by an interrupted write
+                f.write(matrix.tobytes())
+            with open(records_path, "a+b") as f:
+                torn = False
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b"\n" # end the half line of an interrupted write
+                f.write((b"\n" if torn else b"") + "".join(json.dumps({**record, "row": start + i}) + "\n" for i, record in enumerate(records)).encode())
+
+    def load_or_build(self, name: str, digest: str, build: Callable[[], np.ndarray], **meta) -> tuple[np.ndarray, dict]:
+        """ Stored matrix `name` if its checksum matches `digest`, else `build()` it, save it and load it back. """
+
+        loaded = self.load(name, digest)
+        if loaded is not None:
+            return loaded
+
+        with self._lock:
+            loaded = self.load(name, digest)
+            if loaded is None:
+                self.save(name, digest, build(), **meta)
+                self.builds += 1
+                loaded = self.load(name, digest)
+        return loaded
+
+
+def reference_embeddings(
+    encode: Callable[[list[str]], np.ndarray],
+    sample_path: str | Path,
+    model_name: str,
+    store: EmbeddingStore | None = None
+) -> tuple[np.ndarray, list[str]]:
+    """ Embeddings of the reference columns of the data type sample (one row per column, sorted by name).
+
+    Args:
+        encode (Callable): Embedding model, list of texts -> (n, dim) array.
+        sample_path (str | Path): CSV with one example column per data type.
+        model_name (str): Name of the embedding model (part of the checksum).
+        store (EmbeddingStore | None): Where the matrix is kept (default: KNOWLEDGE_BASE_DIR).
+
+    Returns:
+        tuple[np.ndarray, list[str]]: Read-only (n_types, dim) matrix and the data type labels.
+    """
+
+    store = store or EmbeddingStore()
+    sample_path = Path(sample_path)
+    digest = checksum(sample_path, model_name, str(REFERENCE_FORMAT))
+
+    def build() -> np.ndarray:
+        sample = pd.read_csv(sample_path)
+        labels = sorted(sample.columns)
+        return np.asarray(encode([column_text(sample[label].dropna()) for label in labels]))
+
+    name = f"reference-{hashlib.sha256(model_name.encode()).hexdigest()[:12]}"
+    labels = sorted(pd.read_csv(sample_path, nrows=0).columns)
+    matrix, meta = store.load_or_build(name, digest, build, model_name=model_name, labels=labels)
+    return matrix, meta["labels"]
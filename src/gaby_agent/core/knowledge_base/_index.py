@@ -0,0 +1,151 @@
+"""
+
+src.gaby_agent.core.knowledge_base._index
+Vector index of field descriptions from past episodes.
+
+Each described field is embedded from its name and sample values and stored with its description.
+A new field whose closest stored field is at least `threshold` similar (cosine) reuses that
+description instead of being sent to a model. Search is exact brute force: one matrix product
+per batch of queries over the unit-normalised embeddings, which stays in the
+milliseconds for the tens of thousands of fields a workspace accumulates. Inserts are
+incremental: amortised growth of the matrix in memory, and only the new rows and records appended
+to the `EmbeddingStore` log on disk.
+"""
+
+import time
+import numpy as np
+from pathlib import Path
+from threading import Lock
+from collections.abc import Callable
+
+from ._embeddings import EmbeddingStore
+from ._types import DEFAULT_BATCH_SIZE, unit_rows
+
+DEFAULT_REUSE_THRESHOLD = 0.92  # cosine similarity above which a stored description is reused
+INDEX_NAME = "field_index"
+
+
+def field_text(name: str, sample: str) -> str:
+    """ Text embedded for a field: its label and a few sample values. """
+
+    return f"{name}: {sample}"
+
+
+class FieldIndex:
+    """ Incremental nearest-neighbour index over (field name, sample values) -> description. """
+
+    def __init__(
+        self,
+        encode: Callable[..., np.ndarray],
+        model_name: str = "",
+        directory: str | Path | None = None,
+        threshold: float = DEFAULT_REUSE_THRESHOLD,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        """
+        Args:
+            encode (Callable): Embedding model, (texts, batch_size=...) -> (n, dim) array.
+            model_name (str): Name of the embedding model; an index built with another model is not loaded.
+            directory (str | Path | None): Where the index is persisted, e.g. KNOWLEDGE_BASE_DIR (None: in memory only).
+            threshold (float): Minimum cosine similarity for a description to be reused.
+            batch_size (int): Texts per forward pass.
+        """
+
+        self.encode = encode
+        self.model_name = model_name
+        self.threshold = threshold
+        self.batch_size = batch_size
+        self.store = EmbeddingStore(directory) if directory is not None else None
+
+        self._lock = Lock()
+        self._matrix = np.empty((0, 0), np.float32)
+        self._size = 0
+        self.records: list[dict] = []
+        self.queries = 0
+        self.hits = 0
+
+        if self.store is not None:
+            loaded = self.store.load_log(INDEX_NAME, self.model_name)
+            if loaded is not None:
+                matrix, self.records = loaded
+                self._matrix, self._size = np.array(matrix, dtype=np.float32), len(matrix)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        return self._matrix[:self._size]
+
+    def _embed(self, fields: list[tuple[str, str]]) -> np.ndarray:
+        return unit_rows(self.encode([field_text(name, sample) for name, sample in fields], batch_size=self.batch_size))
+
+    def add(self, fields: list[tuple[str, str, str]], episode_id: str | None = None) -> int:
+        """ Insert described fields (name, sample, description); fields without a description are skipped. Returns the number inserted. """
+
+        fields = [(name, sample, description) for name, sample, description in fields if description]
+        if not fields:
+            return 0
+
+        vectors = self._embed([(name, sample) for name, sample, _ in fields])
+        now = time.strftime("%Y-%m-%dT%H:%M:%S")
+        with self._lock:
+            if self._size and self._matrix.shape[1] != vectors.shape[1]:
+                raise ValueError(f"Embeddings of size {vectors.shape[1]} do not match the index ({self._matrix.shape[1]}).")
+            needed = self._size + len(vectors)
+            if needed > len(self._matrix):
+                grown = np.empty((max(needed, 2 * len(self._matrix), 64), vectors.shape[1]), np.float32)
+                if self._size:
+                    grown[:self._size] = self.embeddings
+                self._matrix = grown
+            self._matrix[self._size:needed] = vectors
+            self._size = needed
+            records = [
+                {"name": name, "sample": sample, "description": description, "episode_id": episode_id, "added": now}
+                for name, sample, description in fields
+            ]
+            self.records.extend(records)
+            if self.store is not None:
+                self.store.append(INDEX_NAME, self.model_name, vectors, records)
+        return len(fields)
+
+    def search(self, fields: list[tuple[str, str]], k: int = 1) -> list[list[tuple[dict, float]]]:
+        """ The `k` most similar stored fields of each (name, sample) query, most similar first. """
+
+        if not fields:
+            return []
+        with self._lock:
+            embeddings, records = self.embeddings, list(self.records) # rows are never rewritten: the view stays valid
+        if not len(embeddings):
+            return [[] for _ in fields]
+
+        scores = self._embed(fields) @ embeddings.T
+        k = min(k, len(embeddings))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in zip(scores, top):
+            ranked = candidates[np.argsort(-row[candidates])]
+            results.append([(records[i], float(row[i])) for i in ranked])
+        return results
+
+    def reuse(self, fields: list[tuple[str, str]]) -> list[str | None]:
+        """ Stored description of each (name, sample) query, or None when nothing is similar enough. """
+
+        matches = self.search(fields, k=1)
+        descriptions = [
+            match[0][0]["description"] if match and match[0][1] >= self.threshold else None
+            for match in matches
+        ]
+        with self._lock:
+            self.queries += len(fields)
+            self.hits += sum(description is not None for description in descriptions)
+        return descriptions
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "entries": self._size,
+            "queries": self.queries,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.queries if self.queries else 0.0,
+        }
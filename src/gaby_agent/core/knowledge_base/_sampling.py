@@ -0,0 +1,151 @@
+"""
+
+src.gaby_agent.core.knowledge_base._sampling
+Bounded value sampling for embedding-based data type detection.
+
+Only a budget of distinct values per column is embedded, whatever the number of rows: values are
+drawn from a bounded random scan of the column ("reservoir": a uniform sample of rows, so frequent
+values are likely to appear) or spread across value shapes ("stratified": `12.5`, `ab-12` and
+`Long text ...` are different shapes, so rare formats are represented). The confidence of a label
+is how stable it is as the sample grows: the column is also classified from nested prefixes of
+its sample (1/8, 1/4, 1/2 of the budget), all in the same encode call.
+"""
+
+import re
+import random
+import numpy as np
+import pandas as pd
+from itertools import islice
+from collections.abc import Callable, Iterable
+from typing import Literal
+
+from ._embeddings import column_text
+from ._types import DEFAULT_BATCH_SIZE, classify_texts
+
+DEFAULT_SAMPLE_BUDGET = 64  # distinct values embedded per column
+SCAN_FACTOR = 8             # rows scanned per value of the budget
+STABILITY_STEPS = 4         # sample sizes compared for the confidence: budget / 2**k, k < STABILITY_STEPS
+
+SamplingStrategy = Literal["reservoir", "stratified"]
+
+_DIGITS = re.compile(r"\d+")
+_LETTERS = re.compile(r"[^\W\d_]+")
+
+
+def value_shape(value) -> str:
+    """ Coarse format of a value: runs of digits -> 9, runs of letters -> a, other characters kept (`ab-12.5` -> `a-9.9`). """
+
+    text = str(value)
+    if len(text) > 40:
+        return f"text:{len(text.split())//10}" # long texts grouped by word count
+    return _LETTERS.sub("a", _DIGITS.sub("9", text))
+
+
+def reservoir_sample(values: Iterable, k: int, seed: int | None = 0) -> list:
+    """ Uniform sample of `k` items from an iterable of unknown length in one pass (Algorithm L). """
+
+    rng = random.Random(seed)
+    iterator = iter(values)
+    reservoir = list(islice(iterator, k))
+    if len(reservoir) < k or k == 0:
+        return reservoir
+
+    end = object()
+    w = np.exp(np.log(rng.random()) / k)
+    while True:
+        skip = int(np.floor(np.log(rng.random()) / np.log(1 - w)))
+        item = next(islice(iterator, skip, skip + 1), end)
+        if item is end:
+            return reservoir
+        reservoir[rng.randrange(k)] = item
+        w *= np.exp(np.log(rng.random()) / k)
+
+
+def sample_distinct(
+    column: pd.Series | Iterable,
+    budget: int = DEFAULT_SAMPLE_BUDGET,
+    strategy: SamplingStrategy = "reservoir",
+    seed: int | None = 0
+) -> list:
+    """ Up to `budget` distinct non-null values of a column, reading at most `budget * SCAN_FACTOR` rows.
+
+    Args:
+        column (pd.Series | Iterable): Column to sample, or a stream of its values (e.g. read by chunks).
+        budget (int): Distinct values returned at most.
+        strategy (SamplingStrategy): "reservoir" (uniform over rows) or "stratified" (round robin over value shapes).
+        seed (int | None): Seed of the row sample.
+
+    Returns:
+        list: Distinct values in sample order (any prefix is itself a sample).
+    """
+
+    if isinstance(column, pd.Series):
+        rng = np.random.default_rng(seed)
+        n_scan = min(len(column), budget * SCAN_FACTOR)
+        positions = rng.choice(len(column), size=n_scan, replace=False) if n_scan < len(column) else rng.permutation(len(column))
+        scanned = pd.Series(column.to_numpy()[positions])
+    else:
+        scanned = pd.Series(reservoir_sample(column, budget * SCAN_FACTOR, seed), dtype=object)
+    distinct = pd.unique(scanned.dropna().to_numpy())
+
+    if strategy == "reservoir":
+        return distinct[:budget].tolist()
+    if strategy != "stratified":
+        raise ValueError(f"Unknown sampling strategy '{strategy}'; expected 'reservoir' or 'stratified'.")
+
+    strata: dict[str, list] = {}
+    for value in distinct:
+        strata.setdefault(value_shape(value), []).append(value)
+    sample = []
+    for depth in range(max(map(len, strata.values()), default=0)):
+        sample.extend(values[depth] for values in strata.values() if depth < len(values))
+        if len(sample) >= budget:
+            break
+    return sample[:budget]
+
+
+def stability_sizes(n_values: int, steps: int = STABILITY_STEPS) -> list[int]:
+    """ Nested sample sizes compared for the confidence, smallest first, ending with `n_values`. """
+
+    return sorted({max(1, n_values >> k) for k in range(steps)}) if n_values else [0]
+
+
+def detect_with_confidence(
+    encode: Callable[..., np.ndarray],
+    reference: np.ndarray,
+    labels: list[str],
+    data: pd.DataFrame,
+    columns: list[str] | None = None,
+    budget: int = DEFAULT_SAMPLE_BUDGET,
+    strategy: SamplingStrategy = "reservoir",
+    seed: int | None = 0,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> pd.DataFrame:
+    """ Data type of each column from a bounded value sample, with the stability of the label.
+
+    Returns:
+        pd.DataFrame: Indexed by column, like `classify_texts` (for the full sample) plus
+        `n_values` (values embedded) and `confidence` (share of the nested samples voting for the
+        final label; 1.0 means the label did not change as the sample grew).
+    """
+
+    columns = list(data.columns if columns is None else columns)
+    samples = {column: sample_distinct(data[column], budget, strategy, seed) for column in columns}
+
+    texts, keys = [], []
+    for column, sample in samples.items():
+        for size in stability_sizes(len(sample)):
+            texts.append(column_text(sample[:size]))
+            keys.append((column, size))
+    votes = classify_texts(encode, reference, labels, texts, index=pd.MultiIndex.from_tuples(keys, names=["column", "size"]) if keys else None, batch_size=batch_size)
+
+    rows = []
+    for column, sample in samples.items():
+        column_votes = votes.loc[column]
+        final = column_votes.iloc[-1]
+        rows.append({
+            **final.to_dict(),
+            "n_values": len(sample),
+            "confidence": float((column_votes["data_type"] == final["data_type"]).mean()),
+        })
+    return pd.DataFrame(rows, index=pd.Index(columns), columns=[*votes.columns, "n_values", "confidence"])
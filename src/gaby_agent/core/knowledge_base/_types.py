@@ -0,0 +1,84 @@
+"""
+
+src.gaby_agent.core.knowledge_base._types
+Batched embedding-based data type detection.
+
+Every column is turned into one text of (a sample of) its values; all of them are encoded in a
+single call, and the cosine similarities against the reference matrix of the data types come out
+of one matrix product.
+"""
+
+import numpy as np
+import pandas as pd
+from collections.abc import Callable
+
+from ._embeddings import column_text
+
+DEFAULT_MAX_VALUES = 50     # distinct values per column put in its text (the model truncates long inputs anyway)
+DEFAULT_BATCH_SIZE = 64     # texts per forward pass of the embedding model
+
+
+def unit_rows(matrix: np.ndarray) -> np.ndarray:
+    """ Rows scaled to unit length (zero rows stay zero), as float32. """
+
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def column_values(column: pd.Series, max_values: int = DEFAULT_MAX_VALUES) -> list:
+    """ First `max_values` distinct non-null values of a column. """
+
+    return column.dropna().unique()[:max_values].tolist()
+
+
+def classify_texts(
+    encode: Callable[..., np.ndarray],
+    reference: np.ndarray,
+    labels: list[str],
+    texts: list[str],
+    index: list | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> pd.DataFrame:
+    """ Closest data type of each text.
+
+    Args:
+        encode (Callable): Embedding model, (texts, batch_size=...) -> (n, dim) array.
+        reference (np.ndarray): (n_types, dim) reference embeddings, one row per label.
+        labels (list[str]): Data type of each reference row.
+        texts (list[str]): Texts to classify, e.g. from `column_text`.
+        index (list | None): Row labels of the result (default: 0..n-1).
+        batch_size (int): Texts per forward pass.
+
+    Returns:
+        pd.DataFrame: One row per text with `data_type`, `similarity_score`, `margin` (to the
+        runner-up) and the cosine similarity to every data type.
+    """
+
+    if not texts:
+        return pd.DataFrame(columns=["data_type", "similarity_score", "margin", *labels], index=index)
+
+    scores = unit_rows(encode(texts, batch_size=batch_size)) @ unit_rows(reference).T
+    top = np.sort(scores, axis=1)[:, -2:]
+
+    result = pd.DataFrame(scores, index=index, columns=labels)
+    result.insert(0, "data_type", np.asarray(labels, dtype=object)[scores.argmax(axis=1)])
+    result.insert(1, "similarity_score", top[:, -1])
+    result.insert(2, "margin", top[:, -1] - top[:, 0])
+    return result
+
+
+def classify_columns(
+    encode: Callable[..., np.ndarray],
+    reference: np.ndarray,
+    labels: list[str],
+    data: pd.DataFrame,
+    columns: list[str] | None = None,
+    max_values: int = DEFAULT_MAX_VALUES,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> pd.DataFrame:
+    """ Data type of every column of `data` (or of `columns`) with a single encode call; see `classify_texts`. """
+
+    columns = list(data.columns if columns is None else columns)
+    texts = [column_text(column_values(data[column], max_values)) for column in columns]
+    return classify_texts(encode, reference, labels, texts, index=columns, batch_size=batch_size)
@@ -12,40 +12,69 @@ import numpy as np
 import pandas as pd
 from sentence_transformers import SentenceTransformer
 
+from ._embeddings import EmbeddingStore, reference_embeddings
+from ._types import DEFAULT_BATCH_SIZE
+from ._sampling import DEFAULT_SAMPLE_BUDGET, SamplingStrategy, detect_with_confidence
+
+REFERENCE_SAMPLE_PATH = 'src/gaby_agent/data/sample/data_all_types.csv'
+
 class Temporal(SentenceTransformer):
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        sample_path: str = REFERENCE_SAMPLE_PATH,
+        store: EmbeddingStore | None = None
+    ):
+        """ Embedding model plus the reference embeddings of each data type, encoded once and then memory-mapped from `store`. """
+
         super().__init__(model_name)
-        df = pd.read_csv('src/gaby_agent/data/sample/data_all_types.csv')
-        self.data_type_sample = df[sorted(df.columns)]
-        self.data_type_embeddings = {col: self.encode(np.array([self.data_type_sample[col].astype(str).values.tolist()])) for col in self.data_type_sample.columns}
-        
+        self.reference_embeddings, self.data_type_labels = reference_embeddings(self.encode, sample_path, model_name, store)
+
     @property
     def data_type(self):
-        return self.data_type_sample.columns.tolist()
+        return self.data_type_labels
+
+    @property
+    def data_type_embeddings(self) -> dict[str, np.ndarray]:
+        """ Reference embedding of each data type (views into the memory-mapped matrix). """
+
+        return dict(zip(self.data_type_labels, self.reference_embeddings))
     
-    def detect_data_type(self, target_data_column: pd.Series) -> pd.DataFrame:
-        """ Compare the similarity of a query against a data column and return a DataFrame with similarity scores. """
-        
-        if isinstance(target_data_column, pd.Series):
-            target_data_column = np.array([target_data_column.dropna().astype(str).tolist()])
-        
-        print(np.array(list(self.data_type_embeddings.values())).shape)
-        target_emb = self.encode(target_data_column) 
-        z_sample = np.vstack(list(self.data_type_embeddings.values())) 
+    def detect_data_types(
+        self,
+        data: pd.DataFrame,
+        columns: list[str] | None = None,
+        budget: int = DEFAULT_SAMPLE_BUDGET,
+        strategy: SamplingStrategy = "reservoir",
+        seed: int | None = 0,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> pd.DataFrame:
+        """ Data type of every column (or of `columns`) from at most `budget` sampled distinct values each.
 
-        print('Target Embedding Shape:', target_emb.shape, 'Sample Embedding Shape:', z_sample.shape)
-        assert target_emb.shape == (len(target_data_column), 384), "Embedding shape mismatch"
-        assert z_sample.shape == (len(self.data_type), 384), "Sample embedding shape mismatch"
-        
-        simi_scores = self.similarity_pairwise(target_emb, z_sample)
-        print(simi_scores) 
-        voted_index = simi_scores.argmax(axis=1)
-        voted_label = self.data_type[voted_index]
-        
+        All columns (and the nested samples behind the confidence) are embedded in one encode call and
+        scored against the reference embeddings in one matrix product, so the cost does not grow with
+        the number of rows.
+
+        Returns:
+            pd.DataFrame: Indexed by column, with `data_type`, `similarity_score`, `margin`, the
+            similarity to each data type, `n_values` and `confidence` (stability of the label).
+        """
+
+        return detect_with_confidence(
+            self.encode, self.reference_embeddings, self.data_type_labels, data, columns,
+            budget=budget, strategy=strategy, seed=seed, batch_size=batch_size
+        )
+
+    def detect_data_type(self, target_data_column: pd.Series) -> dict:
+        """ Data type of a single column; see `detect_data_types`. """
+
+        name = target_data_column.name if target_data_column.name is not None else 0
+        detected = self.detect_data_types(target_data_column.to_frame(name))
         return {
-            "data_type": voted_label,
-            "similarity_score": simi_scores.max(axis=1),
-            "logits": simi_scores
+            "data_type": detected["data_type"].iloc[0],
+            "similarity_score": float(detected["similarity_score"].iloc[0]),
+            "confidence": float(detected["confidence"].iloc[0]),
+            "logits": detected[self.data_type_labels].to_numpy()
         }
         
 if __name__ == "__main__":
@@ -0,0 +1,158 @@
+"""
+
+orchestrator.py
+
+Asyncio orchestration of pipeline stages.
+
+Stages declare the stages they depend on and run as soon as those have finished, so independent
+work (e.g. BigQuery jobs and a local model generating) overlaps instead of running back to back.
+Each stage can have its own timeout; a failing required stage cancels everything still running,
+while an optional stage only skips the stages that depend on it.
+"""
+
+import time
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, Literal
+from dataclasses import dataclass, field
+
+StageStatus = Literal["ok", "failed", "timeout", "cancelled", "skipped"]
+
+
+@dataclass
+class Stage:
+    """ One unit of pipeline work.
+
+    `run` receives the values of the stages listed in `depends_on` as keyword arguments.
+    """
+
+    name: str
+    run: Callable[..., Awaitable[Any]]
+    depends_on: tuple[str, ...] = ()
+    timeout: float | None = None
+    required: bool = True
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: StageStatus
+    value: Any = None
+    error: BaseException | None = field(default=None, repr=False)
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+class PipelineError(RuntimeError):
+    """ A required stage failed; `results` holds the outcome of every stage. """
+
+    def __init__(self, stage: StageResult, results: dict[str, StageResult]):
+        super().__init__(f"Required stage '{stage.name}' {stage.status}: {stage.error!r}")
+        self.stage = stage
+        self.results = results
+
+
+async def run_stages(stages: list[Stage], timeout: float | None = None) -> dict[str, StageResult]:
+    """ Run `stages` concurrently, respecting their dependencies.
+
+    Args:
+        stages (list[Stage]): Stages to run; names must be unique and dependencies must be listed.
+        timeout (float | None): Overall deadline in seconds; stages still running are cancelled.
+
+    Returns:
+        dict: Stage name -> StageResult, in the order the stages were given.
+
+    Raises:
+        PipelineError: When a required stage fails or times out (the other stages are cancelled).
+    """
+
+    by_name = {stage.name: stage for stage in stages}
+    if len(by_name) != len(stages):
+        raise ValueError("Stage names must be unique.")
+    for stage in stages:
+        missing = set(stage.depends_on) - set(by_name)
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages {sorted(missing)}.")
+
+    results: dict[str, StageResult] = {}
+    done = {name: asyncio.Event() for name in by_name}
+
+    async def execute(stage: Stage):
+        for dependency in stage.depends_on:
+            await done[dependency].wait()
+
+        failed = [d for d in stage.depends_on if not results[d].ok]
+        if failed:
+            results[stage.name] = StageResult(stage.name, "skipped", error=RuntimeError(f"Dependencies failed: {failed}"))
+            done[stage.name].set()
+            if stage.required:
+                raise PipelineError(results[stage.name], results)
+            return
+
+        start = time.perf_counter()
+        try:
+            value = await asyncio.wait_for(stage.run(**{d: results[d].value for d in stage.depends_on}), stage.timeout)
+            results[stage.name] = StageResult(stage.name, "ok", value, duration=time.perf_counter() - start)
+        except asyncio.TimeoutError as e:
+            results[stage.name] = StageResult(stage.name, "timeout", error=e, duration=time.perf_counter() - start)
+        except asyncio.CancelledError as e:
+            results[stage.name] = StageResult(stage.name, "cancelled", error=e, duration=time.perf_counter() - start)
+            done[stage.name].set()
+            raise
+        except Exception as e:
+            results[stage.name] = StageResult(stage.name, "failed", error=e, duration=time.perf_counter() - start)
+        print(f"Stage '{stage.name}' {results[stage.name].status} after {results[stage.name].duration:.2f}s")
+        done[stage.name].set()
+
+        if not results[stage.name].ok and stage.required:
+            raise PipelineError(results[stage.name], results)
+
+    tasks = [asyncio.create_task(execute(stage), name=stage.name) for stage in stages]
+    try:
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout)
+    except BaseException as e:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for name in by_name:
+            results.setdefault(name, StageResult(name, "cancelled", error=e))
+
+        if isinstance(e, PipelineError):
+            e.results = _ordered(results, stages)
+            raise
+        if isinstance(e, asyncio.TimeoutError):
+            raise PipelineError(StageResult("pipeline", "timeout", error=e), _ordered(results, stages)) from e
+        raise
+
+    return _ordered(results, stages)
+
+
+def _ordered(results: dict[str, StageResult], stages: list[Stage]) -> dict[str, StageResult]:
+    return {stage.name: results[stage.name] for stage in stages}
+
+
+def run_sync(coroutine: Coroutine) -> Any:
+    """ Run a coroutine from synchronous code, also when an event loop is already running (notebooks, Streamlit). """
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    outcome: dict[str, Any] = {}
+
+    def target():
+        try:
+            outcome["value"] = asyncio.run(coroutine)
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, name="gaby-orchestrator")
+    thread.start()
+    thread.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["value"]
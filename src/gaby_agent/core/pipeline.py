@@ -5,23 +5,44 @@ pipeline.py
 Main Data Processing / Cleaning pipeline.
 """
 
+import asyncio
 import pandas as pd
 from uuid import uuid4
 from datetime import datetime
 from dataclasses import dataclass, field
 
-from schema import EntryReport
-from config import EpisodeConfig
-from agent import (
+from .schema import EntryReport
+from .config import EpisodeConfig
+from .profiling import DistinctMode, profile_dataframe, split_stats, summarize_dataframe
+from .streaming import DEFAULT_CHUNKSIZE, profile_csv
+from .orchestrator import Stage, run_stages, run_sync
+from .agent import (
     DatasetSummarizer,
     DataFieldMetaDescription
 )
-from gatekeeper import (
+from .agent.cleaner import DEFAULT_MAX_IN_FLIGHT, DEFAULT_BATCH_SIZE, field_sample
+from .agent._budget import count_tokens, fit_table
+from .knowledge_base._index import FieldIndex
+from .gatekeeper import (
     upload_dataframe_to_bq,
-    describe_data_field,
-    detect_numeric_field
+    upload_csv_to_bq,
+    profile_data_field
 )
 
+SUMMARY_TIMEOUT = 300      # seconds for the local dataset summary
+GATEKEEPER_TIMEOUT = 600   # seconds for the BigQuery field profile job
+RECAP_MAX_TOKENS = 3072    # episode recap budget (thinking_agent: num_ctx 4096, minus its answer)
+
+def descriptions_table(descriptions: dict) -> pd.DataFrame:
+    """ `DataFieldMetaDescription.run_loop` records (column -> [{name, data_type, description}]) as the
+    data_field_name / description table the BigQuery field profile produces. """
+
+    return pd.DataFrame(
+        [(column, records[0].get("description") if records else None) for column, records in descriptions.items()],
+        columns=["data_field_name", "description"]
+    )
+
+
 @dataclass
 class DataProfiler:
     # User Inputs
@@ -31,18 +52,21 @@ class DataProfiler:
     # Defining the dataset
     description: str | None = None # Describing the dataset in natural language
     data_field_summary: pd.DataFrame | None = None # Data field summary table
+    data_field_stats: pd.DataFrame | None = None # Min / max / mean per data field, kept out of the uploaded summary
     data_field_description: pd.DataFrame | None = None # Data field summary table with description columns
     numeric_table: pd.DataFrame | None = None # Data field summary table with description columns
 
     _send_to_gatekeeper: bool = False
+    distinct_mode: DistinctMode = "exact" # "approx" uses HyperLogLog sketches for distinct counts
+    source_path: str | None = None # Set in streaming mode: `data` then only holds a preview of this CSV
+    field_index: FieldIndex | None = None # Field descriptions of past episodes, reused for similar fields and grown with this one
     # Episode ID & Configuration
-    episode_id: str = uuid4().hex
-    timestamp: str = datetime.now().isoformat()
+    episode_id: str = field(default_factory=lambda: uuid4().hex)
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
     config: EpisodeConfig = field(init=False)
 
     def __post_init__(self):
         try:
-            self.define_dataset(self._send_to_gatekeeper)
             # the EpisodeConfig stored dataset id for the input dataset is set to self.episode_id-self.tiemstamp in prod
             # self.config = EpisodeConfig(
             #    input_dataset_id=f"{self.episode_id}-{self.timestamp}",
@@ -51,43 +75,52 @@ class DataProfiler:
             self.config = EpisodeConfig(
                 input_id=self.episode_id,
             )
+            # config must exist before define_dataset uploads to the episode's tables
+            self.define_dataset(self._send_to_gatekeeper)
 
         except Exception as e:
             print(f"❌ Error during dataset definition: {e}")
             raise e
 
+    @classmethod
+    def from_csv(cls, path: str, user_input_tags: str | list | None = None, chunksize: int = DEFAULT_CHUNKSIZE, **kwargs) -> "DataProfiler":
+        """ Streaming profiler mode: summarizes the CSV chunk by chunk and keeps only a preview of its rows in memory. """
+
+        profiler = profile_csv(path, chunksize=chunksize, distinct=kwargs.get("distinct_mode", "exact"))
+
+        return cls(
+            data=profiler.preview,
+            user_input_tags=user_input_tags,
+            data_field_summary=profiler.summary(),
+            source_path=str(path),
+            **kwargs
+        )
+
     @staticmethod
     def summarize_dataframe(df: pd.DataFrame):
-        for col in df.columns:
-            total_count = len(df)
-            missing_count = df[col].isna().sum()
-            data_type = df[col].dtype
-
-            # Check if continuous: numeric with many unique values
-            if pd.api.types.is_numeric_dtype(df[col]) and df[col].nunique() > 20:
-                unique_vals = "continuous"
-            else:
-                unique_vals = df[col].nunique()
+        """ Column-by-column summary generator, kept as the reference for `profile_dataframe`. """
 
-            yield {
-                "data_field_name": col,
-                "missing_count": missing_count,
-                "total_count": total_count,
-                "data_type": str(data_type),
-                "unique_values": unique_vals
-            }
+        yield from summarize_dataframe(df)
 
     def define_dataset(self, upload_summary: bool = False):
         if self.data.shape[0] == 0 or self.user_input_tags is None:
             raise ValueError("The provided DataFrame is empty or data origin is not specified. Both these are required to start the workflow.")
 
         # assuming have loaded the model and returned it
-        self.data_field_summary = pd.DataFrame.from_records(list(self.summarize_dataframe(self.data)))
+        if self.data_field_summary is None:
+            self.data_field_summary = profile_dataframe(self.data, distinct=self.distinct_mode)
+        if self.data_field_stats is None:
+            # the uploaded summary keeps its original schema; the numeric stats live next to it
+            self.data_field_summary, self.data_field_stats = split_stats(self.data_field_summary)
 
-        print(f"✅ Dataset defined with {self.data.shape[0]} rows and {self.data.shape[1]} columns.")
+        n_rows = int(self.data_field_summary["total_count"].iloc[0]) if len(self.data_field_summary) else self.data.shape[0]
+        print(f"✅ Dataset defined with {n_rows} rows and {self.data.shape[1]} columns.")
 
         if upload_summary is True:
-            upload_dataframe_to_bq(self.data, self.config.dataset_id)
+            if self.source_path is not None:
+                upload_csv_to_bq(self.source_path, self.config.dataset_id)
+            else:
+                upload_dataframe_to_bq(self.data, self.config.dataset_id, summary=self.data_field_summary)
             upload_dataframe_to_bq(self.data_field_summary, self.config.summary_id)
 
         print(f"Completed profiling for dataset id: {self.episode_id} and uploaded to BQ.")
@@ -100,41 +133,105 @@ class DataProfiler:
             data_field_description=self.data_field_description
         )
 
-    def episode_recap(self):
+    def episode_recap(self, max_tokens: int | None = RECAP_MAX_TOKENS):
+        """ Context prompt recapping the episode, with the field tables fitted into `max_tokens` (None: no limit). """
+
         context_prompt = f"--- Data Summary ---"
 
         end_cleaning_report = self.end_cleaning_report
 
         context_prompt += f"\nDataset Description: {end_cleaning_report.description}\n" if end_cleaning_report.description is not None else "\nNo dataset description available.\n"
-        context_prompt += f"\nData Field Summary:\n{end_cleaning_report.data_field_summary.to_markdown(index=False)}\n" if end_cleaning_report.data_field_summary is not None else ""
-        context_prompt += f"\nData Field Description:\n{end_cleaning_report.data_field_description.to_markdown(index=False)}\n" if end_cleaning_report.data_field_description is not None else ""
 
-        return context_prompt
+        tables = {
+            "Data Field Summary": end_cleaning_report.data_field_summary,
+            "Data Field Description": end_cleaning_report.data_field_description,
+        }
+        tables = {title: table for title, table in tables.items() if table is not None}
+        remaining = None if max_tokens is None else max_tokens - count_tokens(context_prompt)
 
-    @staticmethod
-    def data_cleaning_pipeline(report: "DataProfiler"):
-        """ Main function to run the data cleaning pipeline. """
+        for i, (title, table) in enumerate(tables.items()):
+            if remaining is None:
+                text = table.to_markdown(index=False)
+            else:
+                # an even share of what is left, so a small first table leaves more room to the next
+                text, budget_report = fit_table(
+                    table,
+                    max(remaining // (len(tables) - i), 0),
+                    encoding="markdown",
+                    summarize=False,  # one row per field: fewer fields beat statistics across fields
+                    label="data_field_name",
+                )
+                remaining -= budget_report.tokens_after
+                if budget_report.trimmed:
+                    print(f"{title} fitted to the recap budget: {budget_report}")
+            context_prompt += f"\n{title}:\n{text}\n"
 
-        report.description = DatasetSummarizer().run(
-            user_inputs=report.user_input_tags,
-            data_table=report.data.head(3).to_string(index=False)
-        )
+        return context_prompt
 
-        try:
-            report.data_field_description = describe_data_field(
-                data_summary_id=report.config.summary_id
-            ) # type: ignore
-            report.numeric_table = detect_numeric_field(
-                data_summary_id=report.config.summary_id
-            ) # type: ignore
+    @staticmethod
+    def data_cleaning_pipeline(report: "DataProfiler", timeout: float | None = None):
+        """ Main function to run the data cleaning pipeline (blocking wrapper of `adata_cleaning_pipeline`). """
 
-        except Exception as e:
-            print("Error using GCP model, falling back to local model (takes longer to run):", e)
+        return run_sync(DataProfiler.adata_cleaning_pipeline(report, timeout=timeout))
 
-            report.data_field_description = DataFieldMetaDescription().run_loop(
+    @staticmethod
+    async def adata_cleaning_pipeline(report: "DataProfiler", timeout: float | None = None):
+        """ Run the data cleaning pipeline, overlapping the local summary with the BigQuery field profile.
+
+        The dataset summary (local model) and the single AI.GENERATE scan producing the field
+        descriptions and numeric types do not depend on each other, so they run concurrently. If the
+        BigQuery stage fails or times out, the descriptions fall back to the local model once the
+        summary is available.
+
+        Args:
+            report (DataProfiler): Profiled dataset; its description and field tables are filled in.
+            timeout (float | None): Overall deadline in seconds; running stages are cancelled when it passes.
+        """
+
+        stages = [
+            Stage(
+                "summarize",
+                lambda: DatasetSummarizer().arun(
+                    user_inputs=report.user_input_tags,
+                    data_table=report.data
+                ),
+                timeout=SUMMARY_TIMEOUT
+            ),
+            Stage(
+                "field_profile",
+                # single AI.GENERATE scan producing both the descriptions and the numeric types
+                lambda: profile_data_field.arun(data_summary_id=report.config.summary_id),
+                timeout=GATEKEEPER_TIMEOUT,
+                required=False
+            ),
+        ]
+        results = await run_stages(stages, timeout=timeout)
+        report.description = results["summarize"].value
+
+        field_profile = results["field_profile"]
+        if field_profile.ok:
+            report.data_field_description = field_profile.value[["data_field_name", "description"]]
+            report.numeric_table = field_profile.value[["data_field_name", "numeric_type"]]
+            if report.field_index is not None:
+                fields = [
+                    (name, field_sample(report.data, name), description)
+                    for name, description in report.data_field_description.itertuples(index=False)
+                    if name in report.data.columns
+                ]
+                await asyncio.to_thread(report.field_index.add, fields, report.episode_id)
+        else:
+            print("Error using GCP model, falling back to local model (takes longer to run):", field_profile.error)
+
+            descriptions = await asyncio.to_thread(
+                DataFieldMetaDescription().run_loop,
                 data=report.data.head(10),
-                data_description=report.description
-            ) # type: ignore
+                data_description=report.description,
+                max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                batch_size=DEFAULT_BATCH_SIZE,
+                field_index=report.field_index,
+                episode_id=report.episode_id
+            )
+            report.data_field_description = descriptions_table(descriptions)
             report.numeric_table = None
 
         return report
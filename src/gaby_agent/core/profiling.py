@@ -0,0 +1,244 @@
+"""
+core/profiling.py
+
+Profiling engine used by the DataProfiler to build the data field summary table.
+
+`summarize_dataframe` is the original column-by-column generator and is kept as the
+reference implementation. `profile_dataframe` computes the same summary (plus min / max / mean,
+which `split_stats` keeps apart from the uploaded summary) in batched, vectorized passes over
+homogeneous column blocks, with either exact or HyperLogLog-approximated distinct counts.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Literal
+
+from .sketches import HyperLogLog, DEFAULT_PRECISION
+
+CONTINUOUS_THRESHOLD = 20  # numeric fields with more distinct values than this are labelled "continuous"
+DEFAULT_BLOCK_SIZE = 64    # number of columns sorted together per numeric block
+PROBE_ROWS = 4096          # rows counted before a numeric column is sorted in full
+
+SUMMARY_COLUMNS = ["data_field_name", "missing_count", "total_count", "data_type", "unique_values"]
+STATS_COLUMNS = ["min_value", "max_value", "mean_value"]
+ERROR_COLUMN = "unique_values_error"  # relative standard error of approximate distinct counts
+
+DistinctMode = Literal["exact", "approx"]
+
+
+def summarize_dataframe(df: pd.DataFrame):
+    """ Reference per-column summary generator (one scan per statistic per column). """
+
+    for col in df.columns:
+        total_count = len(df)
+        missing_count = df[col].isna().sum()
+        data_type = df[col].dtype
+
+        # Check if continuous: numeric with many unique values
+        if pd.api.types.is_numeric_dtype(df[col]) and df[col].nunique() > CONTINUOUS_THRESHOLD:
+            unique_vals = "continuous"
+        else:
+            unique_vals = df[col].nunique()
+
+        yield {
+            "data_field_name": col,
+            "missing_count": missing_count,
+            "total_count": total_count,
+            "data_type": str(data_type),
+            "unique_values": unique_vals
+        }
+
+
+def _numeric_block_distinct(block: np.ndarray) -> np.ndarray:
+    """ Exact distinct count of every column of a homogeneous 2D numeric block, from one sort along the rows.
+
+    Distinct values are the positions where the sorted value changes. NaNs sort last and compare
+    unequal to everything, so each of them adds one change that is taken back out.
+    """
+
+    n_rows, n_cols = block.shape
+    if n_rows == 0:
+        return np.zeros(n_cols, dtype=np.int64)
+
+    ordered = np.sort(block, axis=0)
+    changes = (ordered[1:] != ordered[:-1]).sum(axis=0)
+    if ordered.dtype.kind != "f":
+        return changes + 1
+
+    n_nan = np.isnan(ordered).sum(axis=0)
+    has_values = n_nan < n_rows
+    return has_values + changes - (n_nan - ~has_values)
+
+
+def _numeric_block_counts(block: np.ndarray, probe_rows: int = PROBE_ROWS) -> np.ndarray:
+    """ Distinct counts as the summary needs them: exact up to `CONTINUOUS_THRESHOLD`, only known to exceed it above.
+
+    The first `probe_rows` rows are counted first; columns already past the threshold there are
+    continuous and never sorted in full, so the full sort only runs on low-cardinality columns.
+    """
+
+    counts = _numeric_block_distinct(block[:probe_rows])
+    if len(block) > probe_rows:
+        low = np.flatnonzero(counts <= CONTINUOUS_THRESHOLD)
+        if low.size:
+            counts[low] = _numeric_block_distinct(block[:, low])
+    return counts
+
+
+def _numeric_block_moments(block: np.ndarray) -> dict[str, np.ndarray]:
+    """ Min, max and mean for every column of a 2D numeric block without sorting it. """
+
+    n_rows, n_cols = block.shape
+    if n_rows == 0:
+        return {"min": np.full(n_cols, np.nan), "max": np.full(n_cols, np.nan), "mean": np.full(n_cols, np.nan)}
+
+    if block.dtype.kind == "f":
+        # fmin / fmax skip NaNs (NaN only for an all-NaN column)
+        n_valid = n_rows - np.isnan(block).sum(axis=0)
+        minimum, maximum = np.fmin.reduce(block, axis=0), np.fmax.reduce(block, axis=0)
+        totals = np.nansum(block, axis=0, dtype=np.float64)
+    else:
+        n_valid = np.full(n_cols, n_rows)
+        minimum, maximum = block.min(axis=0), block.max(axis=0)
+        totals = block.sum(axis=0, dtype=np.float64)
+
+    mean = np.full(n_cols, np.nan)
+    np.divide(totals, n_valid, out=mean, where=n_valid > 0)
+    return {
+        "min": minimum.astype(np.float64),
+        "max": maximum.astype(np.float64),
+        "mean": mean,
+    }
+
+
+def approx_distinct(series: pd.Series, numeric: bool, precision: int = DEFAULT_PRECISION) -> int:
+    """ HyperLogLog distinct count of a column.
+
+    Numeric columns only need to know whether they pass `CONTINUOUS_THRESHOLD`, so their sketch
+    stops consuming values as soon as the estimate crosses it.
+    """
+
+    sketch = HyperLogLog(precision)
+    if numeric:
+        sketch.exceeds(series, CONTINUOUS_THRESHOLD)
+    else:
+        sketch.update(series)
+    return len(sketch)
+
+
+def split_stats(summary: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """ Split a summary into the `data_field_summary` schema and a data_field_name + min / max / mean table. """
+
+    stats_columns = [column for column in STATS_COLUMNS if column in summary.columns]
+    return summary.drop(columns=stats_columns), summary[["data_field_name", *stats_columns]]
+
+
+def _is_block_numeric(dtype) -> bool:
+    """ Numeric columns that can be stacked into a plain numpy block (excludes nullable extension dtypes). """
+
+    return pd.api.types.is_numeric_dtype(dtype) and isinstance(dtype, np.dtype)
+
+
+def profile_dataframe(
+    df: pd.DataFrame,
+    include_stats: bool = True,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    distinct: DistinctMode = "exact",
+    precision: int = DEFAULT_PRECISION
+) -> pd.DataFrame:
+    """ Build the data field summary table in batched passes.
+
+    Missing counts come from a single `isna().sum()` over the whole frame. Numeric columns are grouped
+    by dtype and processed `block_size` columns at a time: distinct counts come from a sort of the
+    block's first `PROBE_ROWS` rows, followed by a full sort of the columns still under the continuous
+    threshold, and min, max and mean from one reduction each. Remaining columns fall back to a
+    block-wise `nunique`.
+
+    With `distinct="approx"` no hash set or sort is built: distinct counts come from HyperLogLog
+    sketches (with an early exit at the continuous threshold for numeric columns) and the summary
+    gains an `unique_values_error` column holding the sketch's relative standard error.
+
+    Args:
+        df (pd.DataFrame): Input dataset.
+        include_stats (bool): Append `min_value`, `max_value` and `mean_value` columns (NaN for non-numeric fields).
+        block_size (int): Maximum number of columns sorted together, bounding the temporary copy.
+        distinct (str): "exact" for exact distinct counts, "approx" for HyperLogLog estimates.
+        precision (int): HyperLogLog precision used when `distinct="approx"`.
+
+    Returns:
+        pd.DataFrame: One row per column using the `data_field_summary` schema.
+    """
+
+    if distinct not in ("exact", "approx"):
+        raise ValueError(f"Unknown distinct mode '{distinct}'. Use 'exact' or 'approx'.")
+
+    approx = distinct == "approx"
+    n_cols = df.shape[1]
+    dtypes = df.dtypes.tolist()
+    is_numeric = np.array([pd.api.types.is_numeric_dtype(dtype) for dtype in dtypes], dtype=bool)
+
+    missing = df.isna().sum(axis=0).to_numpy(dtype=np.int64)
+    counts = np.zeros(n_cols, dtype=np.int64)
+    minimum = np.full(n_cols, np.nan)
+    maximum = np.full(n_cols, np.nan)
+    mean = np.full(n_cols, np.nan)
+
+    # group positional indices by dtype so each block is a single homogeneous array
+    numeric_groups: dict[np.dtype, list[int]] = {}
+    other: list[int] = []
+    for position, dtype in enumerate(dtypes):
+        if _is_block_numeric(dtype):
+            numeric_groups.setdefault(dtype, []).append(position)
+        else:
+            other.append(position)
+
+    for dtype, positions in numeric_groups.items():
+        for start in range(0, len(positions), block_size):
+            chunk = positions[start:start + block_size]
+            block = df.iloc[:, chunk].to_numpy(dtype=dtype)
+            if approx:
+                counts[chunk] = [approx_distinct(df.iloc[:, position], True, precision) for position in chunk]
+            else:
+                counts[chunk] = _numeric_block_counts(block)
+            if include_stats:
+                stats = _numeric_block_moments(block)
+                minimum[chunk] = stats["min"]
+                maximum[chunk] = stats["max"]
+                mean[chunk] = stats["mean"]
+
+    for start in range(0, len(other), block_size):
+        chunk = other[start:start + block_size]
+        if approx:
+            counts[chunk] = [approx_distinct(df.iloc[:, position], is_numeric[position], precision) for position in chunk]
+        else:
+            counts[chunk] = df.iloc[:, chunk].nunique(axis=0).to_numpy(dtype=np.int64)
+
+        # nullable numeric extension dtypes (Int64, Float64, ...) still get min / max / mean
+        numeric_chunk = [position for position in chunk if is_numeric[position]]
+        if include_stats and numeric_chunk:
+            described = df.iloc[:, numeric_chunk].agg(["min", "max", "mean"])
+            minimum[numeric_chunk] = described.loc["min"].to_numpy(dtype=np.float64, na_value=np.nan)
+            maximum[numeric_chunk] = described.loc["max"].to_numpy(dtype=np.float64, na_value=np.nan)
+            mean[numeric_chunk] = described.loc["mean"].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    continuous = is_numeric & (counts > CONTINUOUS_THRESHOLD)
+    summary = pd.DataFrame({
+        "data_field_name": df.columns.tolist(),
+        "missing_count": missing,
+        "total_count": np.full(n_cols, len(df), dtype=np.int64),
+        "data_type": [str(dtype) for dtype in dtypes],
+        "unique_values": pd.Series(
+            ["continuous" if flag else int(count) for flag, count in zip(continuous, counts)],
+            dtype=object
+        ),
+    })
+
+    if include_stats:
+        summary["min_value"] = minimum
+        summary["max_value"] = maximum
+        summary["mean_value"] = mean
+
+    if approx:
+        summary[ERROR_COLUMN] = HyperLogLog(precision).relative_error
+
+    return summary
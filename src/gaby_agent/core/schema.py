@@ -6,7 +6,7 @@ This script contains dataclass schemas used across the Gaby Agent application to
 """
 
 import pandas as pd
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -29,7 +29,7 @@ class Stage:
     id: str
     label: str 
     description: str
-    stages: dict[list] = {}
+    stages: dict[list] = field(default_factory=dict)
     
     @property 
     def list_stages(self):
@@ -38,14 +38,14 @@ class Stage:
 @dataclass 
 class Workflow:
     """ All available Workflow services. """
-    data_cleaning: list[Stage] = []
-    data_analysis: list[Stage] = []
-    data_quality_assessment: list[Stage] = []
-    business_insights: list[Stage] = []
-    business_dashboard: list[Stage] = []
-    model_building: list[Stage] = []
-    model_researching: list[Stage] = []
-    model_evaluation: list[Stage] = []
+    data_cleaning: list[Stage] = field(default_factory=list)
+    data_analysis: list[Stage] = field(default_factory=list)
+    data_quality_assessment: list[Stage] = field(default_factory=list)
+    business_insights: list[Stage] = field(default_factory=list)
+    business_dashboard: list[Stage] = field(default_factory=list)
+    model_building: list[Stage] = field(default_factory=list)
+    model_researching: list[Stage] = field(default_factory=list)
+    model_evaluation: list[Stage] = field(default_factory=list)
 
     def add_stage(self, service: str, id: str, label: str, description: str):
         """ Add a new stage to the specified service category. """
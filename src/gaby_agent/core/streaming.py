@@ -0,0 +1,297 @@
+"""
+core/streaming.py
+
+Chunked CSV profiling for datasets that do not fit in memory.
+
+Chunks are read as raw strings, so every chunk sees the same values `pd.read_csv` would parse for
+the whole file. Per-column accumulators merge missing counts, distinct sets / HyperLogLog sketches
+and moments chunk by chunk, then resolve the final dtype the way `pd.read_csv` would have inferred
+it, producing the same data field summary table as `profile_dataframe`.
+
+Memory stays bounded in "exact" mode too: numeric columns are counted from their parsed values
+(only tracked up to the "continuous" threshold), and the exact set of a text column is folded into
+its HyperLogLog sketch once it holds more than `exact_limit` values; such counts are then reported
+as approximate in the `unique_values_error` column.
+"""
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+
+from .profiling import CONTINUOUS_THRESHOLD, ERROR_COLUMN, DistinctMode
+from .sketches import HyperLogLog, DEFAULT_PRECISION
+
+DEFAULT_CHUNKSIZE = 100_000  # rows per chunk read from the CSV
+DEFAULT_PREVIEW_ROWS = 10    # rows kept in memory for the agents' dataset preview
+EXACT_DISTINCT_LIMIT = 100_000  # distinct raw values kept per text column before falling back to the sketch
+
+STRING_DTYPE = str(pd.Series(["text"]).dtype)  # "str" on pandas >= 3, "object" before
+_BOOL_VALUES = {"True": True, "TRUE": True, "true": True, "False": False, "FALSE": False, "false": False}
+_INT_PATTERN = r"\s*[+-]?\d+\s*"
+
+
+@dataclass
+class ColumnAccumulator:
+    """ Mergeable running statistics for a single column read as raw strings. """
+
+    name: str
+    distinct: DistinctMode = "exact"
+    precision: int = DEFAULT_PRECISION
+    exact_limit: int = EXACT_DISTINCT_LIMIT
+
+    total: int = 0
+    missing: int = 0
+
+    # dtype inference: stays True while every non-null value so far parses as that type
+    is_numeric: bool = True
+    is_integer: bool = True
+    is_boolean: bool = True
+
+    # moments over the numeric (or boolean) interpretation of the values
+    n_true: int = 0
+    n_numeric: int = 0
+    total_sum: float = 0.0
+    minimum: float = np.inf
+    maximum: float = -np.inf
+
+    numeric_values: set = field(default_factory=set, repr=False)  # only tracked up to CONTINUOUS_THRESHOLD + 1
+    raw_values: set = field(default_factory=set, repr=False)      # exact mode, text columns, at most exact_limit values
+    sketch: HyperLogLog = field(init=False, repr=False)
+    approximate: bool = field(init=False)                          # True once the distinct count comes from the sketch
+
+    def __post_init__(self):
+        self.sketch = HyperLogLog(self.precision)
+        self.approximate = self.distinct == "approx"
+
+    @property
+    def n_valid(self) -> int:
+        return self.total - self.missing
+
+    def update(self, raw: pd.Series):
+        """ Fold a chunk of raw string values into the accumulator. """
+
+        values = raw.dropna()
+        self.total += len(raw)
+        self.missing += len(raw) - len(values)
+
+        if values.empty:
+            return
+
+        unique = pd.Series(values.unique(), dtype=object)
+
+        if self.is_boolean:
+            self.is_boolean = bool(unique.isin(_BOOL_VALUES).all())
+            if self.is_boolean:
+                self.n_true += int(values.map(_BOOL_VALUES).sum())
+
+        parsed = None
+        if self.is_numeric:
+            parsed = pd.to_numeric(values, errors="coerce")
+            if parsed.isna().any():
+                self.is_numeric = False
+                self.numeric_values.clear()
+                if self.n_numeric and not self.approximate:
+                    self._fall_back_to_sketch() # the earlier numeric chunks were only sketched
+                parsed = None
+
+        self._count_distinct(unique)
+        if parsed is not None:
+            if self.is_integer:
+                self.is_integer = bool(unique.astype(str).str.fullmatch(_INT_PATTERN).all())
+
+            parsed = parsed.to_numpy(dtype=np.float64)
+            self.n_numeric += len(parsed)
+            self.total_sum += float(parsed.sum())
+            self.minimum = min(self.minimum, float(parsed.min()))
+            self.maximum = max(self.maximum, float(parsed.max()))
+
+            if len(self.numeric_values) <= CONTINUOUS_THRESHOLD:
+                self.numeric_values.update(pd.unique(parsed + 0.0).tolist())
+
+    def _count_distinct(self, unique: pd.Series):
+        """ Exact set for text columns in exact mode, sketch otherwise (numeric columns are counted from `numeric_values`). """
+
+        if self.approximate or self.is_numeric:
+            self.sketch.update(unique) # keeps numeric columns countable if a later chunk turns them into text
+            return
+        self.raw_values.update(unique)
+        if len(self.raw_values) > self.exact_limit:
+            self._fall_back_to_sketch()
+
+    def _fall_back_to_sketch(self):
+        self.sketch.update(pd.Series(list(self.raw_values), dtype=object))
+        self.raw_values = set()
+        self.approximate = True
+
+    def merge(self, other: "ColumnAccumulator") -> "ColumnAccumulator":
+        """ Merge the statistics of another accumulator for the same column (e.g. another file shard). """
+
+        self.total += other.total
+        self.missing += other.missing
+        self.is_numeric = self.is_numeric and other.is_numeric
+        self.is_integer = self.is_integer and other.is_integer
+        self.is_boolean = self.is_boolean and other.is_boolean
+        self.n_true += other.n_true
+        self.n_numeric += other.n_numeric
+        self.total_sum += other.total_sum
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.numeric_values = self.numeric_values | other.numeric_values if self.is_numeric else set()
+        self.raw_values |= other.raw_values
+        self.sketch.merge(other.sketch)
+        if other.approximate or len(self.raw_values) > self.exact_limit:
+            self._fall_back_to_sketch()
+        return self
+
+    @property
+    def data_type(self) -> str:
+        """ The dtype `pd.read_csv` infers for the full column. """
+
+        if self.n_valid == 0:
+            return "float64"
+        if self.is_boolean:
+            return "bool" if self.missing == 0 else "object"
+        if self.is_numeric:
+            return "int64" if self.is_integer and self.missing == 0 else "float64"
+        return STRING_DTYPE
+
+    def unique_values(self) -> int | str:
+        if self.n_valid > 0 and self.is_boolean:
+            n_false = self.n_valid - self.n_true
+            return int(self.n_true > 0) + int(n_false > 0)
+
+        if self.is_numeric:
+            count = len(self.numeric_values)
+        elif self.approximate:
+            count = len(self.sketch)
+        else:
+            count = len(self.raw_values)
+
+        if self.is_numeric and count > CONTINUOUS_THRESHOLD:
+            return "continuous"
+        return count
+
+    def stats(self) -> dict[str, float]:
+        """ Min / max / mean over the parsed values (NaN for text columns). """
+
+        if self.n_valid > 0 and self.is_boolean and self.data_type == "bool":
+            return {
+                "min_value": float(self.n_true == self.n_valid),
+                "max_value": float(self.n_true > 0),
+                "mean_value": self.n_true / self.n_valid,
+            }
+        if self.is_numeric and self.n_numeric > 0:
+            return {
+                "min_value": self.minimum,
+                "max_value": self.maximum,
+                "mean_value": self.total_sum / self.n_numeric,
+            }
+        return {"min_value": np.nan, "max_value": np.nan, "mean_value": np.nan}
+
+    def convert(self, raw: pd.Series) -> pd.Series:
+        """ Cast raw string values to the resolved column dtype. """
+
+        if self.data_type == "bool":
+            return raw.map(_BOOL_VALUES).astype(bool)
+        if self.data_type == "object":
+            return raw.map(_BOOL_VALUES).astype(object)
+        if self.data_type in ("int64", "float64"):
+            return pd.to_numeric(raw).astype(self.data_type)
+        return raw
+
+
+@dataclass
+class StreamingProfiler:
+    """ Builds the data field summary table from a stream of raw-string chunks. """
+
+    distinct: DistinctMode = "exact"
+    precision: int = DEFAULT_PRECISION
+    preview_rows: int = DEFAULT_PREVIEW_ROWS
+    exact_limit: int = EXACT_DISTINCT_LIMIT
+
+    columns: dict[str, ColumnAccumulator] = field(default_factory=dict, init=False)
+    n_rows: int = field(default=0, init=False)
+    _preview: pd.DataFrame | None = field(default=None, init=False, repr=False)
+
+    def update(self, chunk: pd.DataFrame):
+        """ Fold one chunk (read with `dtype=str`) into the running statistics. """
+
+        if self._preview is None or len(self._preview) < self.preview_rows:
+            head = chunk.head(self.preview_rows)
+            self._preview = head if self._preview is None else pd.concat([self._preview, head]).head(self.preview_rows)
+
+        for col in chunk.columns:
+            if col not in self.columns:
+                self.columns[col] = ColumnAccumulator(col, distinct=self.distinct, precision=self.precision, exact_limit=self.exact_limit)
+            self.columns[col].update(chunk[col])
+
+        self.n_rows += len(chunk)
+
+    @property
+    def preview(self) -> pd.DataFrame:
+        """ The first `preview_rows` rows cast to the dtypes of the full file. """
+
+        if self._preview is None:
+            return pd.DataFrame()
+        return pd.DataFrame({col: acc.convert(self._preview[col]) for col, acc in self.columns.items()})
+
+    def summary(self, include_stats: bool = True) -> pd.DataFrame:
+        """ Data field summary table with the same schema as `profile_dataframe`. """
+
+        records = []
+        for col, acc in self.columns.items():
+            record = {
+                "data_field_name": col,
+                "missing_count": acc.missing,
+                "total_count": self.n_rows,
+                "data_type": acc.data_type,
+                "unique_values": acc.unique_values(),
+            }
+            if include_stats:
+                record.update(acc.stats())
+            records.append(record)
+
+        summary = pd.DataFrame.from_records(records)
+        summary["unique_values"] = summary["unique_values"].astype(object)
+
+        if self.distinct == "approx":
+            summary[ERROR_COLUMN] = HyperLogLog(self.precision).relative_error
+        elif any(acc.approximate and not acc.is_numeric for acc in self.columns.values()):
+            error = HyperLogLog(self.precision).relative_error
+            summary[ERROR_COLUMN] = [error if acc.approximate and not acc.is_numeric else 0.0 for acc in self.columns.values()]
+
+        return summary
+
+
+def profile_csv(
+    source,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    distinct: DistinctMode = "exact",
+    precision: int = DEFAULT_PRECISION,
+    preview_rows: int = DEFAULT_PREVIEW_ROWS,
+    exact_limit: int = EXACT_DISTINCT_LIMIT,
+    **read_csv_kwargs
+) -> StreamingProfiler:
+    """ Profile a CSV file (path or buffer) chunk by chunk without loading the full frame.
+
+    Args:
+        source: Path or file-like object accepted by `pd.read_csv`.
+        chunksize (int): Rows read per chunk.
+        distinct (str): "exact" keeps a set of distinct raw values per text column, "approx" a HyperLogLog sketch.
+        precision (int): HyperLogLog precision of the sketches.
+        preview_rows (int): Number of leading rows kept for dataset previews.
+        exact_limit (int): Distinct values kept per text column in exact mode before falling back to the sketch.
+        **read_csv_kwargs: Extra arguments forwarded to `pd.read_csv` (e.g. `sep`, `encoding`).
+
+    Returns:
+        StreamingProfiler: Call `.summary()` for the data field summary and `.preview` for the typed head.
+    """
+
+    profiler = StreamingProfiler(distinct=distinct, precision=precision, preview_rows=preview_rows, exact_limit=exact_limit)
+
+    with pd.read_csv(source, chunksize=chunksize, dtype=str, **read_csv_kwargs) as reader:
+        for chunk in reader:
+            profiler.update(chunk)
+
+    print(f"✅ Streamed {profiler.n_rows} rows x {len(profiler.columns)} columns.")
+    return profiler
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+from src.gaby_agent.core.agent._budget import fit_table, prompt_budget, token_counter
+from src.gaby_agent.core.agent.cleaner import DatasetSummarizer
+
+
+def wide_frame(n_rows=50, n_columns=60):
+    rng = np.random.default_rng(0)
+    data = {f"measure_{i}": rng.normal(size=n_rows) for i in range(n_columns)}
+    data["comment"] = ["a rather long free text comment about this row " * 3] * (n_rows - 1) + ["short"]
+    data["constant"] = "same"
+    data["empty"] = np.nan
+    return pd.DataFrame(data)
+
+
+def test_small_table_keeps_its_encoding():
+    table = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+
+    text, report = fit_table(table, budget=500, encoding="markdown")
+
+    assert text == table.to_markdown(index=False)
+    assert not report.trimmed and report.fits
+
+
+def test_wide_table_is_compressed_within_budget():
+    count = token_counter()
+    text, report = fit_table(wide_frame(), budget=400, rows=3, count=count)
+
+    assert report.fits and count(text) <= 400
+    assert report.tokens_before > 400 and report.trimmed_tokens == report.tokens_before - report.tokens_after
+    assert {"constant", "empty"} <= set(report.dropped_columns)
+    assert "Omitted columns: " in text
+
+
+def test_numeric_columns_are_summarized_when_rows_do_not_fit():
+    data = wide_frame(n_columns=20)
+
+    text, report = fit_table(data, budget=400, rows=20)
+
+    assert report.summarized and report.fits
+    assert f"measure_0 (float64): {data['measure_0'].min():.4g}..{data['measure_0'].max():.4g}" in text
+
+
+def test_summarizer_prompt_fits_the_model_context():
+    agent = DatasetSummarizer()
+    count = token_counter(agent.model_name)
+
+    kwargs = agent.pre_process(user_inputs="sensor readings", data_table=wide_frame())
+    prompt = agent._messages(**kwargs)
+
+    options = agent.kwargs["options"]
+    tokens = sum(count(message["content"]) for message in prompt)
+    assert tokens <= options["num_ctx"] - options["num_predict"]
+    assert agent.budget_report.trimmed
+    assert prompt_budget(agent, "sensor readings") >= agent.budget_report.tokens_after
+
+
+def test_columns_are_dropped_as_a_last_resort():
+    text, report = fit_table(wide_frame(), budget=60, rows=3)
+
+    assert report.fits and report.dropped_rows == 2
+    assert "more columns omitted" in text
+
+
+def field_table(n_fields=3000):
+    return pd.DataFrame({
+        "data_field_name": [f"col_{i}" for i in range(n_fields)],
+        "data_type": ["float64", "str"] * (n_fields // 2),
+        "description": [f"reading {i} of the sensor in degrees" for i in range(n_fields)],
+    })
+
+
+def test_rows_are_kept_and_omitted_rows_named_without_summary():
+    estimate, calls = token_counter(), []
+
+    def count(text):
+        calls.append(text)
+        return estimate(text)
+
+    text, report = fit_table(field_table(), budget=1500, encoding="markdown", count=count, summarize=False, label="data_field_name")
+
+    assert report.fits and not report.summarized
+    assert report.tokens_after > 0.9 * 1500
+    shown = 3000 - report.dropped_rows
+    assert "reading 0 of the sensor" in text and f"reading {shown - 1} of the sensor" in text
+    assert f"Omitted rows: col_{shown}, col_{shown + 1}" in text and "more)" in text
+    assert len(calls) < 60  # bisection, not one encode per dropped row
+
+
+def test_omitted_rows_are_counted_without_a_label():
+    text, report = fit_table(field_table(200), budget=300, summarize=False)
+
+    assert report.fits and report.dropped_rows
+    assert text.endswith(f"({report.dropped_rows} more rows omitted)")
@@ -0,0 +1,121 @@
+import ollama
+import pytest
+
+from src.gaby_agent.core.agent._cache import ResponseCache, is_deterministic, make_key, set_response_cache
+from src.gaby_agent.core.agent._core import GabyBasement, Instructor, DEFAULT_OPTIONS
+
+
+def reply(content: str) -> ollama.ChatResponse:
+    return ollama.ChatResponse(model="m", message=ollama.Message(role="assistant", content=content), done=True)
+
+
+class CountingClient:
+    def __init__(self):
+        self.n_chats = 0
+
+    def show(self, model_id):
+        return None
+
+    def chat(self, model, messages, stream=False, **kwargs):
+        self.n_chats += 1
+        response = reply(f"answer {self.n_chats} to {messages[-1]['content']}")
+        return iter([response]) if stream else response
+
+
+class Echo(
+    GabyBasement,
+    prompt=Instructor(prompt="Echo", input_template="{text}"),
+    model_name="base",
+):
+    pass
+
+
+@pytest.fixture
+def echo():
+    agent = Echo()
+    original = agent.client, Echo.kwargs, Echo.use_cache
+    agent.client = CountingClient()
+    Echo.kwargs = dict(Echo.kwargs, options=DEFAULT_OPTIONS.model_copy(update=dict(seed=7)).model_dump())
+    set_response_cache(ResponseCache())
+    yield agent
+    agent.client, Echo.kwargs, Echo.use_cache = original
+    set_response_cache(None)
+
+
+@pytest.mark.parametrize("options, expected", [
+    ({"temperature": 0.3, "seed": None}, False),
+    ({"temperature": 0.3, "seed": -1}, False),
+    ({"temperature": 0.3, "seed": 0}, True),
+    ({"temperature": 0, "seed": None}, True),
+    (None, False),
+])
+def test_is_deterministic(options, expected):
+    assert is_deterministic(options) is expected
+
+
+def test_key_depends_on_prompt_and_options_only():
+    messages = [{"role": "system", "content": "s"}, {"role": "user", "content": "u"}]
+    key = make_key("m", messages, {"options": {"seed": 1}, "stream": False})
+
+    assert key == make_key("m", messages, {"options": {"seed": 1, "top_k": None}, "stream": True, "keep_alive": "1m"})
+    assert key != make_key("m", messages, {"options": {"seed": 2}})
+    assert key != make_key("other", messages, {"options": {"seed": 1}})
+    assert key != make_key("m", messages[:1] + [{"role": "user", "content": "v"}], {"options": {"seed": 1}})
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "m", reply("a"))
+    cache.put("b", "m", reply("b"))
+    assert cache.get("a") is not None  # "b" becomes least recently used
+    cache.put("c", "m", reply("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a").message.content == "a"
+    assert cache.evictions == 1
+
+    size = len(reply("x").model_dump_json())
+    cache = ResponseCache(max_bytes=2 * size)
+    for key in "xyz":
+        cache.put(key, "m", reply(key))
+    assert cache.stats["entries"] == 2 and cache.get("x") is None
+
+
+def test_cache_persists_on_disk(tmp_path):
+    ResponseCache(path=tmp_path / "responses.sqlite").put("k", "m", reply("kept"))
+    reopened = ResponseCache(path=tmp_path / "responses.sqlite")
+
+    assert reopened.get("k").message.content == "kept"
+    assert reopened.invalidate("other") == 0
+    assert reopened.invalidate("m") == 1
+
+
+def test_run_reuses_deterministic_responses(echo):
+    first = echo.run(text="hi")
+
+    assert echo.run(text="hi") == first
+    assert echo.run_stream(text="hi").consume() == first
+    assert echo.client.n_chats == 1
+
+    echo.run(text="other")
+    assert echo.client.n_chats == 2
+
+
+def test_streamed_responses_are_cached(echo):
+    streamed = echo.run_stream(text="hi").consume()
+
+    assert echo.run(text="hi") == streamed
+    assert echo.client.n_chats == 1
+
+
+def test_bypass_and_nondeterministic_options_skip_the_cache(echo):
+    Echo.use_cache = False
+    echo.run(text="hi")
+    echo.run(text="hi")
+    assert echo.client.n_chats == 2
+
+    Echo.use_cache = True
+    Echo.kwargs = dict(Echo.kwargs, options=DEFAULT_OPTIONS.model_dump())
+    echo.run(text="hi")
+    echo.run(text="hi")
+    assert echo.client.n_chats == 4
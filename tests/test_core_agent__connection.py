@@ -0,0 +1,96 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import ollama
+import pytest
+
+from src.gaby_agent.core.agent import _connection
+from src.gaby_agent.core.agent._connection import ClientPool, resolve_host
+from src.gaby_agent.core.agent._core import GabyBasement, Instructor, CHAT_CONFIG
+from src.gaby_agent.core.agent._tuning import tuned_options
+
+
+class RecordingClient:
+    def __init__(self, host):
+        self.host = host
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def show(self, model_id):
+        return None
+
+    def chat(self, model, messages, **kwargs):
+        with self._lock:
+            self.calls.append(kwargs)
+        return ollama.ChatResponse(model=model, message=ollama.Message(role="assistant", content=str(kwargs["options"]["num_ctx"])))
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setitem(_connection.HOST_ALIASES, "lightning", "http://gpu:11434")
+    monkeypatch.setitem(_connection.HOST_ALIASES, "local", "http://localhost:11434")
+    pool = ClientPool(factory=RecordingClient)
+    monkeypatch.setattr(_connection, "_client_pool", pool)
+    return pool
+
+
+class LocalAgent(GabyBasement, prompt=Instructor(prompt="p", input_template="{text}"), model_name="base", host="local"):
+    pass
+
+
+class GpuAgent(GabyBasement, prompt=Instructor(prompt="p", input_template="{text}"), model_name="base", host="lightning", options=dict(num_ctx=4096)):
+    pass
+
+
+class ThinkingAgent(GabyBasement, prompt=Instructor(prompt="p", input_template="{text}"), model_name="thinking_agent"):
+    pass
+
+
+def test_resolve_host(monkeypatch):
+    monkeypatch.setitem(_connection.HOST_ALIASES, "lightning", "")
+    monkeypatch.setitem(_connection.HOST_ALIASES, "local", "http://localhost:11434")
+
+    assert resolve_host(None) == "http://localhost:11434"
+    assert resolve_host("lightning") == "http://localhost:11434"  # unconfigured alias falls back
+    assert resolve_host("http://other:1") == "http://other:1"
+
+
+def test_pool_shares_one_client_per_host(pool):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda i: pool.get("local" if i % 2 else "lightning"), range(32)))
+
+    assert len({id(client) for client in clients}) == 2
+    assert sorted(pool.hosts) == ["http://gpu:11434", "http://localhost:11434"]
+
+
+def test_agents_route_to_their_hosts(pool):
+    assert LocalAgent().client.host == "http://localhost:11434"
+    assert GpuAgent().client.host == "http://gpu:11434"
+    assert ThinkingAgent().client.host == "http://gpu:11434"  # `host: lightning` in config_models.yaml
+    assert LocalAgent(host="http://other:1").client.host == "http://other:1"
+    assert LocalAgent().client is LocalAgent().client
+
+
+def test_chat_settings_are_read_only_and_per_agent(pool):
+    with pytest.raises(TypeError):
+        GpuAgent.kwargs["tools"] = []
+    with pytest.raises(TypeError):
+        GpuAgent.kwargs["options"]["num_ctx"] = 1
+
+    assert LocalAgent.kwargs == {**CHAT_CONFIG, "options": {**CHAT_CONFIG["options"], **tuned_options(LocalAgent.model_name, host="local")}}
+    assert "num_thread" in LocalAgent.kwargs["options"] and GpuAgent.kwargs["options"]["num_thread"] is None  # hardware options stay local
+    assert GpuAgent.kwargs["options"]["num_ctx"] == 4096
+    assert GpuAgent(options=dict(num_ctx=512)).kwargs["options"]["num_ctx"] == 512
+    assert GpuAgent.kwargs["options"]["num_ctx"] == 4096
+
+
+def test_parallel_agents_keep_their_own_options(pool):
+    agents = [GpuAgent(options=dict(num_ctx=256 * (i + 1)), host="local") for i in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        answers = list(executor.map(lambda agent: agent.run(text="hi"), agents * 4))
+
+    assert answers == [str(256 * (i + 1)) for i in range(8)] * 4
+    calls = pool.get("local").calls
+    assert len(calls) == 32
+    assert len({id(call["options"]) for call in calls}) == 32  # every call gets its own options dict
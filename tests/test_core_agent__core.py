@@ -1,6 +1,9 @@
+import time
+
 import pytest
 
 from src.gaby_agent.core.agent._core import GabyBasement, Instructor, CHAT_CONFIG
+from src.gaby_agent.core.agent._tuning import tuned_options
 from src.gaby_agent.core.config import LocalConfig
 
 
@@ -47,8 +50,9 @@ def test_init_subclass_overwrites_attributes(monkeypatch):
     assert "DatasetSummarizer" in DatasetSummarizer.name
     print("Assertion passed: DatasetSummarizer.name contains 'DatasetSummarizer'")
 
-    # 3. Subclass should get its own CHAT_CONFIG copy
-    assert DatasetSummarizer.kwargs == CHAT_CONFIG
+    # 3. Subclass should get its own CHAT_CONFIG copy (with the tuned options of its model on its host)
+    tuned = tuned_options(DatasetSummarizer.model_name, host=DatasetSummarizer.host)
+    assert DatasetSummarizer.kwargs == {**CHAT_CONFIG, "options": {**CHAT_CONFIG["options"], **tuned}}
     assert DatasetSummarizer.kwargs is not CHAT_CONFIG  # different object
     print("Assertion passed: DatasetSummarizer.kwargs is a copy of CHAT_CONFIG")
 
@@ -63,3 +67,92 @@ def test_init_subclass_overwrites_attributes(monkeypatch):
     print("Assertion passed: GabyBasement is unaffected by DatasetSummarizer changes")
 
     print("Test completed successfully")
+
+
+class StreamingClient:
+    """ Stand-in for `ollama.Client` streaming a fixed reply word by word. """
+
+    def __init__(self, words, eval_duration=None):
+        self.words = words
+        self.eval_duration = eval_duration
+        self.requests = []
+
+    def show(self, model_id):
+        return None
+
+    def chat(self, model, messages, stream=False, **kwargs):
+        import ollama
+
+        self.requests.append(stream)
+        chunks = [ollama.ChatResponse(model=model, message=ollama.Message(role="assistant", content=word), done=False) for word in self.words]
+        chunks.append(ollama.ChatResponse(
+            model=model,
+            message=ollama.Message(role="assistant", content=""),
+            done=True,
+            eval_count=len(self.words) if self.eval_duration else None,
+            eval_duration=self.eval_duration,
+        ))
+        return iter(chunks) if stream else chunks[0].model_copy(update={"message": ollama.Message(role="assistant", content="".join(self.words))})
+
+
+class Shouter(
+    GabyBasement,
+    prompt=Instructor(prompt="Echo", input_template="{text}"),
+    model_name="base",
+):
+    def post_process(self, response) -> str:
+        return super().post_process(response).upper()
+
+
+@pytest.fixture
+def shouter():
+    agent = Shouter()
+    original = agent.client
+    yield agent
+    agent.client = original
+
+
+def test_run_stream_yields_chunks_and_post_processes_the_whole_reply(shouter):
+    shouter.client = StreamingClient([" hello ", "streaming ", "world "], eval_duration=int(0.5e9))
+
+    stream = shouter.run_stream(text="hi")
+    chunks = list(stream)
+
+    assert chunks == [" hello ", "streaming ", "world "]
+    assert stream.text == " hello streaming world "
+    assert stream.result == "HELLO STREAMING WORLD" == shouter.run(text="hi")
+    assert shouter.client.requests == [True, False]
+    assert stream.metrics.ttft is not None and stream.metrics.ttft <= stream.metrics.duration
+    assert stream.metrics.eval_count == 3
+    assert stream.metrics.tokens_per_sec == pytest.approx(6.0)
+
+
+def test_run_stream_counts_chunks_without_server_timings(shouter):
+    shouter.client = StreamingClient(["a", "b"])
+
+    stream = shouter.run_stream(text="hi")
+
+    assert stream.consume() == "AB"
+    assert stream.metrics.eval_count == 2
+    with pytest.raises(RuntimeError):
+        list(stream)
+
+
+def test_arun_awaits_the_async_client(shouter, monkeypatch):
+    import asyncio
+    import ollama
+
+    class AsyncClient:
+        async def chat(self, model, messages, **kwargs):
+            await asyncio.sleep(0.05)
+            return ollama.ChatResponse(model=model, message=ollama.Message(role="assistant", content=messages[-1]["content"]))
+
+    shouter.client = StreamingClient([])
+    monkeypatch.setattr(Shouter, "_async_client", lambda self: AsyncClient())
+
+    async def concurrently():
+        return await asyncio.gather(*(shouter.arun(text=f"call {i}") for i in range(5)))
+
+    start = time.perf_counter()
+    assert asyncio.run(concurrently()) == [f"CALL {i}" for i in range(5)]
+    assert time.perf_counter() - start < 0.2
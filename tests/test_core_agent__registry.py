@@ -0,0 +1,116 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import ollama
+import pytest
+
+from src.gaby_agent.core.agent._registry import ModelRegistry
+
+
+class FakeClient:
+    """ Stand-in for `ollama.Client` with a fixed set of locally available models. """
+
+    def __init__(self, available=(), latency: float = 0.0, pullable=True):
+        self.available = set(available)
+        self.latency = latency
+        self.pullable = pullable
+        self.calls = {"show": 0, "pull": 0, "generate": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            self.calls[name] += 1
+
+    def show(self, model_id):
+        self._count("show")
+        time.sleep(self.latency)
+        if model_id not in self.available:
+            raise ollama.ResponseError(f"model '{model_id}' not found", 404)
+
+    def pull(self, model_id):
+        self._count("pull")
+        time.sleep(self.latency)
+        if not self.pullable:
+            raise ollama.ResponseError("pull model manifest: file does not exist", 500)
+        self.available.add(model_id)
+
+    def generate(self, model, keep_alive=None):
+        self._count("generate")
+
+
+def test_ensure_checks_once_per_process():
+    registry, client = ModelRegistry(), FakeClient(available={"m"})
+
+    for _ in range(5):
+        registry.ensure(client, "m")
+
+    assert client.calls["show"] == 1
+    assert registry.stats == {"verified": 1, "hits": 4, "checks": 1, "pulls": 0}
+
+
+def test_ensure_rechecks_after_ttl(monkeypatch):
+    registry, client = ModelRegistry(ttl=10), FakeClient(available={"m"})
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+
+    registry.ensure(client, "m")
+    now[0] += 5
+    registry.ensure(client, "m")
+    now[0] += 20
+    registry.ensure(client, "m")
+
+    assert client.calls["show"] == 2
+
+
+def test_concurrent_callers_share_a_single_pull():
+    registry, client = ModelRegistry(), FakeClient(latency=0.02)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: registry.ensure(client, "m"), range(16)))
+
+    assert client.calls["pull"] == 1
+    assert registry.is_available(client, "m")
+
+
+def test_invalidate_forces_a_new_check():
+    registry, client = ModelRegistry(), FakeClient(available={"a", "b"})
+    registry.ensure(client, "a")
+    registry.ensure(client, "b")
+
+    assert registry.invalidate("a") == 1
+    registry.ensure(client, "a")
+    registry.ensure(client, "b")
+
+    assert client.calls["show"] == 3
+
+
+def test_failed_pull_is_not_cached():
+    registry, client = ModelRegistry(), FakeClient(pullable=False)
+
+    with pytest.raises(ollama.ResponseError):
+        registry.ensure(client, "m")
+
+    assert not registry.is_available(client, "m")
+
+
+def test_warm_up_pulls_and_loads_each_model_once():
+    registry, client = ModelRegistry(), FakeClient(available={"a"})
+
+    results = registry.warm_up(client, ["a", "b", "a"])
+
+    assert results == {"a": None, "b": None}
+    assert client.calls == {"show": 3, "pull": 1, "generate": 2}
+
+    registry.ensure(client, "b")
+    assert client.calls["show"] == 3
+
+
+def test_warm_up_reports_failures_without_raising():
+    registry, client = ModelRegistry(), FakeClient(available={"a"}, pullable=False)
+
+    results = registry.warm_up(client, ["a", "missing"], load=False)
+
+    assert results["a"] is None
+    assert "does not exist" in results["missing"]
+    assert client.calls["generate"] == 0
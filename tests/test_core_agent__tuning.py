@@ -0,0 +1,107 @@
+import ollama
+import pytest
+
+from src.gaby_agent.core.agent import _connection
+from src.gaby_agent.core.agent._tuning import (
+    Hardware,
+    auto_options,
+    calibrate,
+    calibration_fingerprint,
+    candidate_options,
+    calibrated_options,
+    load_calibrations,
+    tuned_options,
+)
+from src.gaby_agent.core.config import ModelConfig
+
+BIG_BOX = Hardware(physical_cores=32, logical_cores=64, total_ram_gb=256, available_ram_gb=200)
+SMALL_BOX = Hardware(physical_cores=4, logical_cores=8, total_ram_gb=16, available_ram_gb=12)
+
+
+@pytest.fixture(autouse=True)
+def hosts(monkeypatch):
+    monkeypatch.setitem(_connection.HOST_ALIASES, "lightning", "http://gpu:11434")
+    monkeypatch.setitem(_connection.HOST_ALIASES, "local", "http://localhost:11434")
+
+
+def model(profile=None, source="dev", host="local"):
+    return ModelConfig(dev="small:q3", prod="small:q5", profile=profile or {}, source=source, host=host)
+
+
+def test_profile_values_follow_the_workspace():
+    assert model({"size_gb": {"dev": 2, "prod": 3}, "num_ctx": 4096}).profile == {"size_gb": 2, "num_ctx": 4096}
+    assert model({"size_gb": {"dev": 2, "prod": 3}}, source="prod").profile == {"size_gb": 3}
+
+
+@pytest.mark.parametrize("size_gb, hardware, expected", [
+    (2, BIG_BOX, dict(num_batch=512, use_mmap=True, use_mlock=True)),
+    (65, SMALL_BOX, dict(num_batch=128, num_ctx=1024, use_mmap=True, use_mlock=False)),
+    (8, SMALL_BOX, dict(num_batch=256, use_mmap=True, use_mlock=False)),
+    (None, BIG_BOX, {}),
+])
+def test_auto_options_scale_with_model_size_and_ram(size_gb, hardware, expected):
+    assert auto_options({"size_gb": size_gb} if size_gb else {}, hardware) == expected
+
+
+def test_pinned_options_win_over_calibration_and_auto(tmp_path):
+    path = tmp_path / "tuning.json"
+    path.write_text(f'{{"small:q3": {{"local:{BIG_BOX.fingerprint}": {{"options": {{"num_thread": 24, "num_ctx": 2048}}}}}}}}')
+
+    options = tuned_options(model({"size_gb": 2, "num_ctx": 8192, "note": "ignored"}), BIG_BOX, path)
+
+    assert options == dict(num_batch=512, use_mmap=True, use_mlock=True, num_thread=24, num_ctx=8192)
+    # calibrations from another machine class or another host are ignored
+    assert calibrated_options("small:q3", SMALL_BOX, path, host="local") == {}
+    assert calibrated_options("small:q3", BIG_BOX, path, host="lightning") == {}
+
+
+def test_remote_hosts_get_no_options_from_this_machine(tmp_path):
+    path = tmp_path / "tuning.json"
+    remote = model({"size_gb": 65, "num_ctx": 4096}, host="lightning")
+
+    assert tuned_options(remote, SMALL_BOX, path) == dict(num_ctx=4096)
+    assert tuned_options(remote, SMALL_BOX, path, host="http://127.0.0.1:11434")["num_thread"] == 4
+    assert calibration_fingerprint("lightning", SMALL_BOX) == "http://gpu:11434"
+    assert calibration_fingerprint("local", SMALL_BOX) == f"local:{SMALL_BOX.fingerprint}"
+
+
+class CalibrationClient:
+    """ Throughput peaks at 16 threads and a 512 batch. """
+
+    def __init__(self):
+        self.requests = []
+
+    def generate(self, model, prompt="", options=None, **kwargs):
+        self.requests.append((prompt, options))
+        speed = 100 - abs(options.get("num_thread", 16) - 16) + options["num_batch"] / 512
+        return ollama.GenerateResponse(model=model, response="x", eval_count=64, eval_duration=int(64 / speed * 1e9))
+
+
+def test_calibrate_saves_the_fastest_candidate(tmp_path):
+    path, client = tmp_path / "tuning.json", CalibrationClient()
+
+    runs = calibrate(client, model({"size_gb": 2}), candidates=candidate_options(BIG_BOX), hardware=BIG_BOX, path=path)
+
+    assert [run.options for run in runs[:2]] == [dict(num_thread=16, num_batch=512), dict(num_thread=16, num_batch=256)]
+    assert runs[0].tokens_per_sec == pytest.approx(101)
+    assert len(client.requests) == 2 * len(runs)  # one untimed load request per candidate
+    assert all(options["temperature"] == 0 and options["num_predict"] == 64 for _, options in client.requests)
+    assert tuned_options(model({"size_gb": 2}), BIG_BOX, path)["num_thread"] == 16
+
+
+def test_calibrations_are_kept_per_host(tmp_path):
+    path, client = tmp_path / "tuning.json", CalibrationClient()
+
+    calibrate(client, model(), candidates=[dict(num_thread=16, num_batch=512)], hardware=BIG_BOX, path=path)
+    runs = calibrate(client, model(host="lightning"), hardware=BIG_BOX, path=path)
+
+    assert [run.options for run in runs] == [dict(num_batch=512), dict(num_batch=256), dict(num_batch=128)]  # no thread counts from this machine
+    assert set(load_calibrations(path)["small:q3"]) == {f"local:{BIG_BOX.fingerprint}", "http://gpu:11434"}
+    assert tuned_options(model(host="lightning"), BIG_BOX, path) == dict(num_batch=512)
+    assert tuned_options(model(), BIG_BOX, path)["num_thread"] == 16
+
+
+def test_candidates_take_custom_threads_and_batches_but_no_threads_for_a_remote_host():
+    assert candidate_options(SMALL_BOX, threads=[8], batches=[128]) == [dict(num_thread=8, num_batch=128)]
+    assert candidate_options(SMALL_BOX, local=False, threads=[8], batches=[128, 1024]) == [dict(num_batch=128), dict(num_batch=1024)]
+    assert {c["num_thread"] for c in candidate_options(SMALL_BOX, batches=[64])} == {2, 4, 8}
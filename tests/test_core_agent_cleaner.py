@@ -0,0 +1,147 @@
+import re
+import json
+import time
+import threading
+
+import ollama
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.gaby_agent.core.agent import cleaner, _connection
+from src.gaby_agent.core.agent._connection import ClientPool
+from src.gaby_agent.core.agent.cleaner import DataFieldMetaDescription, field_sample, parse_field_descriptions
+from src.gaby_agent.core.knowledge_base._index import FieldIndex
+
+
+class FakeClient:
+    """ Stand-in for `ollama.Client` answering with the requested field label(s). """
+
+    def __init__(self, latency: float = 0.0, failures: dict[str, int] | None = None, omit: set[str] | None = None):
+        self.latency = latency
+        self.failures = dict(failures or {})
+        self.omit = set(omit or ())
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.n_chats = 0
+        self._lock = threading.Lock()
+
+    def show(self, model_id):
+        return None
+
+    def chat(self, model, messages, **kwargs):
+        with self._lock:
+            self.n_chats += 1
+        if kwargs.get("format") == "json":
+            labels = re.findall(r"^\s*-\s*(\S+)", messages[-1]["content"], re.MULTILINE)
+            content = json.dumps({label: f"About {label}." for label in labels if label not in self.omit})
+            return ollama.ChatResponse(model=model, message=ollama.Message(role="assistant", content=content))
+
+        label = messages[-1]["content"].split("Data Field Label:")[1].split()[0]
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            remaining = self.failures.get(label, 0)
+            self.failures[label] = remaining - 1
+        try:
+            time.sleep(self.latency)
+            if remaining > 0:
+                raise ConnectionError("transient")
+            return ollama.ChatResponse(model=model, message=ollama.Message(role="assistant", content=f" About {label}. "))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(cleaner, "RETRY_BACKOFF", 0.0)
+    pool = ClientPool()
+    monkeypatch.setattr(_connection, "_client_pool", pool)
+    return pool
+
+
+@pytest.fixture
+def agent(pool):
+    return DataFieldMetaDescription()
+
+
+@pytest.fixture
+def data():
+    return pd.DataFrame({f"field_{i}": range(i, i + 5) for i in range(12)})
+
+
+@pytest.mark.parametrize("max_in_flight", [1, 4])
+def test_run_loop_preserves_column_order(agent, data, max_in_flight):
+    agent.client = FakeClient(latency=0.01)
+
+    descriptions = agent.run_loop(data, data_description="test", max_in_flight=max_in_flight)
+
+    assert list(descriptions) == list(data.columns)
+    for column, records in descriptions.items():
+        assert records == [{"name": column, "data_type": "int64", "description": f"About {column}."}]
+    assert agent.client.peak_in_flight <= max_in_flight
+
+
+def test_run_loop_bounds_concurrency(agent, data):
+    agent.client = FakeClient(latency=0.02)
+    agent.run_loop(data, data_description="test", max_in_flight=3)
+    assert agent.client.peak_in_flight == 3
+
+
+def test_run_loop_retries_failed_columns(agent, data):
+    agent.client = FakeClient(failures={"field_2": 1, "field_5": 5})
+
+    descriptions = agent.run_loop(data, data_description="test", max_in_flight=4, retries=2)
+
+    assert descriptions["field_2"][0]["description"] == "About field_2."
+    assert descriptions["field_5"][0]["description"] is None
+
+
+def test_run_loop_reuses_indexed_descriptions(agent, data):
+    encode = lambda texts, batch_size=32: np.array([[text.startswith(f"field_{i}:") for i in range(12)] for text in texts], np.float32)
+    index = FieldIndex(encode)
+    index.add([(column, field_sample(data, column), f"Known {column}.") for column in ["field_1", "field_7"]])
+    agent.client = FakeClient()
+
+    descriptions = agent.run_loop(data, data_description="test", field_index=index, episode_id="e2")
+
+    assert descriptions["field_1"][0]["description"] == "Known field_1."
+    assert descriptions["field_2"][0]["description"] == "About field_2."
+    assert agent.client.n_chats == 10
+    assert index.stats["hits"] == 2 and len(index) == 12
+    assert index.records[-1]["episode_id"] == "e2"
+
+
+@pytest.mark.parametrize("max_in_flight", [1, 3])
+def test_run_loop_batches_columns(agent, pool, data, max_in_flight):
+    client = FakeClient()
+    pool.set(None, client)
+
+    descriptions = agent.run_loop(data, data_description="test", max_in_flight=max_in_flight, batch_size=5)
+
+    assert client.n_chats == 3
+    assert list(descriptions) == list(data.columns)
+    assert all(records[0]["description"] == f"About {column}." for column, records in descriptions.items())
+
+
+def test_run_loop_batch_falls_back_to_single_fields(agent, pool, data):
+    client = FakeClient(omit={"field_1", "field_7"})
+    pool.set(None, client)
+
+    descriptions = agent.run_loop(data, data_description="test", batch_size=4)
+
+    assert client.n_chats == 3 + 2
+    assert descriptions["field_1"][0]["description"] == "About field_1."
+    assert descriptions["field_7"][0]["description"] == "About field_7."
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": "Alpha.", "b": "Beta."}', {"a": "Alpha.", "b": "Beta."}),
+    ('```json\n{"a": " Alpha. ", "b": ""}\n```', {"a": "Alpha."}),
+    ('{"fields": [{"name": "a", "description": "Alpha."}, {"name": "b"}]}', {"a": "Alpha."}),
+    ('Here you go: {"a": "Alpha."', {}),
+    ("not json at all", {}),
+])
+def test_parse_field_descriptions(text, expected):
+    assert parse_field_descriptions(text) == expected
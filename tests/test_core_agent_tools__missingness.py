@@ -0,0 +1,248 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.gaby_agent.core.agent.tools._missingness import (
+    MissingnessIndex,
+    adjust_p_values,
+    em_mean_covariance,
+    group_patterns,
+    littles_mcar,
+    pack_null_masks,
+    unpack_null_masks,
+)
+from src.gaby_agent.core.agent.tools.statistical_methods import (
+    chi_square_missingness,
+    chi_square_missingness_screen,
+    clustering_missing_vs_nonmissing,
+    littles_mcar_test,
+    logistic_regression_missingness,
+)
+
+
+def correlated(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=n)
+    return pd.DataFrame({
+        "x": x,
+        "y": 0.8 * x + rng.normal(scale=0.6, size=n),
+        "z": rng.normal(size=n),
+    }), rng
+
+
+def test_only_columns_with_nulls_are_packed():
+    df = pd.DataFrame({"a": [1, None, 3], "b": ["u", "v", "w"], "c": [None, None, 1.0]})
+
+    columns, packed = pack_null_masks(df)
+
+    assert columns == ["a", "c"]
+    assert packed.dtype == np.uint8 and packed.shape == (1, 2)
+    assert (unpack_null_masks(packed, 3) == df[columns].isna().to_numpy()).all()
+
+
+def test_patterns_match_a_groupby():
+    rng = np.random.default_rng(1)
+    mask = rng.random((500, 11)) < 0.2
+
+    patterns, ids, counts = group_patterns(mask)
+
+    expected = pd.DataFrame(mask).value_counts()
+    assert len(patterns) == len(expected) == counts.size and counts.sum() == 500
+    assert (patterns[ids] == mask).all()
+    for pattern, count in zip(patterns, counts):
+        assert expected[tuple(pattern)] == count
+
+
+def test_em_on_complete_data_is_the_sample_moments():
+    df, _ = correlated()
+    values = df.to_numpy()
+    observed = np.ones_like(values, bool)
+    patterns, ids, _ = group_patterns(~observed)
+
+    mu, sigma, _ = em_mean_covariance(values, observed, ids, patterns)
+
+    assert np.allclose(mu, values.mean(axis=0))
+    assert np.allclose(sigma, np.cov(values, rowvar=False, bias=True))
+
+
+def test_complete_data_has_no_degrees_of_freedom():
+    df, _ = correlated()
+
+    result = littles_mcar(df)
+
+    assert (result.statistic, result.dof, result.p_value, result.n_patterns) == (0.0, 0, 1.0, 1)
+
+
+def test_statistic_matches_the_definition():
+    df, rng = correlated()
+    df.loc[rng.random(len(df)) < 0.2, "y"] = np.nan
+    df.loc[rng.random(len(df)) < 0.1, "z"] = np.nan
+
+    result = littles_mcar(df)
+
+    values = df.to_numpy()
+    patterns, ids, _ = group_patterns(np.isnan(values))
+    mu, sigma, _ = em_mean_covariance(values, ~np.isnan(values), ids, patterns)
+    statistic, dof = 0.0, -3
+    for _, group in df.groupby(df.isna().apply(tuple, axis=1)):
+        obs = group.notna().all().to_numpy()
+        diff = group.loc[:, obs].mean().to_numpy() - mu[obs]
+        statistic += len(group) * diff @ np.linalg.inv(sigma[np.ix_(obs, obs)]) @ diff
+        dof += obs.sum()
+    assert np.isclose(result.statistic, statistic) and result.dof == dof == 5  # (3 + 2 + 2 + 1) observed - 3
+    assert result.n_patterns == 4
+
+
+def test_mcar_is_not_rejected_and_mar_is():
+    mcar, rng = correlated(seed=2)
+    mar = mcar.copy()
+    mcar.loc[rng.random(len(mcar)) < 0.3, "y"] = np.nan
+    mar.loc[mar["x"] > 0.3, "y"] = np.nan  # missingness driven by an observed column
+
+    assert littles_mcar_test(mcar)["p_value"] > 0.01
+    report = littles_mcar_test(mar)
+    assert report["p_value"] < 1e-6 and report["reject_null"]
+
+
+def test_non_numeric_and_empty_columns_are_ignored():
+    df, rng = correlated(n=200)
+    df.loc[rng.random(len(df)) < 0.2, "x"] = np.nan
+    df["label"] = "a"
+    df["empty"] = np.nan
+
+    report = littles_mcar_test(df)
+
+    assert report["columns"] == ["x", "y", "z"]
+    assert report["ignored_columns"] == ["label", "empty"]
+    assert report["dof"] == 2
+
+
+def test_index_answers_without_rescanning_the_frame():
+    df = pd.DataFrame({"a": [1.0, None, 3.0, None], "b": ["u", None, "w", "x"], "c": [1, 2, 3, 4]}, index=[10, 11, 12, 13])
+
+    index = MissingnessIndex.from_frame(df)
+
+    assert index.columns == ["a", "b"] and index.n_patterns == 3
+    assert index.null_count("a") == 2 and index.null_count("c") == 0
+    assert index.any_missing(["a", "b"]).tolist() == [False, True, False, True]
+    assert index.indicator("b").equals(pd.Series([0, 1, 0, 0], index=df.index, name="__missing__"))
+    assert sorted(index.pattern_counts.tolist()) == [1, 1, 2]
+
+
+def test_restricted_patterns_match_a_direct_grouping():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(np.where(rng.random((300, 6)) < 0.25, np.nan, 1.0), columns=list("abcdef"))
+    index = MissingnessIndex.from_frame(df)
+
+    patterns, ids, counts = index.restrict(["b", "e", "f"])
+
+    expected = group_patterns(df[["b", "e", "f"]].isna().to_numpy())
+    assert (patterns == expected[0]).all() and (ids == expected[1]).all() and (counts == expected[2]).all()
+
+
+def test_tools_share_one_index_and_leave_the_frame_alone():
+    df, rng = correlated(n=300, seed=4)
+    df.loc[df["x"] > 0.5, "z"] = np.nan
+    df.loc[rng.random(len(df)) < 0.1, "y"] = np.nan
+    df["band"] = np.where(df["x"] > 0.5, "high", "low")
+    before = df.copy()
+    index = MissingnessIndex.from_frame(df)
+
+    clusters = clustering_missing_vs_nonmissing(df, "z", ["x", "y"], k=2, index=index)
+    logistic = logistic_regression_missingness(df, "z", ["x", "y"], index=index)
+
+    assert logistic["n_samples"] == df[["x", "y"]].notna().all(axis=1).sum()
+    assert logistic["coefficients"]["x"] > 0
+    assert set(clusters["missing_rate_by_cluster"]) == {0, 1}
+    assert chi_square_missingness(df, "z", "band", index=index)["reject_null"]
+    assert littles_mcar_test(df, index=index) == littles_mcar_test(df)
+    pd.testing.assert_frame_equal(df, before)
+
+
+def test_an_index_of_another_frame_is_refused():
+    df, _ = correlated(n=50)
+    other = MissingnessIndex.from_frame(df.head(10))
+
+    with pytest.raises(ValueError):
+        logistic_regression_missingness(df, "x", ["y"], index=other)
+
+
+def test_screen_matches_pairwise_chi_square():
+    from scipy.stats import chi2_contingency
+
+    rng = np.random.default_rng(5)
+    n = 400
+    df = pd.DataFrame({
+        "region": rng.choice(["north", "south", "east"], n),
+        "plan": rng.choice(["basic", "pro"], n),
+        "income": rng.normal(size=n),
+        "age": rng.normal(size=n),
+    })
+    df.loc[(df["region"] == "south") & (rng.random(n) < 0.6), "income"] = np.nan
+    df.loc[rng.random(n) < 0.1, "age"] = np.nan
+    df.loc[rng.random(n) < 0.05, "plan"] = None
+
+    report = chi_square_missingness_screen(df, group_cols=["region", "plan"])
+    results = pd.DataFrame(report["results"])
+
+    assert report["n_tests"] == 5  # (income, age, plan) x (region, plan), minus plan vs itself
+    assert results["p_value"].is_monotonic_increasing
+    assert results.iloc[0][["target_col", "group_col"]].tolist() == ["income", "region"]
+    for row in results.itertuples():
+        chi2, p, dof, _ = chi2_contingency(pd.crosstab(df[row.target_col].isna(), df[row.group_col]))
+        assert np.isclose(row.chi2, chi2) and np.isclose(row.p_value, p) and row.dof == dof
+
+
+def test_p_value_corrections():
+    p = np.array([0.01, 0.04, 0.03, 0.5])
+
+    assert np.allclose(adjust_p_values(p, "bonferroni"), [0.04, 0.16, 0.12, 1.0])
+    assert np.allclose(adjust_p_values(p, "holm"), [0.04, 0.09, 0.09, 0.5])
+    assert np.allclose(adjust_p_values(p, "fdr_bh"), [0.04, 0.0533333, 0.0533333, 0.5])
+    with pytest.raises(ValueError):
+        adjust_p_values(p, "sidak")
+
+
+def test_screen_skips_high_cardinality_groups():
+    df, rng = correlated(n=100)
+    df.loc[rng.random(len(df)) < 0.2, "y"] = np.nan
+    df["id"] = [f"row-{i}" for i in range(len(df))]
+    df["flag"] = rng.choice(["a", "b"], len(df))
+
+    report = chi_square_missingness_screen(df, group_cols=["id", "flag"], max_levels=10)
+
+    assert report["skipped_group_cols"] == ["id"]
+    assert [(r["target_col"], r["group_col"]) for r in report["results"]] == [("y", "flag")]
+
+
+@pytest.mark.parametrize("extra", ["constant", "collinear"])
+def test_degenerate_columns_do_not_break_the_test(extra):
+    df, rng = correlated(n=300, seed=6)
+    df.loc[rng.random(len(df)) < 0.2, "y"] = np.nan
+    df["extra"] = 1.0 if extra == "constant" else 2 * df["x"]
+
+    report = littles_mcar_test(df)
+
+    assert np.isfinite(report["statistic"]) and 0 <= report["p_value"] <= 1
+    if extra == "constant":
+        assert report["ignored_columns"] == ["extra"] and report["dof"] == 2  # (3 + 2) observed - 3
+    else:
+        assert "extra" in report["columns"]
+
+
+def test_index_is_not_part_of_the_tool_schemas():
+    from src.gaby_agent.core.agent._utils import TOOLS_REGISTRY
+
+    for name in ("littles_mcar_test", "chi_square_missingness", "logistic_regression_missingness", "chi_square_missingness_screen"):
+        properties = TOOLS_REGISTRY[name]["function"]["parameters"]["properties"]
+        assert "index" not in properties and "df" in properties
+    assert "target_cols" in TOOLS_REGISTRY["chi_square_missingness_screen"]["function"]["parameters"]["properties"]
+
+
+def test_an_index_of_a_same_length_frame_is_refused():
+    df, _ = correlated(n=50)
+    df.loc[:9, "y"] = np.nan
+    other = MissingnessIndex.from_frame(df.set_axis(range(100, 150)))
+
+    with pytest.raises(ValueError):
+        littles_mcar_test(df, index=other)
@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+from src.gaby_agent.core.config import ModelConfigRegistry
+
+STACK = """
+- model_name: base
+  model_id:
+    dev: small:q3
+    prod: small:q5
+  profile:
+    size_gb: {dev: 1.9, prod: 2.3}
+- model_name: thinker
+  model_id:
+    dev: big:q3
+  host: lightning
+"""
+
+
+@pytest.fixture
+def stack(tmp_path):
+    path = tmp_path / "config_models.yaml"
+    path.write_text(STACK)
+    return path
+
+
+def test_file_is_parsed_once(stack):
+    registry = ModelConfigRegistry(stack)
+
+    for _ in range(10):
+        assert registry.get("base").model_id == "small:q3"
+    assert registry.get("missing") is None
+    assert registry.names == ["base", "thinker"]
+    assert registry.loads == 1
+
+
+def test_reloads_when_the_file_changes(stack):
+    registry = ModelConfigRegistry(stack)
+    registry.get("base")
+
+    stack.write_text(STACK.replace("small:q3", "small:q4"))
+    stat = stack.stat()
+    os.utime(stack, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert registry.get("base").model_id == "small:q4"
+    assert registry.loads == 2
+
+
+def test_workspace_selects_model_ids_and_profiles(stack):
+    prod = ModelConfigRegistry(stack, workspace="prod")
+
+    assert prod.get("base").model_id == "small:q5"
+    assert prod.get("base").profile == {"size_gb": 2.3}
+    assert prod.get("thinker").model_id is None
+
+    with pytest.raises(ValueError, match="workspace"):
+        ModelConfigRegistry(stack, workspace="staging")
+
+
+def test_invalid_stacks_are_rejected(stack):
+    stack.write_text(STACK + STACK)
+    with pytest.raises(ValueError, match="defined twice"):
+        ModelConfigRegistry(stack).models()
+
+    stack.write_text("- model_id: {dev: x}\n")
+    with pytest.raises(ValueError, match="no model_name"):
+        ModelConfigRegistry(stack).models()
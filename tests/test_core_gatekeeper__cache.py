@@ -0,0 +1,77 @@
+import time
+
+import pandas as pd
+import pytest
+
+from src.gaby_agent.core.gatekeeper import _client, _cache
+from src.gaby_agent.core.gatekeeper._cache import QueryCache, set_query_cache
+from src.gaby_agent.core.gatekeeper._client import SQLiteBackend, set_backend
+from src.gaby_agent.core.gatekeeper._utils import upload_dataframe_to_bq
+from src.gaby_agent.core.gatekeeper.cleaner import describe_data_field
+from src.gaby_agent.core.profiling import profile_dataframe
+
+SUMMARY_ID = "proj.dataset.summary"
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    monkeypatch.setattr(_client, "_client", None)
+    monkeypatch.setattr(_cache, "_query_cache", None)
+    monkeypatch.setattr(_cache, "_cache_configured", False)
+    backend = SQLiteBackend()
+    set_backend(backend)
+    upload_dataframe_to_bq(profile_dataframe(pd.DataFrame({"item": ["Coffee", "Cake"]})), SUMMARY_ID)
+    return backend
+
+
+def test_gatekeeper_reuses_results_until_table_changes(backend, tmp_path):
+    cache = QueryCache(directory=tmp_path)
+    set_query_cache(cache)
+
+    first = describe_data_field(data_summary_id=SUMMARY_ID)
+    second = describe_data_field(data_summary_id=SUMMARY_ID)
+    pd.testing.assert_frame_equal(first, second)
+    assert backend.n_generate_calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # re-uploading the summary changes the table fingerprint
+    upload_dataframe_to_bq(profile_dataframe(pd.DataFrame({"item": ["Tea"]})), SUMMARY_ID)
+    describe_data_field(data_summary_id=SUMMARY_ID)
+    describe_data_field(data_summary_id=SUMMARY_ID, use_cache=False)
+    assert backend.n_generate_calls == 3
+
+    # entries persist on disk across cache instances
+    reloaded = QueryCache(directory=tmp_path)
+    set_query_cache(reloaded)
+    describe_data_field(data_summary_id=SUMMARY_ID)
+    assert reloaded.hits == 1 and backend.n_generate_calls == 3
+
+    assert reloaded.invalidate(SUMMARY_ID) == 2
+    assert reloaded.stats["entries"] == 0
+
+
+def test_cache_ttl_and_lru_eviction():
+    cache = QueryCache(ttl=0.05, max_entries=2)
+    frame = pd.DataFrame({"a": [1]})
+
+    for key in ("a", "b", "c"):
+        cache.put(key, frame)
+    assert cache.get("a") is None
+    assert cache.evictions == 1
+
+    time.sleep(0.1)
+    assert cache.get("c") is None
+    assert cache.stats["hit_rate"] == 0.0
+
+
+@pytest.mark.parametrize("index", ['{"k": {"created": 1.0, "last_acc', '[1, 2]', '{"k": {"created": 1.0}}'])
+def test_an_unreadable_index_starts_an_empty_cache(tmp_path, index):
+    (tmp_path / "k.parquet").write_bytes(b"")
+    (tmp_path / "index.json").write_text(index)
+
+    cache = QueryCache(directory=tmp_path)
+
+    assert cache.stats["entries"] == 0
+    cache.put("fresh", pd.DataFrame({"a": [1]}))
+    assert list(QueryCache(directory=tmp_path)._entries) == ["fresh"]
+    assert [path.name for path in tmp_path.glob("*.tmp")] == []
@@ -0,0 +1,133 @@
+import asyncio
+import threading
+
+import pandas as pd
+import pytest
+
+from src.gaby_agent.core.gatekeeper import _client
+from src.gaby_agent.core.gatekeeper._client import SQLiteBackend, translate_sql, get_client, set_backend
+from src.gaby_agent.core.gatekeeper._utils import upload_dataframe_to_bq
+from src.gaby_agent.core.gatekeeper.cleaner import describe_data_field, detect_numeric_field, profile_data_field
+from src.gaby_agent.core.gatekeeper.prompt import SQL_PROFILE_DATA_FIELD
+from src.gaby_agent.core.profiling import profile_dataframe
+
+
+@pytest.fixture
+def sqlite_backend(monkeypatch):
+    monkeypatch.setattr(_client, "_client", None)
+    monkeypatch.setattr(_client, "_factory", _client._factory)
+    set_backend("sqlite")
+    yield get_client()
+    _client.reset_client()
+
+
+def test_translate_sql_rewrites_ai_generate_and_table_refs():
+    sql = translate_sql("""
+SELECT
+  data_field_name,
+  AI.GENERATE( ('The data field name ',
+      data_field_name,
+      'is one of the dataset column labels of a dataset with description: cafe sale logs.'
+      'Classify the dataset field.'
+      ),
+    connection_id => 'conn',
+    endpoint => 'gemini',
+    output_schema => 'data_field_name STRING, numeric_type STRING').numeric_type
+FROM
+  proj.dataset.table_observations;
+""")
+
+    assert "AI.GENERATE" not in sql
+    assert "ai_generate('numeric_type', 'The data field name ', data_field_name" in sql
+    assert "cafe sale logs.' || 'Classify" in sql
+    assert ") AS numeric_type" in sql
+    assert 'FROM "proj.dataset.table_observations"' in sql
+    assert "connection_id" not in sql
+
+
+def test_translate_sql_keeps_struct_output():
+    sql = translate_sql(SQL_PROFILE_DATA_FIELD.format(
+        data_summary_id="proj.dataset.summary", connection_id="conn", endpoint="gemini"
+    ))
+
+    assert "ai_generate_struct('description,numeric_type', 'The data field name ', data_field_name" in sql
+    assert "json_extract(generated, '$.description') AS description" in sql
+    assert "json_extract(generated, '$.numeric_type') AS numeric_type" in sql
+
+
+def test_pool_shares_one_client_across_threads(sqlite_backend):
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(get_client())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(client is sqlite_backend for client in seen)
+
+
+def test_gatekeeper_sql_runs_offline(sqlite_backend):
+    df = pd.DataFrame({"item": ["Coffee", "Cake", None], "price": [2.0, 3.0, 4.5]})
+    upload_dataframe_to_bq(profile_dataframe(df), "proj.dataset.summary")
+
+    described = describe_data_field(data_summary_id="proj.dataset.summary")
+    numeric = detect_numeric_field(data_summary_id="proj.dataset.summary")
+
+    assert isinstance(sqlite_backend, SQLiteBackend)
+    assert described.columns.tolist() == ["data_field_name", "description"]
+    assert described["description"].str.contains("item").iloc[0]
+    assert numeric["numeric_type"].tolist() == ["Unknown", "Unknown"]
+    # both views share one AI.GENERATE call per field
+    assert sqlite_backend.n_generate_calls == 2
+
+
+def test_async_gatekeeper_matches_sync(sqlite_backend):
+    df = pd.DataFrame({"item": ["Coffee", "Cake", None], "price": [2.0, 3.0, 4.5]})
+    upload_dataframe_to_bq(profile_dataframe(df), "proj.dataset.summary")
+
+    async def both():
+        return await asyncio.gather(
+            describe_data_field.arun(data_summary_id="proj.dataset.summary", use_cache=False),
+            detect_numeric_field.arun(data_summary_id="proj.dataset.summary", use_cache=False),
+        )
+
+    described, numeric = asyncio.run(both())
+
+    pd.testing.assert_frame_equal(described, describe_data_field(data_summary_id="proj.dataset.summary", use_cache=False))
+    assert numeric["numeric_type"].tolist() == ["Unknown", "Unknown"]
+
+
+def test_async_gatekeeper_cancels_the_job(monkeypatch):
+    class SlowJob:
+        cancelled = False
+
+        def done(self):
+            return False
+
+        def cancel(self):
+            SlowJob.cancelled = True
+
+    class SlowClient:
+        def query(self, sql, **kwargs):
+            return SlowJob()
+
+    monkeypatch.setattr(_client, "_client", SlowClient())
+
+    async def cancel_soon():
+        task = asyncio.create_task(profile_data_field.arun(data_summary_id="p.d.t", use_cache=False, poll_interval=0.01))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_soon())
+    assert SlowJob.cancelled
+
+
+def test_a_misspelled_backend_is_refused(monkeypatch):
+    monkeypatch.setattr(_client, "_factory", _client._factory)
+
+    with pytest.raises(ValueError, match="'sqllite'.*bigquery.*sqlite"):
+        set_backend("sqllite")
+    with pytest.raises(ValueError, match="Choose from"):
+        _client._backend_factory("BigQuery")
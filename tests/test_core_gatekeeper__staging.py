@@ -0,0 +1,67 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.gaby_agent.core.gatekeeper._staging import LocalStagingClient, stage_dataframe, bq_schema_from_summary
+from src.gaby_agent.core.gatekeeper._utils import upload_dataframe_to_bq
+from src.gaby_agent.core.profiling import profile_dataframe
+
+
+def _frame() -> pd.DataFrame:
+    n = 1_000
+    return pd.DataFrame({
+        "id": np.arange(n),
+        "price": np.linspace(0, 1, n),
+        "flag": np.arange(n) % 2 == 0,
+        "label": np.where(np.arange(n) % 3 == 0, None, "cafe"),
+        "when": pd.date_range("2024-01-01", periods=n, freq="h"),
+    })
+
+
+def test_schema_from_summary_is_explicit():
+    df = _frame()
+    schema = bq_schema_from_summary(profile_dataframe(df))
+
+    assert [(f.name, f.field_type) for f in schema] == [
+        ("id", "INT64"), ("price", "FLOAT64"), ("flag", "BOOL"), ("label", "STRING"), ("when", "TIMESTAMP")
+    ]
+
+
+def test_upload_records_staged_parquet_payload(tmp_path):
+    df = _frame()
+    summary = profile_dataframe(df)
+    client = LocalStagingClient()
+
+    upload_dataframe_to_bq(df, "project.dataset.table", summary=summary, client=client, staging_path=tmp_path / "table.parquet")
+    upload_dataframe_to_bq(summary, "project.dataset.summary", client=client)
+
+    load = client.loads[0]
+    assert load["source_format"] == "PARQUET"
+    assert [f.name for f in load["schema"]] == df.columns.tolist()
+    assert (tmp_path / "table.parquet").read_bytes() == load["payload"]
+
+    roundtrip = client.read_table("project.dataset.table")
+    assert roundtrip["id"].tolist() == df["id"].tolist()
+    assert roundtrip["label"].isna().sum() == df["label"].isna().sum()
+
+    # mixed "continuous" / int column is staged as text
+    assert client.read_table("project.dataset.summary")["unique_values"].tolist() == summary["unique_values"].astype(str).tolist()
+
+
+def test_staged_payload_is_compressed():
+    df = pd.DataFrame({"label": ["Coffee", "Cake", "Tea"] * 50_000})
+    staged = stage_dataframe(df)
+
+    assert staged.n_rows == len(df)
+    assert staged.n_bytes < len(df) * 6 / 10
+    assert pq.read_metadata(io.BytesIO(staged.payload)).row_group(0).column(0).compression == "ZSTD"
+
+
+def test_non_string_column_labels_are_staged():
+    df = pd.read_csv(io.StringIO("1,Coffee\n2,Cake\n"), header=None)
+
+    for summary in (None, profile_dataframe(df)):
+        staged = stage_dataframe(df, summary=summary)
+        assert pq.read_table(io.BytesIO(staged.payload)).to_pydict() == {"0": [1, 2], "1": ["Coffee", "Cake"]}
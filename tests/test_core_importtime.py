@@ -0,0 +1,48 @@
+import os
+import sys
+import subprocess
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# loaded on first use of the tools / detectors, never by importing the agents or the pipeline
+HEAVY_MODULES = ("sklearn", "scipy", "statsmodels", "sentence_transformers", "torch")
+PACKAGE_IMPORT_BUDGET = 0.25 # seconds for `import gaby_agent.core.agent` (lazy exports only)
+
+
+def importtime(statement: str) -> tuple[dict[str, float], str]:
+    """ Run `statement` in a fresh interpreter under `-X importtime`: module -> cumulative seconds, and stdout. """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=SRC.parent,
+        env={**os.environ, "PYTHONPATH": str(SRC)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                modules[name.strip()] = int(cumulative) / 1e6
+    return modules, result.stdout
+
+
+def test_importing_agents_and_pipeline_has_no_side_effects():
+    modules, stdout = importtime(
+        "import gaby_agent.core.agent.cleaner, gaby_agent.core.agent.tools.ambig, "
+        "gaby_agent.core.agent.tools.statistical_methods, gaby_agent.core.gatekeeper.cleaner, gaby_agent.core.pipeline"
+    )
+
+    assert stdout == ""
+    assert not [name for name in modules if name.split(".")[0] in HEAVY_MODULES]
+
+
+def test_agent_package_import_is_lazy():
+    modules, stdout = importtime("import gaby_agent.core.agent")
+
+    assert stdout == ""
+    assert "ollama" not in modules
+    assert modules["gaby_agent.core.agent"] < PACKAGE_IMPORT_BUDGET
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from src.gaby_agent.core.knowledge_base._embeddings import EmbeddingStore, reference_embeddings
+
+
+class FakeEncoder:
+    """ Deterministic stand-in for a SentenceTransformer: character histogram embeddings. """
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, texts):
+        self.calls += 1
+        return np.array([np.bincount(np.frombuffer(text.encode(), np.uint8) % 16, minlength=16) for text in texts], np.float32)
+
+
+def write_sample(path, **columns):
+    pd.DataFrame(columns).to_csv(path, index=False)
+    return path
+
+
+def test_reference_matrix_is_built_once_and_memory_mapped(tmp_path):
+    sample = write_sample(tmp_path / "types.csv", short_text=["a", "bb"], continuous=[1.5, 2.5])
+    store, encode = EmbeddingStore(tmp_path / "kb"), FakeEncoder()
+
+    first, labels = reference_embeddings(encode, sample, "mini", store)
+    second, _ = reference_embeddings(encode, sample, "mini", EmbeddingStore(tmp_path / "kb"))
+
+    assert labels == ["continuous", "short_text"]
+    assert encode.calls == 1 and store.builds == 1
+    assert isinstance(second, np.memmap) and not second.flags.writeable
+    np.testing.assert_array_equal(first, encode(["1.5, 2.5", "a, bb"]))
+
+
+def test_changed_sample_or_model_rebuilds(tmp_path):
+    sample = write_sample(tmp_path / "types.csv", short_text=["a", "bb"])
+    store, encode = EmbeddingStore(tmp_path / "kb"), FakeEncoder()
+    reference_embeddings(encode, sample, "mini", store)
+
+    write_sample(sample, short_text=["a", "cc"], ordinal=[1, 2])
+    matrix, labels = reference_embeddings(encode, sample, "mini", store)
+    assert labels == ["ordinal", "short_text"] and matrix.shape == (2, 16)
+
+    reference_embeddings(encode, sample, "other-model", store)
+    reference_embeddings(encode, sample, "mini", store)
+    assert encode.calls == 3
+
+
+def test_corrupt_matrix_is_rebuilt(tmp_path):
+    sample = write_sample(tmp_path / "types.csv", short_text=["a", "bb"])
+    store, encode = EmbeddingStore(tmp_path / "kb"), FakeEncoder()
+    reference_embeddings(encode, sample, "mini", store)
+
+    for path in (tmp_path / "kb").glob("*.npy"):
+        path.write_bytes(b"not a matrix")
+
+    matrix, _ = reference_embeddings(encode, sample, "mini", store)
+    assert encode.calls == 2 and matrix.shape == (1, 16)
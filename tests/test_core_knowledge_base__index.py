@@ -0,0 +1,105 @@
+import zlib
+
+import numpy as np
+
+from src.gaby_agent.core.knowledge_base._index import FieldIndex
+
+
+class WordEncoder:
+    """ Stand-in for a SentenceTransformer: hashed bag of words. """
+
+    def __init__(self, dim=64):
+        self.dim = dim
+        self.calls = 0
+
+    def __call__(self, texts, batch_size=32):
+        self.calls += 1
+        vectors = np.zeros((len(texts), self.dim), np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().replace(",", " ").replace(":", " ").split():
+                vectors[row, zlib.crc32(word.encode()) % self.dim] += 1
+        return vectors
+
+
+FIELDS = [
+    ("customer_id", "C001, C002, C003", "Unique identifier of the customer."),
+    ("order_date", "2024-01-02, 2024-01-05", "Date the order was placed."),
+    ("total_amount", "12.5, 99.0, 7.25", "Order total in the store currency."),
+]
+
+
+def test_similar_fields_reuse_descriptions():
+    index = FieldIndex(WordEncoder(), threshold=0.9)
+    assert index.add(FIELDS + [("notes", "", None)], episode_id="e1") == 3
+
+    reused = index.reuse([
+        ("customer_id", "C001, C002, C003"),
+        ("order_date", "2024-01-02, 2024-01-05"),
+        ("shipping_carrier", "UPS, DHL"),
+    ])
+
+    assert reused == ["Unique identifier of the customer.", "Date the order was placed.", None]
+    assert index.stats == {"entries": 3, "queries": 3, "hits": 2, "hit_rate": 2 / 3}
+
+
+def test_search_ranks_neighbours():
+    index = FieldIndex(WordEncoder())
+    index.add(FIELDS)
+
+    (best, score), (second, _) = index.search([("total_amount", "12.5, 99.0")], k=2)[0]
+
+    assert best["name"] == "total_amount" and 0 < score <= 1
+    assert second["name"] != "total_amount"
+    assert len(index.search([("anything", "")])[0]) == 1
+    assert FieldIndex(WordEncoder()).search([("anything", "")]) == [[]]
+
+
+def test_inserts_are_incremental_and_persisted(tmp_path):
+    index = FieldIndex(WordEncoder(), model_name="words", directory=tmp_path)
+    for i in range(100):
+        index.add([(f"field_{i}", f"value_{i}", f"Field number {i}.")], episode_id=f"e{i}")
+
+    reloaded = FieldIndex(WordEncoder(), model_name="words", directory=tmp_path)
+    assert len(reloaded) == 100 and reloaded.records[42]["episode_id"] == "e42"
+    np.testing.assert_allclose(reloaded.embeddings, index.embeddings)
+
+    reloaded.add([FIELDS[0]])
+    assert len(reloaded) == 101
+    assert len(FieldIndex(WordEncoder(), model_name="other", directory=tmp_path)) == 0
+
+
+def test_inserts_append_to_the_log(tmp_path):
+    index = FieldIndex(WordEncoder(), model_name="words", directory=tmp_path)
+    index.add(FIELDS[:1], episode_id="e1")
+    rows, records = tmp_path / "field_index.f32", tmp_path / "field_index.jsonl"
+    first_line = records.read_text()
+
+    index.add(FIELDS[1:], episode_id="e2")
+
+    assert rows.stat().st_size == 3 * 64 * 4
+    assert records.read_text().startswith(first_line) and len(records.read_text().splitlines()) == 3
+
+
+def test_an_interrupted_insert_only_loses_itself(tmp_path):
+    index = FieldIndex(WordEncoder(), model_name="words", directory=tmp_path)
+    index.add(FIELDS[:2], episode_id="e1")
+    with open(tmp_path / "field_index.f32", "ab") as f:
+        f.write(b"\0" * 100)  # rows written, records not
+    with open(tmp_path / "field_index.jsonl", "a") as f:
+        f.write('{"name": "half')
+
+    reloaded = FieldIndex(WordEncoder(), model_name="words", directory=tmp_path)
+    assert [record["name"] for record in reloaded.records] == ["customer_id", "order_date"]
+
+    reloaded.add(FIELDS[2:], episode_id="e2")
+    again = FieldIndex(WordEncoder(), model_name="words", directory=tmp_path)
+    assert [record["name"] for record in again.records] == ["customer_id", "order_date", "total_amount"]
+    np.testing.assert_allclose(again.embeddings, index._embed([(name, sample) for name, sample, _ in FIELDS]))
+
+
+def test_every_profiler_gets_its_own_episode():
+    from src.gaby_agent.core.pipeline import DataProfiler
+
+    fields = DataProfiler.__dataclass_fields__
+    assert fields["episode_id"].default_factory() != fields["episode_id"].default_factory()
+    assert callable(fields["timestamp"].default_factory)
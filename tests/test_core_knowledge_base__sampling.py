@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from src.gaby_agent.core.knowledge_base._embeddings import column_text
+from src.gaby_agent.core.knowledge_base._sampling import (
+    detect_with_confidence,
+    reservoir_sample,
+    sample_distinct,
+    value_shape,
+)
+
+
+class ShapeEncoder:
+    """ Stand-in for a SentenceTransformer: digit / letter / space shares of the text. """
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, batch_size=32):
+        self.calls.append(len(texts))
+        return np.array([[
+            sum(c.isdigit() for c in text) + 1e-3,
+            sum(c.isalpha() for c in text),
+            sum(c == " " for c in text),
+        ] for text in texts], np.float32)
+
+
+def reference(encode):
+    labels = ["continuous", "short_text"]
+    return encode([column_text([12.5, 7.8, 15.2]), column_text(["alpha", "delta", "orbit"])]), labels
+
+
+def test_sample_is_bounded_by_the_budget():
+    column = pd.Series(np.arange(1_000_000, dtype=float))
+
+    sample = sample_distinct(column, budget=32)
+
+    assert len(sample) == 32 and len(set(sample)) == 32
+    assert sample == sample_distinct(column, budget=32)  # seeded
+    assert sample_distinct(column, budget=8) != sample_distinct(column, budget=8, seed=1)
+
+
+def test_stratified_sample_covers_rare_formats():
+    column = pd.Series([f"{i}.5" for i in range(990)] + [f"id-{i}" for i in range(10)])
+
+    shapes = {value_shape(value) for value in sample_distinct(column, budget=16, strategy="stratified")}
+
+    assert shapes == {"9.9", "a-9"}
+
+
+def test_reservoir_sample_is_uniform():
+    rng_means = [np.mean(reservoir_sample(range(10_000), 100, seed=seed)) for seed in range(30)]
+
+    assert len(reservoir_sample(range(10), 100)) == 10
+    assert abs(np.mean(rng_means) - 4999.5) < 300
+
+    stream = sample_distinct(iter(["a", "b", None, "a"] * 1000), budget=4)
+    assert sorted(stream) == ["a", "b"]
+
+
+def test_detection_reports_label_stability_in_one_encode_call():
+    encode = ShapeEncoder()
+    matrix, labels = reference(encode)
+    n_rows = 200_000
+    data = pd.DataFrame({
+        "price": np.round(np.random.default_rng(0).uniform(1, 100, n_rows), 2),
+        "code": np.random.default_rng(1).choice(["alpha", "delta", "orbit", "kappa"], n_rows),
+    })
+
+    detected = detect_with_confidence(encode, matrix, labels, data, budget=16)
+
+    assert encode.calls[1:] == [7]  # price: 2, 4, 8, 16 values; code: 1, 2, 4 (all its values)
+    assert detected["data_type"].tolist() == ["continuous", "short_text"]
+    assert detected["n_values"].tolist() == [16, 4]
+    assert detected["confidence"].between(0, 1).all()
+    assert detected.loc["price", "confidence"] == 1.0
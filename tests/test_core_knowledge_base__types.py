@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from src.gaby_agent.core.knowledge_base._embeddings import column_text
+from src.gaby_agent.core.knowledge_base._types import classify_columns, classify_texts
+
+
+class CharacterEncoder:
+    """ Stand-in for a SentenceTransformer: digit / letter / space / punctuation shares and mean value length. """
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, batch_size=32):
+        self.calls.append(len(texts))
+        rows = []
+        for text in texts:
+            values = text.split(", ")
+            n = max(len(text), 1)
+            rows.append([
+                sum(c.isdigit() for c in text) / n,
+                sum(c.isalpha() for c in text) / n,
+                sum(c == " " for c in text) / n,
+                sum(c in ".;" for c in text) / n,
+                np.mean([len(value) for value in values]) / 20,
+            ])
+        return np.array(rows, np.float32)
+
+
+REFERENCE = {
+    "continuous": [12.5, 7.8, 15.2, 9.6],
+    "long_text": ["This is a long text example that describes something in detail.", "Another long text example with more information."],
+    "short_text": ["short text", "sample", "data"],
+}
+
+
+def reference(encode):
+    labels = sorted(REFERENCE)
+    return encode([column_text(REFERENCE[label]) for label in labels]), labels
+
+
+def test_all_columns_are_classified_in_one_encode_call():
+    encode = CharacterEncoder()
+    matrix, labels = reference(encode)
+    data = pd.DataFrame({
+        "price": [3.25, 10.5, None, 7.75] * 50,
+        "review": ["The delivery was late and the box was damaged on arrival.", "Great quality, would buy this again next time.", None, "Okay"] * 50,
+        "code": ["alpha", "delta", "orbit", "kappa"] * 50,
+    })
+
+    detected = classify_columns(encode, matrix, labels, data)
+
+    assert encode.calls == [3, 3]  # reference + one call for every column
+    assert detected.index.tolist() == ["price", "review", "code"]
+    assert detected["data_type"].tolist() == ["continuous", "long_text", "short_text"]
+    assert detected[labels].max(axis=1).equals(detected["similarity_score"])
+    assert (detected["margin"] >= 0).all()
+
+
+def test_scores_are_cosine_similarities():
+    encode = CharacterEncoder()
+    matrix, labels = reference(encode)
+
+    detected = classify_texts(encode, matrix, labels, [column_text(REFERENCE["short_text"])])
+
+    assert detected["data_type"].iloc[0] == "short_text"
+    assert np.isclose(detected["similarity_score"].iloc[0], 1.0, atol=1e-6)
+
+
+def test_no_columns_gives_an_empty_table():
+    encode = CharacterEncoder()
+    matrix, labels = reference(encode)
+
+    detected = classify_columns(encode, matrix, labels, pd.DataFrame(), columns=[])
+
+    assert detected.empty and list(detected.columns) == ["data_type", "similarity_score", "margin", *labels]
+    assert encode.calls == [3]
@@ -0,0 +1,91 @@
+import time
+import asyncio
+
+import pytest
+
+from src.gaby_agent.core.orchestrator import Stage, PipelineError, run_stages, run_sync
+
+
+def sleeper(seconds: float, value=None, error: Exception | None = None):
+    async def run(**dependencies):
+        await asyncio.sleep(seconds)
+        if error is not None:
+            raise error
+        return value if value is not None else dependencies
+    return run
+
+
+def test_independent_stages_overlap():
+    stages = [Stage("a", sleeper(0.2, "A")), Stage("b", sleeper(0.2, "B"))]
+
+    start = time.perf_counter()
+    results = asyncio.run(run_stages(stages))
+
+    assert time.perf_counter() - start < 0.35
+    assert {name: result.value for name, result in results.items()} == {"a": "A", "b": "B"}
+
+
+def test_dependencies_receive_upstream_values():
+    stages = [
+        Stage("joined", sleeper(0.0), depends_on=("a", "b")),
+        Stage("a", sleeper(0.05, "A")),
+        Stage("b", sleeper(0.01, "B")),
+    ]
+
+    results = asyncio.run(run_stages(stages))
+
+    assert list(results) == ["joined", "a", "b"]
+    assert results["joined"].value == {"a": "A", "b": "B"}
+
+
+def test_optional_failure_skips_only_its_dependents():
+    stages = [
+        Stage("flaky", sleeper(0.0, error=ValueError("boom")), required=False),
+        Stage("after_flaky", sleeper(0.0), depends_on=("flaky",), required=False),
+        Stage("other", sleeper(0.01, "ok")),
+    ]
+
+    results = asyncio.run(run_stages(stages))
+
+    assert results["flaky"].status == "failed" and isinstance(results["flaky"].error, ValueError)
+    assert results["after_flaky"].status == "skipped"
+    assert results["other"].value == "ok"
+
+
+def test_required_failure_cancels_running_stages():
+    stages = [Stage("slow", sleeper(5, "never")), Stage("broken", sleeper(0.01, error=ValueError("boom")))]
+
+    start = time.perf_counter()
+    with pytest.raises(PipelineError) as info:
+        asyncio.run(run_stages(stages))
+
+    assert time.perf_counter() - start < 1
+    assert info.value.stage.name == "broken"
+    assert info.value.results["slow"].status == "cancelled"
+
+
+def test_stage_and_pipeline_timeouts():
+    results = asyncio.run(run_stages([Stage("slow", sleeper(5), timeout=0.05, required=False), Stage("fast", sleeper(0.0, 1))]))
+    assert results["slow"].status == "timeout"
+    assert results["fast"].ok
+
+    with pytest.raises(PipelineError) as info:
+        asyncio.run(run_stages([Stage("slow", sleeper(5)), Stage("fast", sleeper(0.0, 1))], timeout=0.05))
+    assert info.value.results == {"slow": info.value.results["slow"], "fast": info.value.results["fast"]}
+    assert info.value.results["slow"].status == "cancelled"
+    assert info.value.results["fast"].ok
+
+
+def test_invalid_stage_graphs():
+    with pytest.raises(ValueError):
+        asyncio.run(run_stages([Stage("a", sleeper(0)), Stage("a", sleeper(0))]))
+    with pytest.raises(ValueError):
+        asyncio.run(run_stages([Stage("a", sleeper(0), depends_on=("missing",))]))
+
+
+def test_run_sync_inside_a_running_loop():
+    async def caller():
+        return run_sync(run_stages([Stage("a", sleeper(0.0, "A"))]))
+
+    assert run_sync(run_stages([Stage("a", sleeper(0.0, "A"))]))["a"].value == "A"
+    assert asyncio.run(caller())["a"].value == "A"
@@ -0,0 +1,36 @@
+import asyncio
+
+import pandas as pd
+
+from src.gaby_agent.core import pipeline
+from src.gaby_agent.core.pipeline import DataProfiler
+
+
+class Summarizer:
+    async def arun(self, **kwargs):
+        return "A small test dataset."
+
+
+class FailingProfile:
+    @staticmethod
+    async def arun(**kwargs):
+        raise RuntimeError("no BigQuery here")
+
+
+class LocalDescriber:
+    def run_loop(self, data, **kwargs):
+        return {column: [{"name": column, "data_type": str(data[column].dtype), "description": f"About {column}."}] for column in data.columns}
+
+
+def test_fallback_descriptions_make_a_table_the_recap_can_fit(monkeypatch):
+    monkeypatch.setattr(pipeline, "DatasetSummarizer", Summarizer)
+    monkeypatch.setattr(pipeline, "profile_data_field", FailingProfile)
+    monkeypatch.setattr(pipeline, "DataFieldMetaDescription", LocalDescriber)
+    report = DataProfiler(pd.DataFrame({"age": [31, 42], "city": ["Lyon", "Oslo"]}), user_input_tags="test")
+
+    asyncio.run(DataProfiler.adata_cleaning_pipeline(report))
+
+    assert report.data_field_description.values.tolist() == [["age", "About age."], ["city", "About city."]]
+    for max_tokens in (None, 200):
+        recap = report.episode_recap(max_tokens=max_tokens)
+        assert "A small test dataset." in recap and "About city." in recap
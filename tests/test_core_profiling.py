@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from src.gaby_agent.core.profiling import (
+    profile_dataframe,
+    summarize_dataframe,
+    SUMMARY_COLUMNS,
+    STATS_COLUMNS,
+    ERROR_COLUMN,
+)
+
+INPUT_DIR = Path(__file__).parent.parent / "src" / "gaby_agent" / "data" / "input"
+
+
+def _mixed_frame() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 500
+    df = pd.DataFrame({
+        "id": np.arange(n),
+        "small_int": rng.integers(0, 5, n),
+        "price": rng.normal(10, 2, n),
+        "flag": rng.integers(0, 2, n).astype(bool),
+        "label": rng.choice(["a", "b", "c"], n),
+        "nullable": pd.array(rng.integers(0, 50, n), dtype="Int64"),
+        "all_nan": np.full(n, np.nan),
+    })
+    df.loc[::7, "price"] = np.nan
+    df.loc[::11, "label"] = None
+    df.loc[::13, "nullable"] = pd.NA
+    return df
+
+
+def _assert_same_summary(result: pd.DataFrame, expected: pd.DataFrame):
+    pd.testing.assert_frame_equal(
+        result[SUMMARY_COLUMNS].astype({"unique_values": str}),
+        expected.astype({"unique_values": str}),
+        check_dtype=False,
+    )
+
+
+def test_profile_matches_reference_generator():
+    df = _mixed_frame()
+
+    expected = pd.DataFrame.from_records(list(summarize_dataframe(df)))
+    result = profile_dataframe(df, block_size=2)
+
+    assert result.columns.tolist() == SUMMARY_COLUMNS + STATS_COLUMNS
+    _assert_same_summary(result, expected)
+
+
+def test_profile_numeric_stats():
+    df = _mixed_frame()
+    result = profile_dataframe(df).set_index("data_field_name")
+
+    assert result.loc["price", "min_value"] == df["price"].min()
+    assert result.loc["price", "max_value"] == df["price"].max()
+    assert np.isclose(result.loc["price", "mean_value"], df["price"].mean())
+    assert np.isclose(result.loc["nullable", "mean_value"], df["nullable"].mean())
+    assert np.isnan(result.loc["label", "min_value"])
+    assert np.isnan(result.loc["all_nan", "mean_value"])
+
+
+def test_profile_sample_inputs():
+    for path in INPUT_DIR.glob("*.csv"):
+        df = pd.read_csv(path)
+        expected = pd.DataFrame.from_records(list(summarize_dataframe(df)))
+        result = profile_dataframe(df, include_stats=False)
+
+        _assert_same_summary(result, expected)
+
+
+def test_profile_approx_distinct():
+    df = _mixed_frame()
+    exact = profile_dataframe(df)
+    approx = profile_dataframe(df, distinct="approx")
+
+    assert approx.columns.tolist() == SUMMARY_COLUMNS + STATS_COLUMNS + [ERROR_COLUMN]
+    assert approx["unique_values"].astype(str).tolist() == exact["unique_values"].astype(str).tolist()
+    np.testing.assert_allclose(approx[STATS_COLUMNS].to_numpy(), exact[STATS_COLUMNS].to_numpy())
+    assert (approx[ERROR_COLUMN] > 0).all()
+
+
+def test_profile_probe_keeps_low_cardinality_counts_exact():
+    rng = np.random.default_rng(1)
+    n = 10_000
+    df = pd.DataFrame({
+        "late_values": np.r_[np.zeros(n - 100), np.arange(100)],  # constant over the probed rows
+        "codes": rng.integers(0, 15, n).astype(float),
+        "noise": rng.normal(size=n),
+    })
+    df.loc[::17, "codes"] = np.nan
+
+    result = profile_dataframe(df)
+
+    expected = pd.DataFrame.from_records(list(summarize_dataframe(df)))
+    _assert_same_summary(result, expected)
+    assert result["unique_values"].tolist() == ["continuous", 15, "continuous"]
+
+
+def test_pipeline_keeps_the_summary_schema():
+    from src.gaby_agent.core.pipeline import DataProfiler
+
+    report = DataProfiler(_mixed_frame(), user_input_tags="test")
+
+    assert report.data_field_summary.columns.tolist() == SUMMARY_COLUMNS
+    assert report.data_field_stats.columns.tolist() == ["data_field_name"] + STATS_COLUMNS
+    assert report.data_field_stats.set_index("data_field_name").loc["price", "max_value"] == report.data["price"].max()
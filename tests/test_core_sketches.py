@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from src.gaby_agent.core.sketches import HyperLogLog
+
+
+def test_hyperloglog_estimate_within_error_bound():
+    values = pd.Series(np.arange(200_000)).astype(str)
+    sketch = HyperLogLog(precision=12).update(values)
+
+    assert abs(sketch.estimate() - 200_000) / 200_000 < 4 * sketch.relative_error
+
+
+def test_hyperloglog_small_cardinality_and_merge():
+    left = HyperLogLog().update(pd.Series([1, 2, 3, np.nan, 3]))
+    right = HyperLogLog().update(pd.Series([3.0, 4.0, 5.0]))
+
+    assert len(left) == 3
+    assert len(left.merge(right)) == 5
+
+
+def test_hyperloglog_exceeds_stops_early():
+    sketch = HyperLogLog()
+
+    assert sketch.exceeds(pd.Series(np.arange(1_000_000)), threshold=20, chunk_size=100)
+    assert sketch.estimate() < 1_000
+    assert not HyperLogLog().exceeds(pd.Series(np.arange(1_000) % 5), threshold=20)
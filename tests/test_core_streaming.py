@@ -0,0 +1,68 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+
+from src.gaby_agent.core.profiling import profile_dataframe, STATS_COLUMNS
+from src.gaby_agent.core.streaming import profile_csv
+
+INPUT_DIR = Path(__file__).parent.parent / "src" / "gaby_agent" / "data" / "input"
+
+
+@pytest.mark.parametrize("path", sorted(INPUT_DIR.glob("*.csv")), ids=lambda p: p.name)
+@pytest.mark.parametrize("n_chunks", [1, 7])
+def test_streaming_matches_in_memory_profile(path, n_chunks):
+    df = pd.read_csv(path)
+    expected = profile_dataframe(df)
+    profiler = profile_csv(path, chunksize=-(-len(df) // n_chunks))
+    result = profiler.summary()
+
+    pd.testing.assert_frame_equal(
+        result.drop(columns=STATS_COLUMNS).astype(str),
+        expected.drop(columns=STATS_COLUMNS).astype(str),
+    )
+    np.testing.assert_allclose(result[STATS_COLUMNS].to_numpy(), expected[STATS_COLUMNS].to_numpy())
+    assert profiler.n_rows == expected["total_count"].iloc[0]
+
+
+def test_streaming_resolves_dtypes_across_chunks():
+    csv = "a,b,c\n1,True,x\n2,False,2\n3.5,,3\n4,True,4\n"
+    profiler = profile_csv(io.StringIO(csv), chunksize=1, preview_rows=2)
+    summary = profiler.summary().set_index("data_field_name")
+
+    assert summary["data_type"].tolist() == [str(dtype) for dtype in pd.read_csv(io.StringIO(csv)).dtypes]
+    assert summary.loc["a", "mean_value"] == pytest.approx(2.625)
+    assert profiler.preview["a"].tolist() == [1.0, 2.0]
+
+
+def test_exact_mode_keeps_no_raw_values_for_numeric_columns():
+    csv = "id,amount,label\n" + "".join(f"{i},{i * 0.5},l{i % 3}\n" for i in range(500))
+    profiler = profile_csv(io.StringIO(csv), chunksize=50)
+    summary = profiler.summary().set_index("data_field_name")
+
+    assert not profiler.columns["id"].raw_values and not profiler.columns["amount"].raw_values
+    assert profiler.columns["label"].raw_values == {"l0", "l1", "l2"}
+    assert summary.loc["id", "unique_values"] == "continuous" and summary.loc["label", "unique_values"] == 3
+    assert "unique_values_error" not in summary.columns
+
+
+def test_exact_set_falls_back_to_the_sketch_past_its_limit():
+    csv = "code,group\n" + "".join(f"c{i},g{i % 4}\n" for i in range(2000))
+    profiler = profile_csv(io.StringIO(csv), chunksize=300, exact_limit=100)
+    summary = profiler.summary().set_index("data_field_name")
+
+    code = profiler.columns["code"]
+    assert code.approximate and not code.raw_values
+    assert summary.loc["code", "unique_values"] == pytest.approx(2000, rel=0.05)
+    assert summary.loc["group", "unique_values"] == 4
+    assert summary.loc["group", "unique_values_error"] == 0.0 and summary.loc["code", "unique_values_error"] > 0
+
+
+def test_numeric_column_turning_into_text_is_still_counted():
+    csv = "value\n" + "".join(f"{i}\n" for i in range(300)) + "n/a-like\n"
+    summary = profile_csv(io.StringIO(csv), chunksize=100).summary().set_index("data_field_name")
+
+    assert summary.loc["value", "data_type"] == str(pd.read_csv(io.StringIO(csv))["value"].dtype)
+    assert summary.loc["value", "unique_values"] == pytest.approx(301, rel=0.05)